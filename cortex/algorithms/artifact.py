@@ -0,0 +1,130 @@
+# cortex/algorithms/artifact.py
+import datetime
+import json
+import os
+import platform
+import re
+import sys
+import joblib
+
+ARTIFACT_FORMAT = "cortex-model"
+ARTIFACT_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+STATE_NAME = "instance.joblib"
+PREPROCESSOR_NAME = "preprocessor.joblib"
+
+# Libraries whose versions are recorded when they have been imported.
+_TRACKED_LIBRARIES = ["numpy", "pandas", "sklearn", "joblib", "xgboost", "lightgbm", "torch", "gymnasium", "sentence_transformers"]
+
+def library_versions():
+    versions = {"python": platform.python_version()}
+    for name in _TRACKED_LIBRARIES:
+        module = sys.modules.get(name)
+        if module is not None:
+            versions[name] = getattr(module, "__version__", "unknown")
+    return versions
+
+def is_artifact(path):
+    return os.path.isdir(path) and os.path.exists(os.path.join(path, MANIFEST_NAME))
+
+def default_artifact_path(model_instance, root=None):
+    """
+    Next free versioned directory for a model, e.g. ~/Desktop/cortex_models/xgboost_classifier_v3,
+    so saving never overwrites an earlier model.
+    """
+    root = root or os.path.join(os.path.expanduser('~'), 'Desktop', 'cortex_models')
+    slug = re.sub(r"[^a-z0-9]+", "_", model_instance.name.lower()).strip("_") or "model"
+    version = 1
+    if os.path.isdir(root):
+        pattern = re.compile(rf"^{re.escape(slug)}_v(\d+)$")
+        versions = [int(m.group(1)) for m in map(pattern.match, os.listdir(root)) if m]
+        version = max(versions, default=0) + 1
+    return os.path.join(root, f"{slug}_v{version}")
+
+def save_artifact(model_instance, path, compress=0):
+    """
+    Saves a model as a versioned artifact directory:
+
+        manifest.json        format version, model class, metadata, feature schema,
+                             metrics and library versions
+        instance.joblib      the model wrapper's own state (name, hyperparameters, ...)
+        <payload>            the fitted estimator, written by the model's _save_payload
+        preprocessor.joblib  the fitted preprocessing stage, if any
+
+    With compress=0 (the default) numpy payloads are stored raw so they can be
+    memory-mapped on load and shared between worker processes. Pass a joblib
+    compression setting such as 3 or ("lz4", 3) to trade load speed for size.
+    """
+    os.makedirs(path, exist_ok=True)
+
+    payload = model_instance._save_payload(path, compress)
+    # The estimator is written by _save_payload; everything else on the wrapper goes here.
+    skip = {"model", "preprocessor", *model_instance._transient_attributes}
+    state = {k: v for k, v in model_instance.__dict__.items() if k not in skip}
+    joblib.dump(state, os.path.join(path, STATE_NAME), compress=compress)
+
+    preprocessor = getattr(model_instance, "preprocessor", None)
+    if preprocessor is not None:
+        joblib.dump(preprocessor, os.path.join(path, PREPROCESSOR_NAME), compress=compress)
+
+    model_class = type(model_instance)
+    manifest = {
+        "format": ARTIFACT_FORMAT,
+        "format_version": ARTIFACT_VERSION,
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "model_class": f"{model_class.__module__}.{model_class.__qualname__}",
+        "name": model_instance.name,
+        "hyperparameters": model_instance.hyperparameters,
+        "feature_schema": getattr(model_instance, "feature_schema", None),
+        "metrics": getattr(model_instance, "metrics", None),
+        "tuning": _tuning_summary(getattr(model_instance, "tuning_report", None)),
+        "payload": payload,
+        "preprocessor": PREPROCESSOR_NAME if preprocessor is not None else None,
+        "compression": compress,
+        "versions": library_versions(),
+    }
+    with open(os.path.join(path, MANIFEST_NAME), "w") as f:
+        json.dump(manifest, f, indent=2, default=_to_json)
+    return path
+
+def read_manifest(path):
+    with open(os.path.join(path, MANIFEST_NAME)) as f:
+        manifest = json.load(f)
+    if manifest.get("format") != ARTIFACT_FORMAT:
+        raise ValueError(f"'{path}' is not a Cortex model artifact.")
+    if manifest.get("format_version", 0) > ARTIFACT_VERSION:
+        raise ValueError(f"'{path}' was written by a newer version of Cortex (format {manifest['format_version']}).")
+    return manifest
+
+def load_artifact(path, mmap_mode="r"):
+    """
+    Loads a model saved with save_artifact. Uncompressed numpy payloads are
+    memory-mapped (read-only by default), so loading is cheap and the pages are
+    shared by every process that loads the same artifact.
+    """
+    from cortex.algorithms.registry import load_model_class
+
+    manifest = read_manifest(path)
+    if manifest.get("compression"):
+        mmap_mode = None  # Compressed payloads can't be memory-mapped.
+
+    model_class = load_model_class(manifest["model_class"])
+    model_instance = model_class.__new__(model_class)
+    model_instance.__dict__.update(joblib.load(os.path.join(path, STATE_NAME)))
+    for name in ("model", "preprocessor", *model_class._transient_attributes):
+        model_instance.__dict__.setdefault(name, None)
+    model_instance._load_payload(path, manifest["payload"], mmap_mode)
+    if manifest.get("preprocessor"):
+        model_instance.preprocessor = joblib.load(os.path.join(path, manifest["preprocessor"]))
+    return model_instance
+
+def _tuning_summary(report):
+    if not report:
+        return None
+    return {key: report[key] for key in ("strategy", "best_params", "best_score", "fits", "seconds")}
+
+def _to_json(value):
+    # numpy scalars/arrays (metrics, best params) become plain numbers/lists; anything else its repr.
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    return repr(value)
@@ -1,13 +1,23 @@
+import os
 import joblib
 
 class BaseModel:
     """
     Abstract base class for all machine learning models in Cortex.
     """
+    # Attributes that are caches or live resources, left out of saved artifacts.
+    _transient_attributes = ()
+    # Whether the estimator takes pandas categoricals (and NaN) as they are; see TabularPreprocessor.
+    native_categorical = False
+
     def __init__(self, **kwargs):
         self.model = None
         self.name = "Unknown Model"
         self.hyperparameters = kwargs
+        self.tuning_report = None  # Filled in by run_hyperparameter_tuning
+        self.feature_schema = None  # {"columns": [...], "dtypes": {...}, "target": ...} of the training data
+        self.metrics = None  # Evaluation metrics recorded alongside a saved model
+        self.preprocessor = None  # Fitted preprocessing stage applied before predict
 
     def train(self, X_train, y_train):
         """Trains the model on the provided data."""
@@ -17,10 +27,35 @@ class BaseModel:
         """Evaluates the trained model and returns metrics."""
         raise NotImplementedError
 
-    def save(self, file_path):
-        """Saves the trained model to a file."""
-        if self.model:
-            joblib.dump(self.model, file_path)
-            print(f"Model saved to {file_path}")
-        else:
-            print("Model not trained yet. Cannot save.")
\ No newline at end of file
+    def predict(self, X):
+        if self.preprocessor is not None:
+            X = self.preprocessor.transform(X)
+        return self.model.predict(X)
+
+    def save(self, file_path, compress=0):
+        """
+        Saves the trained model as an artifact directory (see cortex.algorithms.artifact).
+        compress=0 keeps numpy payloads memory-mappable; pass a joblib compression level to shrink them.
+        """
+        from cortex.algorithms.artifact import save_artifact
+
+        if self.model is None:
+            print("Model not trained yet. Cannot save.")
+            return None
+        save_artifact(self, file_path, compress=compress)
+        print(f"Model saved to {file_path}")
+        return file_path
+
+    @classmethod
+    def load(cls, file_path, mmap_mode="r"):
+        from cortex.algorithms.artifact import load_artifact
+        return load_artifact(file_path, mmap_mode=mmap_mode)
+
+    def _save_payload(self, directory, compress):
+        """Writes the fitted estimator into the artifact directory and returns its file name."""
+        file_name = "estimator.joblib"
+        joblib.dump(self.model, os.path.join(directory, file_name), compress=compress)
+        return file_name
+
+    def _load_payload(self, directory, file_name, mmap_mode):
+        self.model = joblib.load(os.path.join(directory, file_name), mmap_mode=mmap_mode)
@@ -1,15 +1,65 @@
+import os
+import numpy as np
 import torch
 import torch.nn as nn
 from cortex.algorithms.base import BaseModel # Inherit for core CLI compatibility
 
+def to_tensor(data, dtype=np.float32):
+    """
+    Converts a DataFrame/Series/array to a CPU tensor. Contiguous arrays already in
+    `dtype` are wrapped without copying (torch.from_numpy shares their memory);
+    anything else is converted once.
+    """
+    if hasattr(data, "to_numpy"):
+        data = data.to_numpy(dtype=dtype)
+    array = np.ascontiguousarray(data, dtype=dtype)
+    if not array.flags.writeable:
+        array = array.copy()  # torch can't wrap read-only (e.g. memory-mapped) buffers.
+    return torch.from_numpy(array)
+
+class FastTensorLoader:
+    """
+    Mini-batches over in-memory tensors. Unlike DataLoader(TensorDataset(...)),
+    which indexes and collates one sample at a time, each batch is a single slice
+    (or one index_select when shuffling).
+    """
+    def __init__(self, X, y, batch_size=32, shuffle=False, seed=None):
+        self.X = X
+        self.y = y
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.generator = torch.Generator()
+        if seed is not None:
+            self.generator.manual_seed(seed)
+
+    def __len__(self):
+        return (len(self.X) + self.batch_size - 1) // self.batch_size
+
+    def __iter__(self):
+        n = len(self.X)
+        if self.shuffle:
+            order = torch.randperm(n, generator=self.generator)
+            for start in range(0, n, self.batch_size):
+                rows = order[start:start + self.batch_size]
+                yield self.X.index_select(0, rows), self.y.index_select(0, rows)
+        else:
+            for start in range(0, n, self.batch_size):
+                yield self.X[start:start + self.batch_size], self.y[start:start + self.batch_size]
+
 class BaseDeepLearningModel(BaseModel):
     """
     Abstract base class for all deep learning models in Cortex.
     """
+    _transient_attributes = ("_compiled",)
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
 
+    def make_loader(self, X, y, shuffle=False):
+        """Wraps features and targets in a loader for train/evaluate."""
+        return FastTensorLoader(to_tensor(X), to_tensor(y).view(-1, 1), shuffle=shuffle)
+
     def train(self, dataloader):
         """Trains the model on the provided DataLoader."""
         raise NotImplementedError
@@ -18,10 +68,19 @@ class BaseDeepLearningModel(BaseModel):
         """Evaluates the model on the provided DataLoader."""
         raise NotImplementedError
 
-    def save(self, file_path):
-        """Saves the model's state dictionary to a file."""
-        if self.model:
-            torch.save(self.model.state_dict(), file_path)
-            print(f"Deep learning model saved to {file_path}")
-        else:
-            print("Model not trained yet. Cannot save.")
\ No newline at end of file
+    def build_network(self):
+        """Returns an untrained network with this model's architecture; used to restore saved weights."""
+        raise NotImplementedError
+
+    def _save_payload(self, directory, compress):
+        file_name = "state_dict.pt"
+        torch.save(self.model.state_dict(), os.path.join(directory, file_name))
+        return file_name
+
+    def _load_payload(self, directory, file_name, mmap_mode):
+        # mmap=True maps the saved tensors instead of reading them into memory.
+        state_dict = torch.load(os.path.join(directory, file_name), map_location="cpu", mmap=mmap_mode is not None, weights_only=True)
+        self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+        self.model = self.build_network()
+        self.model.load_state_dict(state_dict)
+        self.model.to(self.device)
@@ -1,36 +1,70 @@
-from .supervised.regression import LinearRegressionModel
-from .supervised.classification import RandomForestClassifierModel
-from .supervised.text_models import TextClassifierModel
-from .unsupervised.clustering import KMeansModel
-from .reinforcement_learning.q_learning import QLearningAgent
-from .supervised.xgboost import XGBoostClassifierModel
-from .supervised.lightgbm import LightGBMClassifierModel
-from .supervised.ensemble import EnsembleClassifierModel
-from .supervised.xgboost_regressor import XGBoostRegressorModel # New import
-from .supervised.lightgbm_regressor import LightGBMRegressorModel # New import
+import importlib
 
+# Models are referenced by import path so that heavy backends (xgboost, lightgbm,
+# gymnasium, torch) are only imported once a model is actually selected.
 MODEL_REGISTRY = {
     "regression": [
-        {"name": "XGBoost Regressor", "class": XGBoostRegressorModel, "description": "A powerful gradient boosting model for continuous values."},
-        {"name": "LightGBM Regressor", "class": LightGBMRegressorModel, "description": "A fast and efficient gradient boosting model for continuous values."},
-        {"name": "Linear Regression", "class": LinearRegressionModel, "description": "A simple, fast model for predicting continuous values."},
+        {"name": "XGBoost Regressor", "path": "cortex.algorithms.supervised.xgboost_regressor.XGBoostRegressorModel", "description": "A powerful gradient boosting model for continuous values."},
+        {"name": "LightGBM Regressor", "path": "cortex.algorithms.supervised.lightgbm_regressor.LightGBMRegressorModel", "description": "A fast and efficient gradient boosting model for continuous values."},
+        {"name": "Linear Regression", "path": "cortex.algorithms.supervised.regression.LinearRegressionModel", "description": "A simple, fast model for predicting continuous values."},
+        {"name": "Simple ANN Regressor", "path": "cortex.algorithms.deep_learning.simple_ann.SimpleANNRegressorModel", "description": "A small neural network (MLP) for non-linear continuous targets."},
     ],
     "classification": [
-        {"name": "XGBoost Classifier", "class": XGBoostClassifierModel, "description": "A powerful gradient boosting model, often a top choice in hackathons."},
-        {"name": "LightGBM Classifier", "class": LightGBMClassifierModel, "description": "A fast and efficient gradient boosting model, ideal for large datasets."},
-        {"name": "Random Forest Classifier", "class": RandomForestClassifierModel, "description": "An ensemble model that handles non-linear data well."},
-        {"name": "Ensemble Voting Classifier", "class": EnsembleClassifierModel, "description": "Combines predictions from multiple models for improved accuracy."},
+        {"name": "XGBoost Classifier", "path": "cortex.algorithms.supervised.xgboost.XGBoostClassifierModel", "description": "A powerful gradient boosting model, often a top choice in hackathons."},
+        {"name": "LightGBM Classifier", "path": "cortex.algorithms.supervised.lightgbm.LightGBMClassifierModel", "description": "A fast and efficient gradient boosting model, ideal for large datasets."},
+        {"name": "Random Forest Classifier", "path": "cortex.algorithms.supervised.classification.RandomForestClassifierModel", "description": "An ensemble model that handles non-linear data well."},
+        {"name": "Ensemble Voting Classifier", "path": "cortex.algorithms.supervised.ensemble.EnsembleClassifierModel", "description": "Combines predictions from multiple models for improved accuracy."},
+        {"name": "Simple ANN", "path": "cortex.algorithms.deep_learning.simple_ann.SimpleANNModel", "description": "A small neural network (MLP) trained with a CPU-tuned loop."},
     ],
     "text_classification": [
-        {"name": "Multinomial Naive Bayes", "class": TextClassifierModel, "description": "A probabilistic classifier suitable for text data."},
+        {"name": "Multinomial Naive Bayes", "path": "cortex.algorithms.supervised.text_models.TextClassifierModel", "description": "A probabilistic classifier suitable for text data."},
+        {"name": "Sentence Embeddings + Logistic Regression", "path": "cortex.algorithms.supervised.text_models.EmbeddingTextClassifierModel", "description": "Semantic MiniLM embeddings, cached on disk, with a fast linear classifier."},
+        {"name": "Hashing Naive Bayes (Streaming)", "path": "cortex.algorithms.supervised.text_models.StreamingTextClassifierModel", "description": "Hashing features and incremental training; handles corpora larger than memory."},
     ],
     "clustering": [
-        {"name": "K-Means", "class": KMeansModel, "description": "A popular algorithm for finding groups in data."},
+        {"name": "K-Means", "path": "cortex.algorithms.unsupervised.clustering.KMeansModel", "description": "A popular algorithm for finding groups in data."},
     ],
     "reinforcement_learning": [
-        {"name": "Q-Learning Agent", "class": QLearningAgent, "description": "A classic algorithm for tabular environments."},
+        {"name": "Q-Learning Agent", "path": "cortex.algorithms.reinforcement_learning.q_learning.QLearningAgent", "description": "A classic algorithm for tabular environments."},
     ]
 }
 
+_LOADED_CLASSES = {}
+
 def get_suggested_models(problem_type):
-    return MODEL_REGISTRY.get(problem_type, [])
\ No newline at end of file
+    return MODEL_REGISTRY.get(problem_type, [])
+
+def find_model_entry(name, problem_type):
+    """
+    The registry entry for a model name (case-insensitive) under problem_type. With no
+    name, the first suggestion for the problem type is used; a dotted import path is
+    accepted as-is.
+    """
+    entries = get_suggested_models(problem_type)
+    if not entries:
+        raise ValueError(f"Unknown problem type '{problem_type}'. Choose from: {', '.join(MODEL_REGISTRY)}.")
+    if not name:
+        return entries[0]
+    for entry in entries:
+        if entry["name"].lower() == name.lower():
+            return entry
+    if "." in name:
+        return {"name": name.rsplit(".", 1)[-1], "path": name}
+    raise ValueError(f"No model named '{name}' for {problem_type}. Choose from: {', '.join(e['name'] for e in entries)}.")
+
+def load_model_class(entry):
+    """
+    Imports and returns the model class for a registry entry (or a dotted import path).
+    Classes are cached, so repeated lookups don't hit the import machinery.
+    """
+    path = entry["path"] if isinstance(entry, dict) else entry
+    if path not in _LOADED_CLASSES:
+        module_name, class_name = path.rsplit(".", 1)
+        try:
+            module = importlib.import_module(module_name)
+        except ModuleNotFoundError as e:
+            if e.name and e.name.split(".")[0] == "cortex":
+                raise
+            raise ImportError(f"This model needs the '{e.name}' package, which is not installed.") from e
+        _LOADED_CLASSES[path] = getattr(module, class_name)
+    return _LOADED_CLASSES[path]
@@ -1,9 +1,12 @@
 # cortex/algorithms/reinforcement_learning/q_learning.py
+import os
 import numpy as np
 import gymnasium as gym
 from ..base import BaseModel
 
 class QLearningAgent(BaseModel):
+    _transient_attributes = ("q_table",)  # Same array as self.model
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.name = "Q-Learning Agent"
@@ -12,59 +15,267 @@ class QLearningAgent(BaseModel):
             'learning_rate': 0.1,
             'discount_factor': 0.99,
             'epsilon_greedy': 0.1,
-            'episodes': 5000
+            'episodes': 5000,
+            # 'vectorized' steps num_envs copies of the environment at once, 'planning' runs
+            # value iteration on the environment's transition model (env.unwrapped.P),
+            # 'auto' plans when that model exists, and 'sequential' is the one-env loop.
+            'mode': 'vectorized',
+            'num_envs': 16,
+            'planning_tolerance': 1e-8,
+            'seed': None,
+            'eval_episodes': 100,
+            # Worker processes for evaluation; worth raising for expensive environments.
+            'eval_workers': 1,
+            **kwargs,
         }
         self.q_table = None
+        self.episode_rewards = None
 
     def train(self, env):
         """Trains the agent in the given environment."""
-        state_space_size = env.observation_space.n
-        action_space_size = env.action_space.n
-        
-        self.q_table = np.zeros((state_space_size, action_space_size))
-        
+        mode = self.hyperparameters['mode']
+        if mode == 'auto':
+            mode = 'planning' if _transition_model(env) is not None else 'vectorized'
+        if mode == 'vectorized' and env.spec is None and not TabularModelEnvs.supports(env):
+            # Only gymnasium.vector needs a spec to copy the environment; without one, fall back.
+            mode = 'sequential'
+
+        if mode == 'planning':
+            self.q_table = self._train_planning(env)
+            summary = "value iteration converged"
+        elif mode == 'vectorized':
+            self.q_table = self._train_vectorized(env)
+            summary = f"{self.hyperparameters['episodes']} episodes across {self.hyperparameters['num_envs']} environments"
+        elif mode == 'sequential':
+            self.q_table = self._train_sequential(env)
+            summary = f"{self.hyperparameters['episodes']} episodes"
+        else:
+            raise ValueError(f"Unknown Q-learning mode '{mode}'. Choose from: vectorized, planning, sequential, auto.")
+
+        self.model = self.q_table
+        print(f"Training complete ({summary}).")
+
+    def _train_sequential(self, env):
+        learning_rate = self.hyperparameters['learning_rate']
+        discount = self.hyperparameters['discount_factor']
+        epsilon = self.hyperparameters['epsilon_greedy']
+        rng = np.random.default_rng(self.hyperparameters['seed'])
+        n_actions = env.action_space.n
+        q_table = np.zeros((env.observation_space.n, n_actions))
+
         for episode in range(self.hyperparameters['episodes']):
             state, info = env.reset()
             terminated, truncated = False, False
             while not terminated and not truncated:
-                if np.random.uniform(0, 1) < self.hyperparameters['epsilon_greedy']:
-                    action = env.action_space.sample()  # Explore
+                if rng.random() < epsilon:
+                    action = int(rng.integers(n_actions))  # Explore
                 else:
-                    action = np.argmax(self.q_table[state, :])  # Exploit
+                    action = _greedy(q_table[state], rng)  # Exploit
 
                 next_state, reward, terminated, truncated, info = env.step(action)
-                
+
                 # Q-Learning update rule
-                self.q_table[state, action] = self.q_table[state, action] + self.hyperparameters['learning_rate'] * (
-                    reward + self.hyperparameters['discount_factor'] * np.max(self.q_table[next_state, :]) - self.q_table[state, action]
-                )
+                target = reward + (0.0 if terminated else discount * q_table[next_state].max())
+                q_table[state, action] += learning_rate * (target - q_table[state, action])
                 state = next_state
-        
-        self.model = self.q_table
-        print(f"Training complete after {self.hyperparameters['episodes']} episodes.")
+        return q_table
+
+    def _train_vectorized(self, env):
+        """
+        Q-learning over num_envs copies of the environment stepped together. Each
+        step chooses all actions with one epsilon-greedy draw and applies the whole
+        batch of updates with np.add.at (which accumulates repeated state-action pairs).
+
+        Environments with a known transition model are simulated directly in numpy
+        (see TabularModelEnvs); others are stepped through gymnasium.vector.
+        """
+        learning_rate = self.hyperparameters['learning_rate']
+        discount = self.hyperparameters['discount_factor']
+        epsilon = self.hyperparameters['epsilon_greedy']
+        episodes = self.hyperparameters['episodes']
+        num_envs = max(1, min(self.hyperparameters['num_envs'], episodes))
+        seed = self.hyperparameters['seed']
+        rng = np.random.default_rng(seed)
+
+        envs = TabularModelEnvs.from_env(env, num_envs)
+        if envs is None:
+            envs = gym.vector.SyncVectorEnv(
+                [lambda: gym.make(env.spec) for _ in range(num_envs)],
+                autoreset_mode=gym.vector.AutoresetMode.NEXT_STEP,
+            )
+        n_actions = envs.single_action_space.n
+        q_table = np.zeros((envs.single_observation_space.n, n_actions))
+
+        try:
+            states, _ = envs.reset(seed=seed)
+            # With next-step autoreset, the step after an episode ends only resets that
+            # environment; its transition is not real and must not be learned from.
+            resetting = np.zeros(num_envs, dtype=bool)
+            finished = 0
+            while finished < episodes:
+                q_rows = q_table[states]
+                # Greedy with random tie-breaking, so untrained states are explored evenly.
+                best = q_rows == q_rows.max(axis=1, keepdims=True)
+                actions = np.argmax(best * rng.random(q_rows.shape), axis=1)
+                explore = rng.random(num_envs) < epsilon
+                actions[explore] = rng.integers(n_actions, size=int(explore.sum()))
+
+                next_states, rewards, terminated, truncated, _ = envs.step(actions)
+
+                live = ~resetting
+                s, a, s_next = states[live], actions[live], next_states[live]
+                targets = rewards[live] + discount * q_table[s_next].max(axis=1) * ~terminated[live]
+                np.add.at(q_table, (s, a), learning_rate * (targets - q_table[s, a]))
+
+                resetting = terminated | truncated
+                finished += int(resetting.sum())
+                states = next_states
+        finally:
+            envs.close()
+        return q_table
+
+    def _train_planning(self, env):
+        """
+        Value iteration on the environment's known transition model. Converges to the
+        optimal Q-table without sampling a single episode.
+        """
+        model = _transition_model(env)
+        if model is None:
+            raise ValueError("Planning mode needs an environment with a transition model (env.unwrapped.P).")
+        discount = self.hyperparameters['discount_factor']
+        tolerance = self.hyperparameters['planning_tolerance']
+        n_states, n_actions = env.observation_space.n, env.action_space.n
+
+        probs, next_states, rewards, dones = _flatten_model(model, n_states, n_actions)
+        expected_reward = (probs * rewards).sum(axis=2)
+        continue_probs = probs * ~dones
+
+        values = np.zeros(n_states)
+        for _ in range(100_000):
+            q_table = expected_reward + discount * (continue_probs * values[next_states]).sum(axis=2)
+            new_values = q_table.max(axis=1)
+            converged = np.max(np.abs(new_values - values)) < tolerance
+            values = new_values
+            if converged:
+                break
+        return q_table
 
     def evaluate(self, env):
-        """Evaluates the agent's performance by running a few test episodes."""
-        total_rewards = 0
-        test_episodes = 100
-        
-        for _ in range(test_episodes):
-            state, info = env.reset()
-            terminated, truncated = False, False
-            episode_rewards = 0
-            while not terminated and not truncated:
-                action = np.argmax(self.model[state, :])
-                state, reward, terminated, truncated, _ = env.step(action)
-                episode_rewards += reward
-            total_rewards += episode_rewards
-        
-        average_reward = total_rewards / test_episodes
-        return {"Average Reward": average_reward}
-
-    def save(self, file_path):
-        """Saves the trained Q-table."""
-        if self.model is not None:
-            np.save(file_path, self.model)
-            print(f"Q-table saved to {file_path}.npy")
-        else:
-            print("Model not trained yet. Cannot save.")
\ No newline at end of file
+        """
+        Evaluates the greedy policy over eval_episodes seeded test episodes, across
+        eval_workers processes. Per-episode rewards are kept on self.episode_rewards.
+        """
+        from .rollout import TablePolicy, run_rollouts, summarize_rewards
+
+        self.episode_rewards = run_rollouts(
+            TablePolicy(self.model), env,
+            episodes=self.hyperparameters['eval_episodes'],
+            workers=self.hyperparameters['eval_workers'],
+            seed=self.hyperparameters['seed'] or 0,
+        )
+        summary = summarize_rewards(self.episode_rewards)
+        return {
+            "Average Reward": summary["mean"],
+            "Reward Std": summary["std"],
+            "Reward 95% CI Low": summary["ci_low"],
+            "Reward 95% CI High": summary["ci_high"],
+        }
+
+    def _save_payload(self, directory, compress):
+        # Stored as a plain .npy so it can be memory-mapped on load.
+        file_name = "q_table.npy"
+        np.save(os.path.join(directory, file_name), np.asarray(self.model))
+        return file_name
+
+    def _load_payload(self, directory, file_name, mmap_mode):
+        self.model = self.q_table = np.load(os.path.join(directory, file_name), mmap_mode=mmap_mode)
+
+def _greedy(q_row, rng):
+    best = np.flatnonzero(q_row == q_row.max())
+    return int(best[0] if len(best) == 1 else rng.choice(best))
+
+def _transition_model(env):
+    return getattr(env.unwrapped, "P", None)
+
+def _flatten_model(model, n_states, n_actions):
+    """
+    Turns P[s][a] = [(prob, next_state, reward, done), ...] into dense
+    (n_states, n_actions, max_outcomes) arrays, padding with zero-probability outcomes.
+    """
+    width = max(len(outcomes) for actions in model.values() for outcomes in actions.values())
+    probs = np.zeros((n_states, n_actions, width))
+    next_states = np.zeros((n_states, n_actions, width), dtype=np.int64)
+    rewards = np.zeros((n_states, n_actions, width))
+    dones = np.zeros((n_states, n_actions, width), dtype=bool)
+    for state, actions in model.items():
+        for action, outcomes in actions.items():
+            for k, (prob, next_state, reward, done) in enumerate(outcomes):
+                probs[state, action, k] = prob
+                next_states[state, action, k] = next_state
+                rewards[state, action, k] = reward
+                dones[state, action, k] = done
+    return probs, next_states, rewards, dones
+
+class TabularModelEnvs:
+    """
+    A batch of copies of a toy-text environment simulated with numpy from its
+    transition model, mimicking the gymnasium.vector API with next-step autoreset.
+    Stepping thousands of these costs about as much as one gymnasium step.
+    """
+    def __init__(self, model, observation_space, action_space, initial_distribution, num_envs, max_episode_steps=None):
+        self.single_observation_space = observation_space
+        self.single_action_space = action_space
+        self.num_envs = num_envs
+        self.max_episode_steps = max_episode_steps
+        probs, self._next_states, self._rewards, self._dones = _flatten_model(model, observation_space.n, action_space.n)
+        self._cumulative = probs.cumsum(axis=2)
+        self._initial = np.cumsum(initial_distribution)
+        self._rng = np.random.default_rng()
+
+    @staticmethod
+    def supports(env):
+        """Whether `env` exposes the transition model and initial distribution needed to simulate it."""
+        return _transition_model(env) is not None and getattr(env.unwrapped, "initial_state_distrib", None) is not None
+
+    @classmethod
+    def from_env(cls, env, num_envs):
+        """Returns the simulator for `env`, or None if it doesn't expose a transition model."""
+        if not cls.supports(env):
+            return None
+        max_steps = env.spec.max_episode_steps if env.spec is not None else None
+        return cls(_transition_model(env), env.observation_space, env.action_space,
+                   env.unwrapped.initial_state_distrib, num_envs, max_steps)
+
+    def _sample_initial(self, n):
+        return np.minimum(np.searchsorted(self._initial, self._rng.random(n), side="right"), len(self._initial) - 1)
+
+    def reset(self, seed=None):
+        self._rng = np.random.default_rng(seed)
+        self._states = self._sample_initial(self.num_envs)
+        self._steps = np.zeros(self.num_envs, dtype=np.int64)
+        self._resetting = np.zeros(self.num_envs, dtype=bool)
+        return self._states.copy(), {}
+
+    def step(self, actions):
+        states = self._states
+        cumulative = self._cumulative[states, actions]
+        outcome = np.minimum((self._rng.random((self.num_envs, 1)) >= cumulative).sum(axis=1), cumulative.shape[1] - 1)
+        next_states = self._next_states[states, actions, outcome]
+        rewards = self._rewards[states, actions, outcome]
+        terminated = self._dones[states, actions, outcome]
+        self._steps += 1
+        truncated = ~terminated & (self._steps >= self.max_episode_steps) if self.max_episode_steps else np.zeros_like(terminated)
+
+        # Environments whose episode ended on the previous step reset instead of stepping.
+        resetting = self._resetting
+        if resetting.any():
+            next_states[resetting] = self._sample_initial(int(resetting.sum()))
+            rewards[resetting] = 0.0
+            terminated[resetting] = truncated[resetting] = False
+            self._steps[resetting] = 0
+        self._resetting = terminated | truncated
+        self._states = next_states
+        return next_states.copy(), rewards, terminated, truncated, {}
+
+    def close(self):
+        pass
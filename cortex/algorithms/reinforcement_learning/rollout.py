@@ -0,0 +1,70 @@
+# cortex/algorithms/reinforcement_learning/rollout.py
+import math
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+class TablePolicy:
+    """Greedy policy over a tabular value function (e.g. a Q-table). Picklable, so it can be sent to workers."""
+    def __init__(self, table):
+        self.table = table
+
+    def __call__(self, observation):
+        return int(np.argmax(self.table[observation]))
+
+def run_episode(env, policy, seed, max_steps=None):
+    """Plays one episode with `policy` from env.reset(seed=seed) and returns its total reward."""
+    observation, _ = env.reset(seed=seed)
+    total, steps = 0.0, 0
+    terminated, truncated = False, False
+    while not terminated and not truncated:
+        observation, reward, terminated, truncated, _ = env.step(policy(observation))
+        total += float(reward)
+        steps += 1
+        if max_steps is not None and steps >= max_steps:
+            break
+    return total
+
+# Per-worker state: the policy and the worker's one environment, built once.
+_worker_policy = None
+_worker_env = None
+
+def _init_worker(env_spec, policy):
+    global _worker_policy, _worker_env
+    import gymnasium as gym
+
+    _worker_policy = policy
+    _worker_env = gym.make(env_spec)
+
+def _run_seeds(seeds, max_steps):
+    return [run_episode(_worker_env, _worker_policy, seed, max_steps) for seed in seeds]
+
+def run_rollouts(policy, env, episodes=100, workers=1, seed=0, max_steps=None):
+    """
+    Evaluates `policy` over `episodes` episodes and returns their rewards as an array.
+
+    Episode i always starts from env.reset(seed=seed + i), so results are the same
+    whichever worker plays it and however many workers there are. With workers > 1
+    the episodes are split across processes that each build one environment from
+    env.spec (including its make() arguments); otherwise they run here on `env`.
+    """
+    seeds = [seed + i for i in range(episodes)]
+    workers = max(1, min(workers or 1, episodes))
+    if workers == 1 or env.spec is None:
+        return np.array([run_episode(env, policy, s, max_steps) for s in seeds])
+
+    # A few chunks per worker keeps them busy when episode lengths vary.
+    n_chunks = min(episodes, workers * 4)
+    chunks = [seeds[i::n_chunks] for i in range(n_chunks)]
+    rewards = {}
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(env.spec, policy)) as pool:
+        for chunk, chunk_rewards in zip(chunks, pool.map(_run_seeds, chunks, [max_steps] * n_chunks)):
+            rewards.update(zip(chunk, chunk_rewards))
+    return np.array([rewards[s] for s in seeds])
+
+def summarize_rewards(rewards, confidence_z=1.96):
+    """Mean, standard deviation and a normal-approximation 95% confidence interval of the mean."""
+    rewards = np.asarray(rewards, dtype=float)
+    mean = float(rewards.mean())
+    std = float(rewards.std(ddof=1)) if len(rewards) > 1 else 0.0
+    half_width = confidence_z * std / math.sqrt(len(rewards))
+    return {"mean": mean, "std": std, "ci_low": mean - half_width, "ci_high": mean + half_width}
@@ -0,0 +1,220 @@
+# cortex/algorithms/supervised/boosting.py
+import inspect
+import time
+import numpy as np
+from sklearn.base import clone
+from sklearn.metrics import accuracy_score, mean_squared_error
+from sklearn.model_selection import KFold, StratifiedKFold, train_test_split
+from ..base import BaseModel
+
+# Fraction of the training rows held out to decide when to stop boosting.
+VALIDATION_FRACTION = 0.1
+EARLY_STOPPING_ROUNDS = 20
+# Below this many rows early stopping is skipped and all rows are used for training.
+MIN_ROWS_FOR_VALIDATION = 100
+
+def _take(data, rows):
+    return data.iloc[rows] if hasattr(data, "iloc") else data[rows]
+
+def _encode_labels(y):
+    """Maps class labels to 0..k-1 codes as the native boosting APIs expect."""
+    _, codes = np.unique(np.asarray(y), return_inverse=True)
+    return codes
+
+class BaseBoostingModel(BaseModel):
+    """
+    Shared training logic for the XGBoost and LightGBM wrappers.
+
+    `train` holds out a validation split and stops boosting once it stops
+    improving, recording the best iteration. Classifiers train on 0..k-1 codes of
+    the labels (as XGBoost requires) and `predict` maps them back. `native_cv` scores a candidate
+    parameter set on the backend's own dataset format (DMatrix / lgb.Dataset),
+    which is built once per X and reused across every tuning candidate and fold.
+    """
+    is_classifier = False
+    native_categorical = True
+    _transient_attributes = ("_native_cache",)
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.best_iteration = None
+        self.classes_ = None  # Original class labels, indexed by the codes the booster predicts
+        self._native_cache = None
+
+    def _validation_split(self, X, y):
+        if len(y) < MIN_ROWS_FOR_VALIDATION:
+            return None
+        stratify = y if self.is_classifier and np.min(np.unique(np.asarray(y), return_counts=True)[1]) >= 2 else None
+        return train_test_split(X, y, test_size=VALIDATION_FRACTION, random_state=42, stratify=stratify)
+
+    def train(self, X_train, y_train):
+        if self.is_classifier:
+            self.classes_, y_train = np.unique(np.asarray(y_train), return_inverse=True)
+        split = self._validation_split(X_train, y_train)
+        if split is None:
+            self._fit(X_train, y_train)
+            self.best_iteration = None
+            return
+        X_fit, X_val, y_fit, y_val = split
+        self.best_iteration = self._fit(X_fit, y_fit, X_val, y_val)
+
+    def _fit(self, X, y, X_val=None, y_val=None):
+        """Fits self.model, early stopping on (X_val, y_val) if given. Returns the best iteration."""
+        raise NotImplementedError
+
+    def _decode(self, predictions):
+        if self.classes_ is None:
+            return predictions
+        return self.classes_[np.asarray(predictions).astype(int)]
+
+    def predict(self, X):
+        return self._decode(super().predict(X))
+
+    def _score(self, y_true, raw_predictions):
+        if self.is_classifier:
+            if raw_predictions.ndim > 1:
+                predicted = raw_predictions.argmax(axis=1)
+            else:
+                predicted = (raw_predictions > 0.5).astype(int)
+            return accuracy_score(y_true, predicted)
+        return -mean_squared_error(y_true, raw_predictions)
+
+    def _folds(self, X, y, cv):
+        """Returns the fold indices and native fold datasets for X, building them only once."""
+        cache = self._native_cache
+        if cache is None or cache["X"] is not X or cache["y"] is not y or cache["cv"] != cv:
+            labels = _encode_labels(y) if self.is_classifier else np.asarray(y, dtype=float)
+            splitter = StratifiedKFold(cv, shuffle=True, random_state=42) if self.is_classifier else KFold(cv, shuffle=True, random_state=42)
+            full = self._native_dataset(X, labels)
+            folds = []
+            for train_idx, valid_idx in splitter.split(np.zeros(len(labels)), labels if self.is_classifier else None):
+                folds.append((
+                    self._native_subset(full, train_idx),
+                    self._native_subset(full, valid_idx),
+                    _take(X, valid_idx),
+                    labels[valid_idx],
+                ))
+            cache = self._native_cache = {"X": X, "y": y, "cv": cv, "labels": labels, "folds": folds}
+        return cache
+
+    def clear_native_cache(self):
+        """Frees the fold datasets built by native_cv once tuning is over."""
+        self._native_cache = None
+
+    def native_cv(self, params, X, y, cv):
+        """
+        Cross-validates `params` on cached native datasets, with early stopping on
+        each validation fold. Returns per-fold "scores" (accuracy or negative MSE,
+        like the sklearn scorers used elsewhere) and "fit_times".
+        """
+        cache = self._folds(X, y, cv)
+        estimator = clone(self.model).set_params(**params)
+        scores, fit_times = [], []
+        for train_set, valid_set, X_valid, y_valid in cache["folds"]:
+            start = time.perf_counter()
+            booster = self._native_train(estimator, cache["labels"], train_set, valid_set)
+            fit_times.append(time.perf_counter() - start)
+            scores.append(self._score(y_valid, self._native_predict(booster, valid_set, X_valid)))
+        return {"scores": scores, "fit_times": fit_times}
+
+    def _native_dataset(self, X, labels):
+        raise NotImplementedError
+
+    def _native_subset(self, dataset, rows):
+        raise NotImplementedError
+
+    def _native_train(self, estimator, labels, train_set, valid_set):
+        raise NotImplementedError
+
+    def _native_predict(self, booster, valid_set, X_valid):
+        """Raw predictions for a validation fold, from its native dataset or its rows."""
+        raise NotImplementedError
+
+class BaseXGBoostModel(BaseBoostingModel):
+    def _fit(self, X, y, X_val=None, y_val=None):
+        if X_val is None:
+            self.model.set_params(early_stopping_rounds=None)
+            self.model.fit(X, y)
+            return None
+        self.model.set_params(early_stopping_rounds=EARLY_STOPPING_ROUNDS)
+        self.model.fit(X, y, eval_set=[(X_val, y_val)], verbose=False)
+        return self.model.best_iteration
+
+    def _native_dataset(self, X, labels):
+        import xgboost as xgb
+        return xgb.DMatrix(X, label=labels, enable_categorical=True)
+
+    def _native_subset(self, dataset, rows):
+        return dataset.slice(rows)
+
+    def _native_train(self, estimator, labels, train_set, valid_set):
+        import xgboost as xgb
+
+        params = {k: v for k, v in estimator.get_xgb_params().items() if v is not None}
+        if self.is_classifier:
+            n_classes = int(labels.max()) + 1
+            if n_classes > 2:
+                params.update(objective="multi:softprob", num_class=n_classes, eval_metric="mlogloss")
+            else:
+                params.update(objective="binary:logistic", eval_metric="logloss")
+        return xgb.train(
+            params, train_set, num_boost_round=estimator.get_params().get("n_estimators") or 100,
+            evals=[(valid_set, "valid")], early_stopping_rounds=EARLY_STOPPING_ROUNDS, verbose_eval=False,
+        )
+
+    def _native_predict(self, booster, valid_set, X_valid):
+        return booster.predict(valid_set, iteration_range=(0, booster.best_iteration + 1))
+
+class BaseLightGBMModel(BaseBoostingModel):
+    def _fit(self, X, y, X_val=None, y_val=None):
+        import lightgbm as lgb
+
+        if X_val is None:
+            self.model.fit(X, y)
+            return None
+        # LightGBM 4.6 added eval_X / eval_y and deprecated eval_set; older versions only have eval_set.
+        if "eval_X" in inspect.signature(self.model.fit).parameters:
+            validation = {"eval_X": (X_val,), "eval_y": (y_val,)}
+        else:
+            validation = {"eval_set": [(X_val, y_val)]}
+        self.model.fit(X, y, callbacks=[lgb.early_stopping(EARLY_STOPPING_ROUNDS, verbose=False)], **validation)
+        return self.model.best_iteration_
+
+    @staticmethod
+    def _booster_params(estimator):
+        """Translates the sklearn estimator's parameters into lgb.train parameters."""
+        params = {k: v for k, v in estimator.get_params().items() if v is not None}
+        for key in ("n_estimators", "silent", "importance_type", "class_weight", "n_jobs"):
+            params.pop(key, None)
+        params["verbosity"] = -1
+        return params
+
+    def _native_dataset(self, X, labels):
+        import lightgbm as lgb
+        dataset = lgb.Dataset(X, label=labels, free_raw_data=False, params=self._booster_params(self.model))
+        return dataset.construct()
+
+    def _native_subset(self, dataset, rows):
+        # Subsets share the parent's bin boundaries, so nothing is re-binned per fold.
+        return dataset.subset(sorted(rows)).construct()
+
+    def _native_train(self, estimator, labels, train_set, valid_set):
+        import lightgbm as lgb
+
+        params = self._booster_params(estimator)
+        num_boost_round = estimator.get_params().get("n_estimators") or 100
+        if self.is_classifier:
+            n_classes = int(labels.max()) + 1
+            if n_classes > 2:
+                params.update(objective="multiclass", num_class=n_classes)
+            else:
+                params.update(objective="binary")
+        else:
+            params.setdefault("objective", "regression")
+        return lgb.train(
+            params, train_set, num_boost_round=num_boost_round, valid_sets=[valid_set],
+            callbacks=[lgb.early_stopping(EARLY_STOPPING_ROUNDS, verbose=False)],
+        )
+
+    def _native_predict(self, booster, valid_set, X_valid):
+        return booster.predict(X_valid, num_iteration=booster.best_iteration)
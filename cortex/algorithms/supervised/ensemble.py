@@ -18,6 +18,8 @@ class EnsembleClassifierModel(BaseModel):
             ],
             voting='hard' # 'hard' voting uses predicted class labels
         )
+        if kwargs:
+            self.model.set_params(**kwargs)  # e.g. rf__n_estimators=200
         # No param_grid for this example
         self.param_grid = {}
 
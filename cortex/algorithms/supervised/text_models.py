@@ -1,7 +1,12 @@
+import numpy as np
+import scipy.sparse as sp
+from sklearn.base import BaseEstimator, TransformerMixin
 from sklearn.pipeline import Pipeline
 from sklearn.naive_bayes import MultinomialNB
-from sklearn.feature_extraction.text import CountVectorizer
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.feature_extraction.text import CountVectorizer, HashingVectorizer
 from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
+from cortex.nlp.embedding_store import DEFAULT_SENTENCE_MODEL, EmbeddingStore, load_sentence_model
 from ..base import BaseModel
 
 class TextClassifierModel(BaseModel):
@@ -13,6 +18,8 @@ class TextClassifierModel(BaseModel):
             ('vectorizer', CountVectorizer()),
             ('classifier', MultinomialNB())
         ])
+        if kwargs:
+            self.model.set_params(**kwargs)
         # Define the parameter grid for tuning the pipeline
         self.param_grid = {
             'vectorizer__ngram_range': [(1, 1), (1, 2)],
@@ -32,4 +39,123 @@ class TextClassifierModel(BaseModel):
             "Recall": recall_score(y_test, predictions, average='weighted', zero_division=0),
             "F1-Score": f1_score(y_test, predictions, average='weighted', zero_division=0)
         }
-        return metrics
\ No newline at end of file
+        return metrics
+
+class _HashedText(HashingVectorizer):
+    """HashingVectorizer that passes already-hashed (sparse) input straight through."""
+    def transform(self, X):
+        if sp.issparse(X):
+            return X
+        return super().transform(X)
+
+class StreamingTextClassifierModel(BaseModel):
+    """
+    Text classifier on stateless hashing features. There is no vocabulary to fit,
+    so the model can be trained chunk by chunk with partial_fit (`train_stream`),
+    and a corpus hashed once can be reused across tuning folds (the pipeline hands
+    it pre-hashed sparse matrices, which the hashing step passes through).
+
+    `estimator` is 'nb' (MultinomialNB) or 'sgd' (a linear model trained by SGD,
+    with the modified Huber loss so it still offers predict_proba).
+    """
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.name = "Hashing Naive Bayes (Streaming)"
+        self.hyperparameters = {
+            'estimator': 'nb',
+            'n_features': 2 ** 20,
+            'ngram_range': (1, 2),
+            **kwargs,
+        }
+        sgd = self.hyperparameters['estimator'] == 'sgd'
+        vectorizer = _HashedText(
+            n_features=self.hyperparameters['n_features'],
+            ngram_range=self.hyperparameters['ngram_range'],
+            alternate_sign=False,  # Naive Bayes needs non-negative counts
+            norm='l2' if sgd else None,
+        )
+        classifier = SGDClassifier(loss='modified_huber', random_state=42) if sgd else MultinomialNB()
+        self.model = Pipeline([('vectorizer', vectorizer), ('classifier', classifier)])
+        self.param_grid = {'classifier__alpha': [1e-5, 1e-4, 1e-3]} if sgd else {'classifier__alpha': [0.01, 0.1, 1.0]}
+
+    @property
+    def vectorizer(self):
+        return self.model.named_steps['vectorizer']
+
+    def train(self, X_train, y_train):
+        self.model.fit(X_train, y_train)
+
+    def train_stream(self, chunks, classes):
+        """Trains on an iterable of (texts, labels) chunks; `classes` lists every label up front."""
+        classifier = self.model.named_steps['classifier']
+        for texts, labels in chunks:
+            classifier.partial_fit(self.vectorizer.transform(texts), labels, classes=classes)
+
+    def evaluate(self, X_test, y_test):
+        return self._metrics(y_test, self.model.predict(X_test))
+
+    def evaluate_stream(self, chunks):
+        y_true, predictions = [], []
+        for texts, labels in chunks:
+            y_true.append(np.asarray(labels))
+            predictions.append(self.model.predict(texts))
+        return self._metrics(np.concatenate(y_true), np.concatenate(predictions))
+
+    @staticmethod
+    def _metrics(y_test, predictions):
+        return {
+            "Accuracy": accuracy_score(y_test, predictions),
+            "Precision": precision_score(y_test, predictions, average='weighted', zero_division=0),
+            "Recall": recall_score(y_test, predictions, average='weighted', zero_division=0),
+            "F1-Score": f1_score(y_test, predictions, average='weighted', zero_division=0)
+        }
+
+class SentenceEmbeddingTransformer(BaseEstimator, TransformerMixin):
+    """
+    Maps texts to sentence embeddings through the on-disk EmbeddingStore, so each
+    distinct document is encoded once, ever. The SentenceTransformer and the store
+    are opened lazily and never pickled with the estimator.
+    """
+    def __init__(self, model_name=DEFAULT_SENTENCE_MODEL, batch_size=256):
+        self.model_name = model_name
+        self.batch_size = batch_size
+
+    def fit(self, X, y=None):
+        return self
+
+    def _encode(self, texts):
+        model = load_sentence_model(self.model_name)
+        return model.encode(texts, batch_size=self.batch_size, normalize_embeddings=True, convert_to_numpy=True)
+
+    def transform(self, X):
+        if getattr(self, "_store", None) is None:
+            self._store = EmbeddingStore(self.model_name)
+        return self._store.embed(X, self._encode, batch_size=max(self.batch_size, 4096))
+
+    def __getstate__(self):
+        state = super().__getstate__()
+        state.pop("_store", None)
+        return state
+
+class EmbeddingTextClassifierModel(BaseModel):
+    """
+    Logistic regression on MiniLM sentence embeddings. Embeddings come from the
+    persistent EmbeddingStore, so tuning folds and repeated runs on a corpus only
+    pay for the (fast) linear fits.
+    """
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.name = "Sentence Embeddings + Logistic Regression"
+        self.model = Pipeline([
+            ('embeddings', SentenceEmbeddingTransformer()),
+            ('classifier', LogisticRegression(max_iter=1000))
+        ])
+        if kwargs:
+            self.model.set_params(**kwargs)
+        self.param_grid = {'classifier__C': [0.1, 1.0, 10.0]}
+
+    def train(self, X_train, y_train):
+        self.model.fit(X_train, y_train)
+
+    def evaluate(self, X_test, y_test):
+        return StreamingTextClassifierModel._metrics(y_test, self.model.predict(X_test))
@@ -1,23 +1,120 @@
 # cortex/algorithms/clustering.py
-from sklearn.cluster import KMeans
+import math
+import os
+import numpy as np
+from sklearn.cluster import KMeans, MiniBatchKMeans
 from sklearn.metrics import silhouette_score
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
 from ..base import BaseModel
 
+# Above this many rows, candidates are fit with MiniBatchKMeans.
+MINIBATCH_THRESHOLD = 50_000
+# MiniBatchKMeans settings used unless the model's hyperparameters override them.
+MINIBATCH_DEFAULTS = {"batch_size": 4096, "n_init": 3}
+# Rows per silhouette sample, and how many samples are averaged for the error bound.
+SILHOUETTE_SAMPLE_SIZE = 5_000
+SILHOUETTE_REPEATS = 5
+
+def sampled_silhouette(X, labels, sample_size=SILHOUETTE_SAMPLE_SIZE, repeats=SILHOUETTE_REPEATS, random_state=42):
+    """
+    Silhouette score estimated on `repeats` samples of `sample_size` rows, each drawn
+    stratified by cluster so small clusters stay represented. Returns (mean, standard
+    error of the mean); small datasets are scored exactly, with an error of 0.
+    """
+    n = len(labels)
+    if len(np.unique(labels)) < 2:
+        return float("nan"), float("nan")
+    if n <= sample_size:
+        return float(silhouette_score(X, labels)), 0.0
+
+    rng = np.random.default_rng(random_state)
+    clusters, inverse, counts = np.unique(labels, return_inverse=True, return_counts=True)
+    members = np.split(np.argsort(inverse, kind="stable"), np.cumsum(counts)[:-1])
+    # Proportional allocation, with at least two rows from every cluster.
+    quota = np.minimum(counts, np.maximum(2, np.round(counts * sample_size / n).astype(int)))
+    scores = []
+    for _ in range(repeats):
+        rows = np.concatenate([rng.choice(rows, size=q, replace=False) for rows, q in zip(members, quota)])
+        scores.append(silhouette_score(X[rows], labels[rows]))
+    return float(np.mean(scores)), float(np.std(scores, ddof=1) / math.sqrt(repeats))
+
+def _fit_candidate(X, n_clusters, minibatch, params, random_state):
+    if minibatch:
+        # KMeans-only options (e.g. algorithm) are dropped; the shared ones carry over.
+        accepted = MiniBatchKMeans().get_params()
+        params = {k: v for k, v in params.items() if k in accepted}
+        estimator = MiniBatchKMeans(**{**MINIBATCH_DEFAULTS, "random_state": random_state, **params, "n_clusters": n_clusters})
+    else:
+        estimator = KMeans(**{"n_init": "auto", "random_state": random_state, **params, "n_clusters": n_clusters})
+    labels = estimator.fit_predict(X)
+    score, error = sampled_silhouette(X, labels, random_state=random_state)
+    return {"n_clusters": n_clusters, "estimator": estimator, "silhouette": score, "stderr": error, "inertia": float(estimator.inertia_)}
+
 class KMeansModel(BaseModel):
+    """
+    K-Means with automatic choice of k. The numeric columns are standardized once;
+    every candidate k in param_grid is fit on that shared copy in parallel (joblib
+    memory-maps it into the workers) and scored with a sampled silhouette. The best
+    k is kept as a scaler + k-means pipeline, and n_clusters_ records it. Passing
+    n_clusters fixes k. Non-numeric columns are left out.
+    """
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.name = "K-Means Clustering"
         # We define a simple param_grid for hyperparameter tuning.
         self.param_grid = {'n_clusters': [2, 3, 4]}
-        self.model = KMeans(**self.hyperparameters)
+        self.model = None
+        self.columns_ = None
+        self.n_clusters_ = None
+        self.selection = None  # Per-k results from the last train()
+
+    def _features(self, X):
+        if hasattr(X, "select_dtypes"):
+            if self.columns_ is None:
+                numeric = list(X.select_dtypes("number").columns)
+                ignored = [str(col) for col in X.columns if col not in numeric]
+                if not numeric:
+                    raise ValueError(f"{self.name} needs numeric columns; found none among: {', '.join(ignored)}.")
+                if ignored:
+                    print(f"{self.name} uses numeric columns only; ignoring: {', '.join(ignored)}.")
+                self.columns_ = numeric
+            X = X[self.columns_]
+        X = np.asarray(X, dtype=np.float32)
+        if np.isnan(X).any():
+            X = np.where(np.isnan(X), np.nanmedian(X, axis=0), X)
+        return X
 
     def train(self, X_train):
         """Trains the model without a target variable."""
-        self.model.fit(X_train)
+        from joblib import Parallel, delayed
+
+        params = dict(self.hyperparameters)
+        candidates = [params.pop('n_clusters')] if 'n_clusters' in params else list(self.param_grid['n_clusters'])
+        random_state = params.pop('random_state', 42)
+
+        scaler = StandardScaler()
+        X = scaler.fit_transform(self._features(X_train)).astype(np.float32, copy=False)
+        minibatch = len(X) > MINIBATCH_THRESHOLD
+
+        n_jobs = min(len(candidates), os.cpu_count() or 1)
+        self.selection = Parallel(n_jobs=n_jobs)(
+            delayed(_fit_candidate)(X, k, minibatch, params, random_state) for k in candidates
+        )
+        best = max(self.selection, key=lambda c: -np.inf if math.isnan(c["silhouette"]) else c["silhouette"])
+        self.model = Pipeline([("scaler", scaler), ("kmeans", best["estimator"])])
+        self.n_clusters_ = best["n_clusters"]
+        for candidate in self.selection:
+            del candidate["estimator"]
+
+    def predict(self, X):
+        if self.preprocessor is not None:
+            X = self.preprocessor.transform(X)
+        return self.model.predict(self._features(X))
 
     def evaluate(self, X_test):
-        """Evaluates the trained model using the silhouette score."""
-        # Note: silhouette_score requires a pre-trained model to make predictions.
-        labels = self.model.predict(X_test)
-        score = silhouette_score(X_test, labels)
-        return {"Silhouette Score": score}
\ No newline at end of file
+        """Evaluates the trained model using a (sampled) silhouette score."""
+        X = self.model.named_steps["scaler"].transform(self._features(X_test))
+        labels = self.model.named_steps["kmeans"].predict(X)
+        score, error = sampled_silhouette(X, labels)
+        return {"Silhouette Score": score, "Silhouette Std Error": error}
@@ -0,0 +1,92 @@
+# cortex/benchmarks/ann.py
+import argparse
+import json
+import time
+import numpy as np
+
+def make_data(n_samples, n_features, n_classes, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.standard_normal((n_samples, n_features)).astype(np.float32)
+    weights = rng.standard_normal((n_features, n_classes))
+    y = (X @ weights).argmax(axis=1)
+    return X, y
+
+def _epochs_per_second(train, epochs):
+    start = time.perf_counter()
+    train()
+    return epochs / (time.perf_counter() - start)
+
+def benchmark_dataloader_baseline(X, y, epochs, hidden_sizes=(64, 32)):
+    """The previous pipeline setup: torch.tensor copies, DataLoader(TensorDataset) and batch_size=32."""
+    import torch
+    import torch.nn as nn
+    from torch.utils.data import DataLoader, TensorDataset
+
+    torch.manual_seed(0)
+    loader = DataLoader(TensorDataset(torch.tensor(X), torch.tensor(y)), batch_size=32, shuffle=True)
+    layers, width = [], X.shape[1]
+    for hidden in hidden_sizes:
+        layers += [nn.Linear(width, hidden), nn.ReLU()]
+        width = hidden
+    network = nn.Sequential(*layers, nn.Linear(width, int(y.max()) + 1))
+    optimizer = torch.optim.Adam(network.parameters(), lr=1e-3)
+    loss_fn = nn.CrossEntropyLoss()
+
+    def train():
+        for _ in range(epochs):
+            for X_batch, y_batch in loader:
+                optimizer.zero_grad()
+                loss_fn(network(X_batch), y_batch).backward()
+                optimizer.step()
+
+    return _epochs_per_second(train, epochs)
+
+def benchmark_simple_ann(X, y, epochs, **hyperparameters):
+    """
+    SimpleANNModel's loop: zero-copy tensors, FastTensorLoader and an adaptive batch
+    size. The timing includes building (and, with compile=True, compiling) the network.
+    """
+    from cortex.algorithms.deep_learning.simple_ann import SimpleANNModel
+
+    model = SimpleANNModel(epochs=epochs, **hyperparameters)
+    loader = model.make_loader(X, y, shuffle=True)
+    return _epochs_per_second(lambda: model.train(loader), epochs)
+
+def run_benchmark(n_samples=100_000, n_features=32, n_classes=4, epochs=3, variants=("baseline", "simple_ann")):
+    X, y = make_data(n_samples, n_features, n_classes)
+    runners = {
+        "baseline": lambda: benchmark_dataloader_baseline(X, y, epochs),
+        "simple_ann": lambda: benchmark_simple_ann(X, y, epochs),
+        "simple_ann_bf16": lambda: benchmark_simple_ann(X, y, epochs, bf16=True),
+        "simple_ann_compile": lambda: benchmark_simple_ann(X, y, epochs, compile=True),
+    }
+    results = {name: runners[name]() for name in variants}
+    if "baseline" in results:
+        results["speedup"] = {name: rate / results["baseline"] for name, rate in results.items() if name != "baseline"}
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m cortex.benchmarks.ann",
+        description="Measure SimpleANN training throughput (epochs/sec) against the old DataLoader setup."
+    )
+    parser.add_argument("--samples", type=int, default=100_000)
+    parser.add_argument("--features", type=int, default=32)
+    parser.add_argument("--classes", type=int, default=4)
+    parser.add_argument("--epochs", type=int, default=3, help="Epochs trained per variant.")
+    parser.add_argument("--variants", nargs="+", default=["baseline", "simple_ann"],
+                        choices=["baseline", "simple_ann", "simple_ann_bf16", "simple_ann_compile"])
+    parser.add_argument("--json", help="Also write the results to this file.")
+    args = parser.parse_args(argv)
+
+    results = run_benchmark(args.samples, args.features, args.classes, args.epochs, args.variants)
+    for name in args.variants:
+        print(f"{name:>20}: {results[name]:.2f} epochs/sec")
+    for name, speedup in results.get("speedup", {}).items():
+        print(f"{name:>20}: {speedup:.1f}x the DataLoader baseline")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+# cortex/benchmarks/suite.py
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# Rows generated per workload size.
+SIZES = {"small": 1_000, "medium": 20_000, "large": 200_000}
+# Toy-text environments standing in for each size of reinforcement-learning workload.
+RL_ENVIRONMENTS = {"small": "FrozenLake-v1", "medium": "FrozenLake8x8-v1", "large": "Taxi-v4"}
+# Timings compared by `cortex bench compare`, and the smallest change worth flagging for each.
+COMPARED_FIELDS = {"fit_seconds": 0.05, "tune_seconds": 0.05, "predict_seconds": 0.05, "peak_rss_mb": 20.0}
+DEFAULT_TUNING = {"strategy": "random", "max_fits": 10}
+
+def _write_tabular(path, X, y=None):
+    import pandas as pd
+
+    frame = pd.DataFrame(X, columns=[f"f{i}" for i in range(X.shape[1])])
+    if y is not None:
+        frame["target"] = y
+    frame.to_csv(path, index=False)
+
+def _write_text(path, n_samples, n_classes=3, seed=0):
+    import numpy as np
+    import pandas as pd
+
+    # Each class draws half its words from its own slice of the vocabulary.
+    rng = np.random.default_rng(seed)
+    vocabulary = np.array([f"w{i}" for i in range(2000)])
+    labels = rng.integers(n_classes, size=n_samples)
+    shared = rng.integers(len(vocabulary), size=(n_samples, 10))
+    own = labels[:, None] * 100 + rng.integers(100, size=(n_samples, 10))
+    words = vocabulary[np.concatenate([shared, own], axis=1)]
+    texts = [" ".join(row) for row in words]
+    pd.DataFrame({"text": texts, "label": [f"class_{c}" for c in labels]}).to_csv(path, index=False)
+
+def make_workload(problem_type, size, directory):
+    """Generates the dataset for one problem type and size; returns a file path (or environment ID)."""
+    from sklearn.datasets import make_blobs, make_classification, make_regression
+
+    n = SIZES[size]
+    path = os.path.join(directory, f"{problem_type}-{size}.csv")
+    if problem_type == "reinforcement_learning":
+        return RL_ENVIRONMENTS[size]
+    if os.path.exists(path):
+        return path
+    if problem_type == "classification":
+        X, y = make_classification(n_samples=n, n_features=20, n_informative=10, n_classes=3, random_state=0)
+        _write_tabular(path, X, y)
+    elif problem_type == "regression":
+        X, y = make_regression(n_samples=n, n_features=20, n_informative=10, noise=0.5, random_state=0)
+        _write_tabular(path, X, y)
+    elif problem_type == "clustering":
+        X, _ = make_blobs(n_samples=n, n_features=8, centers=4, random_state=0)
+        _write_tabular(path, X)
+    elif problem_type == "text_classification":
+        _write_text(path, n)
+    else:
+        raise ValueError(f"No benchmark workload for problem type '{problem_type}'.")
+    return path
+
+def _make_handler(problem_type, source):
+    if problem_type == "reinforcement_learning":
+        from cortex.data_handlers.environment import EnvironmentDataHandler
+        return EnvironmentDataHandler(source)
+    if problem_type == "text_classification":
+        from cortex.data_handlers.text import TextDataHandler
+        handler = TextDataHandler(source)
+    else:
+        from cortex.data_handlers.tabular import TabularDataHandler
+        handler = TabularDataHandler(source)
+    handler.use_cache = False  # Measure parsing every time, not cache hits.
+    return handler
+
+def run_case(entry, problem_type, size, source, tuning):
+    """Runs one registry model on one workload; meant to run in its own process so peak RSS is its own."""
+    from cortex.algorithms.registry import load_model_class
+    from cortex.profiling import peak_rss_mb, start_profiling, stop_profiling
+
+    result = {"model": entry["name"], "problem_type": problem_type, "size": size, "rows": SIZES[size]}
+    try:
+        model_class = load_model_class(entry)
+    except ImportError as e:
+        return {**result, "status": "unavailable", "error": str(e)}
+
+    handler = _make_handler(problem_type, source)
+    profiler = start_profiling()
+    output = io.StringIO()
+    start = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(output):
+            from cortex.pipeline.main import run_training_pipeline
+            metrics = run_training_pipeline(handler, model_class, problem_type, "", auto_run=True, tuning=tuning)
+    finally:
+        stop_profiling()
+    total = time.perf_counter() - start
+
+    stages = {}
+    for stage in profiler.stages:
+        stages[stage["name"]] = stages.get(stage["name"], 0.0) + stage["wall_seconds"]
+    if not metrics:
+        # The pipeline reports its errors on stdout; keep the last thing it said.
+        lines = [line for line in output.getvalue().splitlines() if line.strip()]
+        result["error"] = lines[-1] if lines else "The pipeline returned no metrics."
+    return {
+        **result,
+        "status": "ok" if metrics else "failed",
+        "load_seconds": stages.get("load_data"),
+        # For tuned models this is the final refit, which also counts towards tune_seconds.
+        "fit_seconds": stages.get("train"),
+        "tune_seconds": stages.get("tuning"),
+        "predict_seconds": stages.get("evaluate"),
+        "total_seconds": total,
+        "peak_rss_mb": peak_rss_mb(),
+        "metrics": {k: float(v) for k, v in (metrics or {}).items() if isinstance(v, (int, float))},
+    }
+
+def run_suite(sizes=("small",), problem_types=None, model_filter=None, tuning=None, data_dir=None, on_result=None):
+    """
+    Benchmarks every MODEL_REGISTRY entry (optionally filtered by problem type or a
+    substring of the model name) on each workload size. Every case runs in a fresh
+    process, so peak RSS is per case and imports are not shared between cases.
+    """
+    from cortex.algorithms.registry import MODEL_REGISTRY
+    from cortex.algorithms.artifact import library_versions
+
+    tuning = tuning if tuning is not None else DEFAULT_TUNING
+    problem_types = problem_types or list(MODEL_REGISTRY)
+    results = []
+    with contextlib.ExitStack() as stack:
+        data_dir = data_dir or stack.enter_context(tempfile.TemporaryDirectory(prefix="cortex-bench-"))
+        for problem_type in problem_types:
+            entries = [e for e in MODEL_REGISTRY.get(problem_type, []) if not model_filter or model_filter.lower() in e["name"].lower()]
+            for size in sizes:
+                if not entries:
+                    continue
+                source = make_workload(problem_type, size, data_dir)
+                for entry in entries:
+                    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+                        try:
+                            result = pool.submit(run_case, entry, problem_type, size, source, tuning).result()
+                        except Exception as e:
+                            result = {"model": entry["name"], "problem_type": problem_type, "size": size,
+                                      "rows": SIZES[size], "status": "crashed", "error": str(e)}
+                    results.append(result)
+                    if on_result:
+                        on_result(result)
+
+    return {
+        "meta": {
+            "created": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "versions": library_versions(),
+            "tuning": tuning,
+        },
+        "results": results,
+    }
+
+def compare_results(baseline, current, threshold=0.2):
+    """
+    Matches cases by (model, problem type, size) and returns the fields that got worse
+    by more than `threshold` (a fraction) and by more than the field's noise floor.
+    """
+    def index(run):
+        return {(r["model"], r["problem_type"], r["size"]): r for r in run["results"]}
+
+    base, new = index(baseline), index(current)
+    regressions = []
+    for key in sorted(base.keys() & new.keys()):
+        for field, floor in COMPARED_FIELDS.items():
+            old_value, new_value = base[key].get(field), new[key].get(field)
+            if old_value is None or new_value is None:
+                continue
+            if new_value > old_value * (1 + threshold) and new_value - old_value > floor:
+                regressions.append({
+                    "model": key[0], "problem_type": key[1], "size": key[2], "field": field,
+                    "baseline": old_value, "current": new_value,
+                    "change": (new_value - old_value) / old_value if old_value else float("inf"),
+                })
+        if base[key].get("status") == "ok" and new[key].get("status") != "ok":
+            regressions.append({"model": key[0], "problem_type": key[1], "size": key[2], "field": "status",
+                                "baseline": "ok", "current": new[key].get("status"), "change": None})
+    return regressions
+
+def _format_seconds(value):
+    return f"{value:.2f}" if value is not None else "-"
+
+def _print_result(result):
+    if result["status"] != "ok":
+        print(f"{result['model']:<42}{result['size']:<8}{result['status']}: {result.get('error', '')}")
+        return
+    print(f"{result['model']:<42}{result['size']:<8}{result['status']:<8}"
+          f"fit {_format_seconds(result['fit_seconds']):>7}s  tune {_format_seconds(result['tune_seconds']):>7}s  "
+          f"predict {_format_seconds(result['predict_seconds']):>6}s  peak {result['peak_rss_mb'] or 0:,.0f} MB")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="cortex bench", description="Benchmark registry models and compare runs.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Benchmark models on synthetic workloads and save the results as JSON.")
+    run.add_argument("--sizes", nargs="+", choices=list(SIZES), default=["small"])
+    run.add_argument("--problem-types", nargs="+", default=None, help="Limit to these problem types.")
+    run.add_argument("--models", default=None, help="Only models whose name contains this text.")
+    run.add_argument("--tuning-max-fits", type=int, default=DEFAULT_TUNING["max_fits"], help="Fit budget for each model's tuning.")
+    run.add_argument("--data-dir", default=None, help="Keep generated datasets here (reused on later runs).")
+    run.add_argument("--output", "-o", default="cortex-bench.json")
+
+    compare = commands.add_parser("compare", help="Flag regressions between two benchmark result files.")
+    compare.add_argument("baseline")
+    compare.add_argument("current")
+    compare.add_argument("--threshold", type=float, default=0.2, help="Relative slowdown that counts as a regression (default: 0.2).")
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        if args.data_dir:
+            os.makedirs(args.data_dir, exist_ok=True)
+        tuning = {**DEFAULT_TUNING, "max_fits": args.tuning_max_fits}
+        run_result = run_suite(args.sizes, args.problem_types, args.models, tuning, args.data_dir, on_result=_print_result)
+        with open(args.output, "w") as f:
+            json.dump(run_result, f, indent=2)
+        print(f"Wrote {len(run_result['results'])} results to {args.output}")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+    regressions = compare_results(baseline, current, args.threshold)
+    if not regressions:
+        print(f"No regressions over {args.threshold:.0%}.")
+        return 0
+    print(f"{len(regressions)} regression(s) over {args.threshold:.0%}:")
+    for r in regressions:
+        if r["field"] == "status":
+            print(f"  {r['model']} [{r['problem_type']}, {r['size']}]: status ok -> {r['current']}")
+        else:
+            print(f"  {r['model']} [{r['problem_type']}, {r['size']}]: {r['field']} "
+                  f"{r['baseline']:.3f} -> {r['current']:.3f} (+{r['change']:.0%})")
+    return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,12 @@
+# cortex/cache.py
+import os
+
+def get_cache_dir(*parts):
+    """
+    Returns (and creates) a directory inside the Cortex cache.
+    The cache root defaults to ~/.cache/cortex and can be moved with CORTEX_CACHE_DIR.
+    """
+    root = os.environ.get("CORTEX_CACHE_DIR") or os.path.join(os.path.expanduser("~"), ".cache", "cortex")
+    path = os.path.join(root, *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
@@ -0,0 +1,438 @@
+# cortex/daemon.py
+import argparse
+import json
+import os
+import socket
+import sys
+import time
+from cortex.cache import get_cache_dir
+
+# Subcommands that always run in the calling process.
+LOCAL_COMMANDS = ("daemon",)
+# Modules reported as warm by `cortex daemon status` once imported.
+WARM_MODULES = ["sklearn", "pandas", "xgboost", "lightgbm", "gymnasium", "torch", "sentence_transformers"]
+# Seconds `cortex daemon start` waits for the daemon to finish warming up.
+START_TIMEOUT = 120.0
+# Settings read once at import time; a client that sets them differently runs in-process.
+IMPORT_TIME_SETTINGS = ("CORTEX_TEXT_STREAMING_MB", "CORTEX_DATASET_CACHE_MB")
+# Seconds between checks for finished commands.
+REAP_INTERVAL = 0.5
+
+def socket_path():
+    """The daemon's Unix socket; set CORTEX_DAEMON_SOCKET to run more than one daemon."""
+    return os.environ.get("CORTEX_DAEMON_SOCKET") or os.path.join(get_cache_dir("daemon"), "cortex.sock")
+
+def _encode(message):
+    return json.dumps(message).encode("utf-8") + b"\n"
+
+def _exit_code(code):
+    if code is None:
+        return 0
+    return code if isinstance(code, int) else 1
+
+def _connect(path=None, timeout=None):
+    """A socket connected to the daemon, or None if no daemon is listening."""
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(path or socket_path())
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+def request(message, path=None, timeout=10.0):
+    """Sends one control message (status, stop) and returns the reply, or None if no daemon is running."""
+    sock = _connect(path, timeout)
+    if sock is None:
+        return None
+    with sock, sock.makefile("rb") as reader:
+        sock.sendall(_encode(message))
+        line = reader.readline()
+    return json.loads(line) if line else None
+
+def run_in_daemon(argv):
+    """
+    Runs a CLI invocation (e.g. ["run", "jobs.json"] or ["data.csv"]) in a worker
+    forked from the daemon. The worker is handed this process's stdin, stdout and
+    stderr, working directory and environment, so prompts, progress output and
+    stdin arguments ("-") behave as they do in-process, and Ctrl+C is forwarded.
+    Returns the exit code, or None when the caller should run the command itself:
+    no daemon is running, CORTEX_NO_DAEMON is set, or the daemon was started with
+    different import-time settings.
+    """
+    if os.environ.get("CORTEX_NO_DAEMON") or not hasattr(socket, "send_fds"):
+        return None
+    if argv and argv[0] in LOCAL_COMMANDS:
+        return None
+    sock = _connect()
+    if sock is None:
+        return None
+    message = {"command": "cli", "argv": list(argv), "cwd": os.getcwd(), "env": dict(os.environ)}
+    with sock, sock.makefile("rb") as reader:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        try:
+            socket.send_fds(sock, [_encode(message)], [0, 1, 2])
+        except OSError:
+            return None  # E.g. stdin is closed; run the command here instead.
+        while True:
+            try:
+                line = reader.readline()
+            except KeyboardInterrupt:
+                sock.sendall(_encode({"interrupt": True}))
+                continue
+            if not line:
+                print("The Cortex daemon closed the connection before the command finished.", file=sys.stderr)
+                return 1
+            reply = json.loads(line)
+            if reply.get("fallback"):
+                return None
+            if "exit" in reply:
+                return reply["exit"]
+
+class CortexDaemon:
+    """
+    Keeps Cortex warm between CLI calls: the pipeline, scikit-learn and every
+    installed model backend are imported once, and the sentence-embedding model can
+    be loaded up front. Each command runs in a worker forked from this process, so
+    it starts with everything imported but has its own stdio, working directory and
+    environment, and concurrent commands cannot see each other's state.
+    """
+    def __init__(self, path, preload_sentence_model=False):
+        self.path = path
+        self.preload_sentence_model = preload_sentence_model
+        self.started = time.time()
+        self.requests = 0
+        self.workers = {}  # pid -> connection of the client waiting on it
+        self.listener = None
+        self.selector = None
+        self.stopping = False
+        self.stop_waiters = []  # `cortex daemon stop` clients, answered by closing on exit
+
+    def warm_up(self):
+        import cortex.main, cortex.pipeline.main, cortex.pipeline.compare, cortex.pipeline.jobs  # noqa: F401
+        import cortex.predict.main, cortex.serve.main, cortex.data_handlers.detector, cortex.nlp.parser  # noqa: F401
+        from cortex.algorithms.registry import MODEL_REGISTRY, load_model_class
+
+        for entries in MODEL_REGISTRY.values():
+            for entry in entries:
+                try:
+                    load_model_class(entry)
+                except ImportError:
+                    pass  # Optional backend not installed.
+        if self.preload_sentence_model:
+            from cortex.nlp.embedding_store import load_sentence_model
+            try:
+                load_sentence_model()
+            except ImportError:
+                print("sentence-transformers is not installed; not preloading the sentence model.")
+
+    def status(self):
+        from cortex.profiling import peak_rss_mb
+
+        return {
+            "pid": os.getpid(),
+            "socket": self.path,
+            "uptime_sec": time.time() - self.started,
+            "requests": self.requests,
+            "running": len(self.workers),
+            "warm_modules": [name for name in WARM_MODULES if name in sys.modules],
+            "peak_rss_mb": peak_rss_mb(),
+        }
+
+    def listen(self):
+        import selectors
+
+        if os.path.exists(self.path):
+            os.remove(self.path)  # Left behind by a daemon that did not shut down cleanly.
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        # Create the socket owner-only; tightening it after bind would leave a window
+        # in which other local users could connect and run commands as this user.
+        previous = os.umask(0o177)
+        try:
+            listener.bind(self.path)
+        finally:
+            os.umask(previous)
+        listener.listen()
+        self.listener = listener
+        self.selector = selectors.DefaultSelector()
+        self.selector.register(listener, selectors.EVENT_READ)
+
+    def serve_forever(self):
+        while not self.stopping or self.workers:
+            for key, _ in self.selector.select(timeout=REAP_INTERVAL):
+                if key.fileobj is self.listener:
+                    conn, _ = self.listener.accept()
+                    self.accept(conn)
+                else:
+                    self.client_message(key.fileobj, key.data)
+            self.reap()
+
+    def accept(self, conn):
+        conn.settimeout(10.0)
+        data, fds = b"", []
+        try:
+            while not data.endswith(b"\n"):
+                chunk, received, _, _ = socket.recv_fds(conn, 1 << 16, 3)
+                fds += received
+                if not chunk:
+                    break
+                data += chunk
+            message = json.loads(data)
+        except (OSError, ValueError):
+            message = {}
+        try:
+            command = message.get("command")
+            if command == "status":
+                conn.sendall(_encode(self.status()))
+            elif command == "stop":
+                conn.sendall(_encode({"stopping": True, "pid": os.getpid()}))
+                self.stop()
+                self.stop_waiters.append(conn)
+                return
+            elif command == "cli":
+                env = message.get("env") or {}
+                if self.stopping or len(fds) != 3 or any(env.get(name) != os.environ.get(name) for name in IMPORT_TIME_SETTINGS):
+                    conn.sendall(_encode({"fallback": True}))
+                else:
+                    self.fork_worker(conn, fds, message)
+                    return  # The connection stays open until the worker exits.
+            else:
+                conn.sendall(_encode({"error": f"Unknown command '{command}'."}))
+        except OSError:
+            pass
+        finally:
+            for fd in fds:
+                os.close(fd)
+        conn.close()
+
+    def fork_worker(self, conn, fds, message):
+        import selectors
+
+        pid = os.fork()
+        if pid == 0:
+            self.run_worker(conn, fds, message)  # Never returns.
+        self.requests += 1
+        self.workers[pid] = conn
+        self.selector.register(conn, selectors.EVENT_READ, pid)
+
+    def run_worker(self, conn, fds, message):
+        """Runs one CLI invocation in a freshly forked worker, then exits the worker."""
+        import signal
+        import traceback
+
+        code = 1
+        try:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.default_int_handler)
+            self.selector.close()
+            self.listener.close()
+            for other in self.workers.values():
+                other.close()
+            for target, fd in enumerate(fds):
+                os.dup2(fd, target)
+                os.close(fd)
+            fds.clear()
+            sys.stdin = sys.__stdin__ = open(0, "r", closefd=False)
+            sys.stdout = sys.__stdout__ = open(1, "w", buffering=1, closefd=False)
+            sys.stderr = sys.__stderr__ = open(2, "w", buffering=1, closefd=False)
+            os.environ.clear()
+            os.environ.update(message.get("env") or {})
+            os.chdir(message.get("cwd") or os.getcwd())
+            sys.argv = ["cortex", *message["argv"]]
+
+            from cortex.main import run_command
+            try:
+                code = _exit_code(run_command(message["argv"]))
+            except SystemExit as e:
+                code = _exit_code(e.code)
+            except KeyboardInterrupt:
+                code = 130
+        except BaseException:
+            traceback.print_exc()
+        finally:
+            try:
+                sys.stdout.flush()
+                sys.stderr.flush()
+                conn.sendall(_encode({"exit": code}))
+            finally:
+                os._exit(0)
+
+    def client_message(self, conn, pid):
+        """The client waiting on a worker either pressed Ctrl+C or went away."""
+        import signal
+
+        try:
+            data = conn.recv(1 << 16)
+        except OSError:
+            data = b""
+        if not data:
+            self.selector.unregister(conn)
+            self._signal(pid, signal.SIGTERM)
+        elif b"interrupt" in data:
+            self._signal(pid, signal.SIGINT)
+
+    def reap(self):
+        for pid in list(self.workers):
+            try:
+                finished, status = os.waitpid(pid, os.WNOHANG)
+            except ChildProcessError:
+                finished, status = pid, 0
+            if not finished:
+                continue
+            conn = self.workers.pop(pid)
+            if status != 0:
+                # The worker died before it could report back (e.g. it was killed).
+                code = 128 + os.WTERMSIG(status) if os.WIFSIGNALED(status) else 1
+                try:
+                    conn.sendall(_encode({"exit": code}))
+                except OSError:
+                    pass
+            try:
+                self.selector.unregister(conn)
+            except KeyError:
+                pass  # The client had already gone away.
+            conn.close()
+
+    def _signal(self, pid, signum):
+        try:
+            os.kill(pid, signum)
+        except ProcessLookupError:
+            pass
+
+    def stop(self):
+        """Stops accepting commands and terminates the ones still running."""
+        import signal
+
+        if not self.stopping and self.listener is not None:
+            self.selector.unregister(self.listener)
+            self.listener.close()
+            if os.path.exists(self.path):
+                os.remove(self.path)
+        self.stopping = True
+        for pid in self.workers:
+            self._signal(pid, signal.SIGTERM)
+
+def serve(path=None, preload_sentence_model=False):
+    """Runs the daemon in the foreground until it is stopped (or gets SIGTERM / Ctrl+C)."""
+    import signal
+
+    path = path or socket_path()
+    probe = _connect(path, timeout=1.0)
+    if probe is not None:
+        probe.close()
+        print(f"A Cortex daemon is already listening on {path}.")
+        return 1
+
+    daemon = CortexDaemon(path, preload_sentence_model)
+    start = time.perf_counter()
+    daemon.warm_up()
+    print(f"Warmed up in {time.perf_counter() - start:.1f}s.", flush=True)
+
+    daemon.listen()
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    print(f"Cortex daemon (pid {os.getpid()}) listening on {path}.", flush=True)
+    try:
+        daemon.serve_forever()
+    except (KeyboardInterrupt, SystemExit):
+        pass
+    finally:
+        daemon.stop()
+        for pid in daemon.workers:
+            try:
+                os.waitpid(pid, 0)
+            except ChildProcessError:
+                pass
+        print("Cortex daemon stopped.", flush=True)
+    return 0
+
+def start(preload_sentence_model=False, timeout=START_TIMEOUT):
+    """Starts the daemon in the background and waits until it accepts connections."""
+    import subprocess
+
+    path = socket_path()
+    if request({"command": "status"}, path) is not None:
+        print(f"The Cortex daemon is already running on {path}.")
+        return 0
+    log_path = os.path.join(get_cache_dir("daemon"), "daemon.log")
+    command = [sys.executable, "-m", "cortex.daemon", "serve", "--socket", path]
+    if preload_sentence_model:
+        command.append("--preload-sentence-model")
+    # Import this same copy of Cortex in the daemon, wherever it was started from.
+    package_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [package_root, os.environ.get("PYTHONPATH")]))}
+    with open(log_path, "ab") as log:
+        process = subprocess.Popen(command, stdin=subprocess.DEVNULL, stdout=log, stderr=log, env=env, start_new_session=True)
+
+    print("Starting the Cortex daemon (warming up imports)...")
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            print(f"The daemon exited during start-up; see {log_path}.")
+            return 1
+        sock = _connect(path, timeout=1.0)
+        if sock is not None:
+            sock.close()
+            print(f"Cortex daemon started (pid {process.pid}) on {path}.")
+            return 0
+        time.sleep(0.1)
+    print(f"The daemon did not start within {timeout:.0f}s; see {log_path}.")
+    return 1
+
+def stop(timeout=30.0):
+    sock = _connect(timeout=timeout)
+    if sock is None:
+        print("The Cortex daemon is not running.")
+        return 0
+    # Commands still running are terminated; the daemon closes this connection as it exits.
+    with sock, sock.makefile("rb") as reader:
+        sock.sendall(_encode({"command": "stop"}))
+        reply = json.loads(reader.readline())
+        try:
+            reader.read()
+        except OSError:
+            print("The daemon is still shutting down.")
+    print(f"Stopped the Cortex daemon (pid {reply['pid']}).")
+    return 0
+
+def status():
+    reply = request({"command": "status"})
+    if reply is None:
+        print("The Cortex daemon is not running; commands run in-process.")
+        return 1
+    print(f"Cortex daemon (pid {reply['pid']}) on {reply['socket']}")
+    print(f"  Up {reply['uptime_sec']:.0f}s, {reply['requests']} command(s) served, {reply['running']} running")
+    print(f"  Warm modules: {', '.join(reply['warm_modules']) or 'none'}")
+    if reply["peak_rss_mb"] is not None:
+        print(f"  Peak memory since start: {reply['peak_rss_mb']:,.0f} MB")
+    return 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="cortex daemon",
+        description="Background process that keeps Cortex warm. While it runs, every other "
+                    "`cortex` command executes in a worker forked from it; otherwise commands run in-process.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    for name, help_text in (("start", "Start the daemon in the background."), ("serve", "Run the daemon in the foreground.")):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument("--preload-sentence-model", action="store_true", help="Load the sentence-embedding model at start-up.")
+        if name == "serve":
+            command.add_argument("--socket", default=None, help="Socket path (default: CORTEX_DAEMON_SOCKET or the Cortex cache).")
+    commands.add_parser("stop", help="Stop the daemon.")
+    commands.add_parser("status", help="Show whether the daemon is running and what it has loaded.")
+    args = parser.parse_args(argv)
+
+    if args.command == "start":
+        return start(args.preload_sentence_model)
+    if args.command == "serve":
+        return serve(args.socket, args.preload_sentence_model)
+    if args.command == "stop":
+        return stop()
+    return status()
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,11 +5,46 @@ class BaseDataHandler:
     def __init__(self, file_path):
         self.file_path = file_path
         self.data = None
+        self.use_cache = True  # Reuse parsed frames from the dataset cache when possible
+        self.sample = None  # Whatever the handler peeked at while sniffing the dataset
+        self._detected = False
+        self._dataset_type = None
 
     def load_data(self):
         """Abstract method to load the data. Must be implemented by subclasses."""
         raise NotImplementedError
 
     def detect_type(self):
+        """
+        Returns the detected data type. Detection runs once per handler; later
+        calls return the memoized result without touching the file again.
+        """
+        if not self._detected:
+            self._dataset_type = self._detect_type()
+            self._detected = True
+        return self._dataset_type
+
+    def _detect_type(self):
         """Abstract method to detect the data type. Must be implemented by subclasses."""
-        raise NotImplementedError
\ No newline at end of file
+        raise NotImplementedError
+
+    def load_cached(self, loader, variant=""):
+        """
+        Returns loader()'s DataFrame, served from the dataset cache when this file was
+        already parsed with the same handler and options.
+        """
+        if not self.use_cache or not os.path.isfile(self.file_path):
+            return loader()
+
+        from .cache import DatasetCache
+
+        cache = DatasetCache()
+        key = cache.key_for(self.file_path, variant=f"{type(self).__name__}|{variant}")
+        data = cache.get(key)
+        if data is not None:
+            print(f"Loaded '{os.path.basename(self.file_path)}' from the dataset cache.")
+            return data
+
+        data = loader()
+        cache.put(key, data)
+        return data
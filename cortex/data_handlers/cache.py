@@ -0,0 +1,96 @@
+# cortex/data_handlers/cache.py
+import hashlib
+import os
+from cortex.cache import get_cache_dir
+
+# Bytes hashed from the head, middle and tail of a file when fingerprinting its content.
+FINGERPRINT_SAMPLE_BYTES = 1 << 20
+# Total size the dataset cache may grow to before least-recently-used entries are evicted.
+DEFAULT_MAX_BYTES = int(os.environ.get("CORTEX_DATASET_CACHE_MB", "2048")) * 1024 ** 2
+
+def file_fingerprint(file_path):
+    """
+    Fingerprints a file by path, size, mtime and a content hash. Large files are
+    hashed on three 1 MB samples so fingerprinting stays cheap on multi-GB exports.
+    """
+    stat = os.stat(file_path)
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{os.path.abspath(file_path)}|{stat.st_size}|{stat.st_mtime_ns}".encode("utf-8"))
+    with open(file_path, "rb") as f:
+        if stat.st_size <= 3 * FINGERPRINT_SAMPLE_BYTES:
+            digest.update(f.read())
+        else:
+            for offset in (0, stat.st_size // 2, stat.st_size - FINGERPRINT_SAMPLE_BYTES):
+                f.seek(offset)
+                digest.update(f.read(FINGERPRINT_SAMPLE_BYTES))
+    return digest.hexdigest()
+
+class DatasetCache:
+    """
+    On-disk cache of parsed DataFrames stored as Feather (Arrow IPC) files, which
+    load with memory mapping and keep dtypes such as float32 and category intact.
+    """
+    def __init__(self, cache_dir=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir or get_cache_dir("datasets")
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.max_bytes = max_bytes
+
+    def key_for(self, file_path, variant=""):
+        """Cache key for a source file plus anything that changes how it is parsed."""
+        return hashlib.blake2b(f"{file_fingerprint(file_path)}|{variant}".encode("utf-8"), digest_size=16).hexdigest()
+
+    def _entry_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.feather")
+
+    def get(self, key):
+        """Returns the cached DataFrame for key, or None on a miss."""
+        path = self._entry_path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            from pyarrow import feather
+            data = feather.read_table(path, memory_map=True).to_pandas()
+        except Exception:
+            return None
+        os.utime(path)  # Mark as recently used for LRU eviction.
+        return data
+
+    def put(self, key, data):
+        """Stores data under key. Frames Feather cannot represent are silently not cached."""
+        path = self._entry_path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            from pyarrow import feather
+            feather.write_feather(data.reset_index(drop=True), tmp_path)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return False
+        self.evict()
+        return True
+
+    def _entries(self):
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".feather"):
+                stat = os.stat(os.path.join(self.cache_dir, name))
+                entries.append((stat.st_mtime, stat.st_size, name))
+        return sorted(entries)
+
+    def evict(self):
+        """Deletes least-recently-used entries until the cache fits in max_bytes."""
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in entries:
+            if total <= self.max_bytes:
+                break
+            os.remove(os.path.join(self.cache_dir, name))
+            total -= size
+
+    def clear(self):
+        """Removes every cached dataset and returns the number of entries removed."""
+        entries = self._entries()
+        for _, _, name in entries:
+            os.remove(os.path.join(self.cache_dir, name))
+        return len(entries)
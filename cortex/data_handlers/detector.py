@@ -1,21 +1,66 @@
 # cortex/data_handlers/detector.py
 # ... existing imports
+import os
 from .tabular import TabularDataHandler
 from .image import ImageDataHandler
 from .text import TextDataHandler
 from .environment import EnvironmentDataHandler
 
+# Text corpora are CSVs too, so they are recognized before the handlers are tried
+# (see looks_like_text_corpus); TextDataHandler is not in the list for that reason.
 HANDLERS = [
     TabularDataHandler,
     ImageDataHandler,
-    TextDataHandler,
     EnvironmentDataHandler,
 ]
 
+# Rows sampled to decide whether a CSV is a text corpus.
+TEXT_SAMPLE_ROWS = 20
+# Mean words per row above which a string column counts as free text.
+TEXT_MIN_WORDS = 3
+
+def looks_like_text_corpus(sample):
+    """
+    Whether a CSV sample is a labelled text corpus: two columns (text and label),
+    one of which holds free text rather than short categorical values.
+    """
+    import pandas as pd
+
+    if len(sample.columns) != 2:
+        return False
+    for column in sample.columns:
+        values = sample[column].dropna()
+        if len(values) and (values.dtype == object or isinstance(values.dtype, pd.StringDtype)):
+            if values.astype(str).str.split().str.len().mean() >= TEXT_MIN_WORDS:
+                return True
+    return False
+
+def _detect_text_corpus(file_path):
+    import pandas as pd
+
+    if not (file_path.endswith('.csv') and os.path.isfile(file_path)):
+        return None
+    try:
+        sample = pd.read_csv(file_path, nrows=TEXT_SAMPLE_ROWS)
+    except Exception:
+        return None
+    if not looks_like_text_corpus(sample):
+        return None
+    handler = TextDataHandler(file_path)
+    handler.sample = sample
+    handler.detect_type()
+    return handler
+
 def detect_dataset_type(file_path):
     """
     Detects the type of dataset and returns the appropriate handler.
+    A CSV that looks like a text corpus gets a TextDataHandler; otherwise handlers
+    are tried in order and the first match wins. The returned handler has memoized
+    its type and sample, so calling detect_type() on it again is free.
     """
+    handler = _detect_text_corpus(file_path)
+    if handler is not None:
+        return handler
     for handler_class in HANDLERS:
         try:
             handler = handler_class(file_path)
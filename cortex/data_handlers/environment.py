@@ -1,6 +1,46 @@
-import gymnasium as gym
+import threading
 from .base import BaseDataHandler
 
+class EnvPool:
+    """
+    Keeps constructed environments for one environment ID so they can be reused
+    instead of calling gym.make again. `acquire` hands out an idle environment
+    (making one if none is free) and `release` returns it.
+    """
+    def __init__(self, env_id, **make_kwargs):
+        self.env_id = env_id
+        self.make_kwargs = make_kwargs
+        self._idle = []
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        import gymnasium as gym
+        return gym.make(self.env_id, **self.make_kwargs)
+
+    def release(self, env):
+        with self._lock:
+            self._idle.append(env)
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for env in idle:
+            env.close()
+
+# One pool per environment ID for the life of the process.
+_ENV_POOLS = {}
+_ENV_POOLS_LOCK = threading.Lock()
+
+def get_env_pool(env_id):
+    with _ENV_POOLS_LOCK:
+        pool = _ENV_POOLS.get(env_id)
+        if pool is None:
+            pool = _ENV_POOLS[env_id] = EnvPool(env_id)
+        return pool
+
 class EnvironmentDataHandler(BaseDataHandler):
     def __init__(self, env_id):
         # In this handler, the file_path is the environment ID
@@ -9,23 +49,33 @@ class EnvironmentDataHandler(BaseDataHandler):
         self.data = None  # The environment object
 
     def load_data(self):
-        """Instantiates the specified gymnasium environment."""
+        """Takes an environment for the ID from the process-wide pool, creating it if needed."""
+        import gymnasium as gym
+
         try:
-            self.data = gym.make(self.env_id)
+            self.data = get_env_pool(self.env_id).acquire()
         except gym.error.UnregisteredEnvError:
             raise ValueError(f"Environment '{self.env_id}' not found.")
         except Exception as e:
             raise ValueError(f"Could not load environment '{self.env_id}': {e}")
         print(f"Successfully loaded environment: {self.env_id}")
 
+    def close(self):
+        """Returns the environment to the pool for the next handler of the same ID."""
+        if self.data is not None:
+            get_env_pool(self.env_id).release(self.data)
+            self.data = None
+
     def detect_type(self, is_valid_id=False):
+        if is_valid_id:
+            return "environment"
+        return super().detect_type()
+
+    def _detect_type(self):
         """
         Detects if the input path is a valid gymnasium environment ID.
         A simple check is enough for now.
         """
-        if is_valid_id:
-            return "environment"
-
         # Simple heuristic for a valid env ID string
         if isinstance(self.env_id, str) and len(self.env_id) > 2 and '-' in self.env_id and not '.' in self.env_id:
             try:
@@ -2,26 +2,50 @@ import os
 import imghdr  # A standard library to determine the type of an image
 
 from .base import BaseDataHandler
+from .image_index import ImageIndex, scan_image_directory
 
 class ImageDataHandler(BaseDataHandler):
+    def __init__(self, file_path, max_workers=None):
+        super().__init__(file_path)
+        self.max_workers = max_workers  # Threads used to scan large directories
+
+    def _iter_files(self):
+        """Yields files below the directory, descending into class subfolders lazily."""
+        stack = [self.file_path]
+        while stack:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file():
+                        yield entry.path
+
     def load_data(self):
-        # For image datasets, we don't load all images into memory.
-        # We just verify the path and file count.
+        # For image datasets, we don't load all images into memory. We build an
+        # array-backed index of the image files (reusing the on-disk manifest).
         if os.path.isdir(self.file_path):
-            files = [os.path.join(self.file_path, f) for f in os.listdir(self.file_path)]
-            self.data = [f for f in files if imghdr.what(f) is not None]
+            self.data = scan_image_directory(self.file_path, max_workers=self.max_workers).images()
         else:
             # Handle a single image file if needed
-            self.data = [self.file_path] if imghdr.what(self.file_path) is not None else []
+            root, name = os.path.split(os.path.abspath(self.file_path))
+            records = []
+            fmt = imghdr.what(self.file_path)
+            if fmt is not None:
+                stat = os.stat(self.file_path)
+                records.append((name, stat.st_size, stat.st_mtime_ns, fmt, ""))
+            self.data = ImageIndex.from_records(root, records)
+        print(f"Indexed {len(self.data)} image(s) in {len(self.data.classes)} class folder(s).")
 
-    def detect_type(self):
+    def _detect_type(self):
         # Check if the path is a directory and contains image files.
+        # Stop at the first image found; load_data() does the full scan.
         if os.path.isdir(self.file_path):
-            files = [os.path.join(self.file_path, f) for f in os.listdir(self.file_path)]
-            image_files = [f for f in files if imghdr.what(f) is not None]
-            if len(image_files) > 0:
-                return "image"
+            for f in self._iter_files():
+                if imghdr.what(f) is not None:
+                    self.sample = f
+                    return "image"
         # Also check for a single image file
         elif imghdr.what(self.file_path) is not None:
+            self.sample = self.file_path
             return "image"
-        return None
\ No newline at end of file
+        return None
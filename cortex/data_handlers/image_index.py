@@ -0,0 +1,213 @@
+# cortex/data_handlers/image_index.py
+import hashlib
+import imghdr
+import os
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from cortex.cache import get_cache_dir
+
+# Files handed to one scanner thread at a time.
+SCAN_BATCH_SIZE = 512
+MANIFEST_VERSION = 1
+
+class ImageIndex:
+    """
+    Compact, array-backed listing of the files in an image directory.
+
+    Relative paths are stored as one UTF-8 blob plus an offsets array, and size,
+    mtime, format and class label are numpy columns, so millions of entries cost
+    a few bytes each instead of one Python string object per file.
+    """
+    def __init__(self, root, blob, offsets, sizes, mtimes, formats, format_names, labels, classes):
+        self.root = root
+        self._blob = blob
+        self._offsets = offsets
+        self.sizes = sizes
+        self.mtimes = mtimes  # Nanoseconds since the epoch
+        self.formats = formats  # Codes into format_names; 0 means "not an image"
+        self.format_names = list(format_names)
+        self.labels = labels  # Codes into classes; -1 for files outside a class folder
+        self.classes = list(classes)
+
+    @classmethod
+    def from_records(cls, root, records):
+        """Builds an index from (relative_path, size, mtime_ns, format, label) tuples."""
+        records = sorted(records)
+        format_names = [""] + sorted({r[3] for r in records if r[3]})
+        classes = sorted({r[4] for r in records if r[4]})
+        format_codes = {name: code for code, name in enumerate(format_names)}
+        class_codes = {name: code for code, name in enumerate(classes)}
+
+        encoded = [r[0].encode("utf-8", "surrogateescape") for r in records]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(e) for e in encoded], out=offsets[1:])
+        return cls(
+            root,
+            np.frombuffer(b"".join(encoded), dtype=np.uint8),
+            offsets,
+            np.array([r[1] for r in records], dtype=np.int64),
+            np.array([r[2] for r in records], dtype=np.int64),
+            np.array([format_codes[r[3] or ""] for r in records], dtype=np.int16),
+            format_names,
+            np.array([class_codes.get(r[4], -1) for r in records], dtype=np.int32),
+            classes,
+        )
+
+    def __len__(self):
+        return len(self.sizes)
+
+    def relative_path(self, i):
+        start, end = self._offsets[i], self._offsets[i + 1]
+        return self._blob[start:end].tobytes().decode("utf-8", "surrogateescape")
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("image index out of range")
+        return os.path.join(self.root, self.relative_path(i))
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def records(self):
+        """Yields (relative_path, size, mtime_ns, format, label) tuples."""
+        for i in range(len(self)):
+            label = self.labels[i]
+            yield (
+                self.relative_path(i),
+                int(self.sizes[i]),
+                int(self.mtimes[i]),
+                self.format_names[self.formats[i]],
+                self.classes[label] if label >= 0 else "",
+            )
+
+    def select(self, mask):
+        """Returns a new index holding the entries where mask is true, without leaving numpy."""
+        idx = np.flatnonzero(mask)
+        starts = self._offsets[idx]
+        lengths = self._offsets[idx + 1] - starts
+        offsets = np.zeros(len(idx) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        positions = np.arange(offsets[-1], dtype=np.int64) + np.repeat(starts - offsets[:-1], lengths)
+        return ImageIndex(
+            self.root, self._blob[positions], offsets, self.sizes[idx], self.mtimes[idx],
+            self.formats[idx], self.format_names, self.labels[idx], self.classes,
+        )
+
+    def images(self):
+        """Returns a new index holding only the entries recognised as images."""
+        return self.select(self.formats > 0)
+
+    def save(self, path):
+        tmp_path = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez(
+            tmp_path,
+            version=np.array(MANIFEST_VERSION),
+            root=np.array(self.root),
+            blob=self._blob,
+            offsets=self._offsets,
+            sizes=self.sizes,
+            mtimes=self.mtimes,
+            formats=self.formats,
+            format_names=np.array(self.format_names),
+            labels=self.labels,
+            classes=np.array(self.classes),
+        )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as f:
+            if int(f["version"]) != MANIFEST_VERSION:
+                raise ValueError(f"Unsupported image manifest version in {path}")
+            return cls(
+                str(f["root"]), f["blob"], f["offsets"], f["sizes"], f["mtimes"], f["formats"],
+                [str(name) for name in f["format_names"]], f["labels"], [str(name) for name in f["classes"]],
+            )
+
+def manifest_path_for(root):
+    """Location of the cached manifest for an image directory."""
+    key = hashlib.blake2b(os.path.abspath(root).encode("utf-8"), digest_size=16).hexdigest()
+    return os.path.join(get_cache_dir("images"), f"{key}.npz")
+
+def _walk(directory):
+    """Lists every file below directory as (path, size, mtime_ns) using scandir's cached stat."""
+    files = []
+    stack = [directory]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file():
+                    stat = entry.stat()
+                    files.append((entry.path, stat.st_size, stat.st_mtime_ns))
+    return files
+
+def _sniff_batch(paths):
+    formats = []
+    for path in paths:
+        try:
+            formats.append(imghdr.what(path) or "")
+        except OSError:
+            formats.append("")
+    return formats
+
+def scan_image_directory(root, manifest_path=None, max_workers=None):
+    """
+    Scans an image directory (including class subfolders) with a thread pool and
+    returns an ImageIndex of every file in it.
+
+    Files are labelled with the name of the top-level subfolder they live in. The
+    result is written to a manifest, and entries whose size and mtime are unchanged
+    since the last scan reuse their recorded format instead of being re-opened.
+    """
+    root = os.path.abspath(root)
+    manifest_path = manifest_path or manifest_path_for(root)
+    max_workers = max_workers or min(32, (os.cpu_count() or 1) * 4)
+
+    previous = {}
+    if os.path.exists(manifest_path):
+        try:
+            previous = {r[0]: r for r in ImageIndex.load(manifest_path).records()}
+        except (OSError, ValueError, KeyError):
+            previous = {}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        # Walk each top-level entry in parallel; files directly in root are listed here.
+        files, subdirs = [], []
+        with os.scandir(root) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                elif entry.is_file():
+                    stat = entry.stat()
+                    files.append((entry.path, stat.st_size, stat.st_mtime_ns))
+        for listing in pool.map(_walk, subdirs):
+            files.extend(listing)
+
+        records, stale = [], []
+        for path, size, mtime in files:
+            relative = os.path.relpath(path, root)
+            label = relative.split(os.sep, 1)[0] if os.sep in relative else ""
+            known = previous.get(relative)
+            if known and known[1] == size and known[2] == mtime:
+                records.append(known[:4] + (label,))
+            else:
+                stale.append((relative, size, mtime, label))
+
+        batches = [stale[i:i + SCAN_BATCH_SIZE] for i in range(0, len(stale), SCAN_BATCH_SIZE)]
+        sniffed = pool.map(_sniff_batch, [[os.path.join(root, r[0]) for r in batch] for batch in batches])
+        for batch, formats in zip(batches, sniffed):
+            for (relative, size, mtime, label), fmt in zip(batch, formats):
+                records.append((relative, size, mtime, fmt, label))
+
+    index = ImageIndex.from_records(root, records)
+    if stale or len(records) != len(previous):
+        try:
+            index.save(manifest_path)
+        except OSError as e:
+            print(f"Warning: could not write image manifest: {e}")
+    return index
@@ -1,17 +1,122 @@
-import pandas as pd
 from .base import BaseDataHandler
 
+# Rows per chunk when streaming a CSV file.
+CSV_CHUNKSIZE = 100_000
+# String columns whose distinct values make up at most this fraction of the rows become categoricals.
+CATEGORY_MAX_RATIO = 0.5
+
+def low_cardinality_columns(df, max_ratio=CATEGORY_MAX_RATIO):
+    """Returns the string columns of df that are worth storing as categoricals."""
+    import pandas as pd
+
+    columns = []
+    for column in df.columns:
+        series = df[column]
+        if series.dtype == object or isinstance(series.dtype, pd.StringDtype):
+            if series.nunique(dropna=True) <= max_ratio * max(len(series), 1):
+                columns.append(column)
+    return columns
+
+def optimize_dtypes(df, category_columns=None):
+    """
+    Downcasts df in place to compact dtypes: floats to float32, integers to the
+    smallest integer type that fits and low-cardinality strings to categoricals.
+    """
+    import pandas as pd
+
+    if category_columns is None:
+        category_columns = low_cardinality_columns(df)
+
+    for column in df.columns:
+        series = df[column]
+        if pd.api.types.is_bool_dtype(series):
+            continue
+        if pd.api.types.is_integer_dtype(series):
+            df[column] = pd.to_numeric(series, downcast="integer")
+        elif pd.api.types.is_float_dtype(series):
+            df[column] = series.astype("float32")
+        elif column in category_columns and not isinstance(series.dtype, pd.CategoricalDtype):
+            df[column] = series.astype("category")
+    return df
+
+def _concat_chunks(chunks):
+    """Concatenates optimized chunks, unifying categories so categorical columns stay categorical."""
+    import pandas as pd
+
+    if len(chunks) == 1:
+        return chunks[0]
+
+    for column in chunks[0].columns:
+        if isinstance(chunks[0][column].dtype, pd.CategoricalDtype):
+            categories = chunks[0][column].cat.categories
+            for chunk in chunks[1:]:
+                if not isinstance(chunk[column].dtype, pd.CategoricalDtype):
+                    chunk[column] = chunk[column].astype("category")
+                categories = categories.union(chunk[column].cat.categories)
+            for chunk in chunks:
+                chunk[column] = chunk[column].astype(pd.CategoricalDtype(categories))
+
+    data = pd.concat(chunks, ignore_index=True)
+    # Mixed int/float chunks can promote to float64; bring those back down.
+    for column in data.select_dtypes("float64").columns:
+        data[column] = data[column].astype("float32")
+    return data
+
 class TabularDataHandler(BaseDataHandler):
+    def __init__(self, file_path, columns=None, optimize=True, chunksize=CSV_CHUNKSIZE):
+        super().__init__(file_path)
+        self.columns = columns  # Optional column projection
+        self.optimize = optimize
+        self.chunksize = chunksize
+        self.memory_footprint = None  # Bytes used by the loaded frame
+
+    def _read_csv(self):
+        import pandas as pd
+
+        if not self.optimize:
+            return pd.read_csv(self.file_path, usecols=self.columns)
+
+        # Stream the file so only one chunk is ever held at default (wide) dtypes.
+        # The categorical plan is fixed by the first chunk so every chunk agrees on it.
+        chunks = []
+        category_columns = None
+        for chunk in pd.read_csv(self.file_path, usecols=self.columns, chunksize=self.chunksize):
+            if category_columns is None:
+                category_columns = low_cardinality_columns(chunk)
+            chunks.append(optimize_dtypes(chunk, category_columns))
+        if not chunks:
+            return pd.read_csv(self.file_path, usecols=self.columns)
+        return _concat_chunks(chunks)
+
     def load_data(self):
+        import pandas as pd
+
         # We'll use pandas to load the data, as it's the standard for tabular data.
         if self.file_path.endswith('.csv'):
-            self.data = pd.read_csv(self.file_path)
+            reader = self._read_csv
         elif self.file_path.endswith(('.xls', '.xlsx')):
-            self.data = pd.read_excel(self.file_path)
-        # Add more formats like Parquet, JSON, etc., later.
+            reader = lambda: pd.read_excel(self.file_path, usecols=self.columns)
+        elif self.file_path.endswith('.parquet'):
+            reader = lambda: pd.read_parquet(self.file_path, columns=self.columns)
+        elif self.file_path.endswith('.feather'):
+            reader = lambda: pd.read_feather(self.file_path, columns=self.columns)
+        else:
+            return
+
+        def read():
+            data = reader()
+            if self.optimize and not self.file_path.endswith('.csv'):
+                optimize_dtypes(data)
+            return data
+
+        self.data = self.load_cached(read, variant=repr((self.columns, self.optimize)))
+        if self.data is not None:
+            self.memory_footprint = int(self.data.memory_usage(deep=True).sum())
+            print(f"Loaded {len(self.data)} rows x {len(self.data.columns)} columns "
+                  f"({self.memory_footprint / 1024 ** 2:.1f} MB in memory).")
 
-    def detect_type(self):
+    def _detect_type(self):
         # Basic check based on file extension. We can add more sophisticated checks later.
-        if self.file_path.endswith(('.csv', '.xls', '.xlsx', '.parquet')):
+        if self.file_path.endswith(('.csv', '.xls', '.xlsx', '.parquet', '.feather')):
             return "tabular"
-        return None
\ No newline at end of file
+        return None
@@ -1,46 +1,130 @@
 # cortex/data_handlers/text.py
-import pandas as pd
-from sklearn.feature_extraction.text import CountVectorizer
+import hashlib
+import os
 from .base import BaseDataHandler
 
+# Rows read per chunk when streaming a text corpus.
+TEXT_CHUNKSIZE = 50_000
+# Files larger than this are trained out-of-core by models that support it.
+STREAMING_THRESHOLD_BYTES = int(os.environ.get("CORTEX_TEXT_STREAMING_MB", "512")) * 1024 ** 2
+
 class TextDataHandler(BaseDataHandler):
-    def __init__(self, file_path):
+    def __init__(self, file_path, chunksize=TEXT_CHUNKSIZE):
         super().__init__(file_path)
-        self.vectorizer = CountVectorizer()
-        self.X_transformed = None
+        self.chunksize = chunksize
         self.target_column = None
+        self.text_column = None
 
     def load_data(self):
+        import pandas as pd
+
         # We assume the data is a CSV with two columns: text and a label.
-        self.data = pd.read_csv(self.file_path)
+        self.data = self.load_cached(lambda: pd.read_csv(self.file_path))
         self.data.columns = [col.lower() for col in self.data.columns] # Standardize column names
 
+    @property
+    def columns(self):
+        """Lower-cased column names, from the loaded data or else the detection sample."""
+        import pandas as pd
+
+        frame = self.data if self.data is not None else (self.sample if self.sample is not None else pd.read_csv(self.file_path, nrows=5))
+        return [str(col).lower() for col in frame.columns]
+
+    def _resolve_columns(self, target_column):
+        columns = self.columns
+        if target_column not in columns:
+            raise ValueError(f"Target column '{target_column}' not found.")
+        self.target_column = target_column
+        self.text_column = [col for col in columns if col != target_column][0]
+        return self.text_column
+
+    @property
+    def should_stream(self):
+        """Whether the corpus is big enough that it should be trained on chunk by chunk."""
+        return os.path.isfile(self.file_path) and os.path.getsize(self.file_path) > STREAMING_THRESHOLD_BYTES
+
     def get_features_and_target(self, target_column):
         """
-        Processes text data and returns features (X) and target (y).
+        Returns the raw text (X) and target (y). Vectorizing is left to the model,
+        so the text is tokenized once, by the model's own pipeline.
         """
-        if not self.data or target_column not in self.data.columns:
+        if self.data is None or target_column not in self.data.columns:
             raise ValueError("Data not loaded or target column not found.")
-            
-        text_column = [col for col in self.data.columns if col != target_column][0]
-        
-        X = self.data[text_column]
-        y = self.data[target_column]
-        
-        self.X_transformed = self.vectorizer.fit_transform(X)
-        self.target_column = target_column
-        
-        return self.X_transformed, y
+        text_column = self._resolve_columns(target_column)
+        return self.data[text_column], self.data[target_column]
+
+    def iter_chunks(self, target_column, chunksize=None):
+        """
+        Streams the CSV as (texts, labels) chunks without loading the whole corpus.
+        Rows with a missing label or text are dropped, as label_values drops missing labels.
+        """
+        import pandas as pd
+
+        text_column = self._resolve_columns(target_column)
+        reader = pd.read_csv(self.file_path, chunksize=chunksize or self.chunksize)
+        for chunk in reader:
+            chunk.columns = [str(col).lower() for col in chunk.columns]
+            chunk = chunk.dropna(subset=[text_column, target_column])
+            if len(chunk):
+                yield chunk[text_column], chunk[target_column]
+
+    def label_values(self, target_column):
+        """The distinct labels of the target column, read without the text."""
+        import numpy as np
+        import pandas as pd
+
+        position = self.columns.index(target_column)
+        labels = set()
+        for chunk in pd.read_csv(self.file_path, usecols=[position], chunksize=self.chunksize * 10):
+            labels.update(chunk.iloc[:, 0].dropna().unique().tolist())
+        return np.array(sorted(labels))
+
+    def hashed_features(self, target_column, vectorizer):
+        """
+        Hashes the corpus chunk by chunk with a stateless HashingVectorizer and returns
+        (sparse X, y). The matrix is cached on disk (scipy .npz) per file and vectorizer
+        settings, so tuning folds and later runs reuse it instead of re-tokenizing.
+        """
+        import joblib
+        import numpy as np
+        import scipy.sparse as sp
+        from cortex.cache import get_cache_dir
+        from .cache import file_fingerprint
+
+        settings = repr(sorted(vectorizer.get_params().items()))
+        key = hashlib.blake2b(
+            f"{file_fingerprint(self.file_path)}|{target_column}|{settings}".encode("utf-8"), digest_size=16
+        ).hexdigest()
+        cache_dir = get_cache_dir("text")
+        matrix_path = os.path.join(cache_dir, f"{key}.npz")
+        labels_path = os.path.join(cache_dir, f"{key}.labels.joblib")
+        if self.use_cache and os.path.exists(matrix_path) and os.path.exists(labels_path):
+            print(f"Loaded hashed features for '{os.path.basename(self.file_path)}' from the cache.")
+            return sp.load_npz(matrix_path), joblib.load(labels_path)
 
-    def detect_type(self):
+        blocks, labels = [], []
+        for texts, chunk_labels in self.iter_chunks(target_column):
+            blocks.append(vectorizer.transform(texts))
+            labels.append(chunk_labels.to_numpy())
+        X = sp.vstack(blocks, format="csr")
+        y = np.concatenate(labels)
+        if self.use_cache:
+            os.makedirs(cache_dir, exist_ok=True)
+            sp.save_npz(matrix_path, X, compressed=False)
+            joblib.dump(y, labels_path)
+        return X, y
+
+    def _detect_type(self):
+        # Whether a CSV is a text corpus is decided by the detector (looks_like_text_corpus);
+        # a TextDataHandler built for a CSV takes it as one.
         if self.file_path.endswith('.csv'):
+            import pandas as pd
+
             try:
-                # Peek at the first few rows to check for string-heavy data
-                df = pd.read_csv(self.file_path, nrows=5)
-                # Check if at least one column is an object (string) type and has high cardinality
-                is_text_data = any(df[col].dtype == 'object' and len(df[col].unique()) > 2 for col in df.columns)
-                if is_text_data:
-                    return "text"
+                # Keep a sample on the handler so nothing needs to re-read the head later.
+                if self.sample is None:
+                    self.sample = pd.read_csv(self.file_path, nrows=5)
             except Exception:
                 return None
-        return None
\ No newline at end of file
+            return "text"
+        return None
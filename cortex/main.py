@@ -1,17 +1,45 @@
 import sys
 import argparse
 import os
-import pyfiglet
 from colorama import init, Fore, Style
-from cortex.data_handlers.detector import detect_dataset_type
-from cortex.nlp.parser import parse_user_intent
-from cortex.algorithms.registry import get_suggested_models
-from cortex.pipeline.main import run_training_pipeline
+from cortex.algorithms.registry import get_suggested_models, load_model_class
+from cortex.profiling import profile_stage
+
+def run_training_pipeline(*args, **kwargs):
+    # The pipeline pulls in scikit-learn, so it is only imported once a model has been chosen.
+    from cortex.pipeline.main import run_training_pipeline as _run_training_pipeline
+    return _run_training_pipeline(*args, **kwargs)
+
+# Subcommands are dispatched before the interactive argument parser runs,
+# so `cortex data.csv` keeps working as before.
+SUBCOMMANDS = {
+    "predict": "cortex.predict.main",
+    "serve": "cortex.serve.main",
+    "loadtest": "cortex.serve.loadtest",
+    "run": "cortex.pipeline.jobs",
+    "bench": "cortex.benchmarks.suite",
+    "daemon": "cortex.daemon",
+}
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    # Hand the command to a warm daemon if one is running; otherwise run it here.
+    from cortex.daemon import run_in_daemon
+    exit_code = run_in_daemon(argv)
+    if exit_code is not None:
+        return exit_code
+    return run_command(argv)
+
+def run_command(argv):
+    """Runs one CLI invocation in this process (daemon workers call this directly)."""
+    if argv and argv[0] in SUBCOMMANDS:
+        import importlib
+        return importlib.import_module(SUBCOMMANDS[argv[0]]).main(argv[1:])
 
-def main():
     init(autoreset=True)
 
     parser = argparse.ArgumentParser(
+        prog="cortex",
         description="Cortex CLI: A powerful tool for machine learning from the command line."
     )
     
@@ -28,8 +56,84 @@ def main():
         help="Run the pipeline non-interactively using default suggestions."
     )
     
-    args = parser.parse_args()
-    
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Parse the dataset from scratch instead of using the local dataset cache."
+    )
+
+    parser.add_argument(
+        "--clear-cache",
+        action="store_true",
+        help="Delete all cached datasets and exit."
+    )
+
+    parser.add_argument(
+        "--tuning",
+        choices=["grid", "random", "halving", "bayes"],
+        default="grid",
+        help="Hyperparameter search strategy (default: grid)."
+    )
+
+    parser.add_argument(
+        "--tuning-max-fits",
+        type=int,
+        default=None,
+        help="Maximum number of model fits to spend on hyperparameter tuning."
+    )
+
+    parser.add_argument(
+        "--tuning-max-seconds",
+        type=float,
+        default=None,
+        help="Wall-clock budget for hyperparameter tuning, in seconds."
+    )
+
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="cortex-profile",
+        default=None,
+        metavar="DIR",
+        help="Record wall time, CPU time and peak memory per stage and write profile.json "
+             "and a Chrome trace to DIR (default: ./cortex-profile)."
+    )
+
+    parser.add_argument(
+        "--profile-cprofile",
+        action="store_true",
+        help="With --profile, also cProfile the slowest stage (adds overhead to timings)."
+    )
+
+    args = parser.parse_args(argv)
+    tuning = {"strategy": args.tuning, "max_fits": args.tuning_max_fits, "max_seconds": args.tuning_max_seconds}
+
+    if args.clear_cache:
+        from cortex.data_handlers.cache import DatasetCache
+        removed = DatasetCache().clear()
+        print(f"Removed {removed} cached dataset(s).")
+        return
+
+    profiler = None
+    if args.profile:
+        from cortex.profiling import start_profiling
+        profiler = start_profiling(cprofile=args.profile_cprofile)
+    try:
+        run_session(args, tuning)
+    finally:
+        if profiler is not None:
+            from cortex.profiling import stop_profiling
+            stop_profiling()
+            profiler.print_report()
+            paths = profiler.write(args.profile)
+            print(f"Profile written to {paths['json']} (Chrome trace: {paths['trace']}).")
+
+def run_session(args, tuning):
+    """The interactive loop: pick a dataset, describe the task, train and evaluate models."""
+    import pyfiglet
+    from cortex.data_handlers.detector import detect_dataset_type
+    from cortex.nlp.parser import parse_user_intent
+
     print(Fore.BLUE + Style.BRIGHT + "-" * 70)
     banner = pyfiglet.figlet_format("Cortex", font="standard")
     print(Fore.CYAN + Style.BRIGHT + banner)
@@ -56,9 +160,11 @@ def main():
         print("  DATASET HANDLING")
         print("="*50 + Style.RESET_ALL)
         
-        handler = detect_dataset_type(dataset_path)
+        with profile_stage("detect"):
+            handler = detect_dataset_type(dataset_path)
         
         if handler:
+            handler.use_cache = not args.no_cache
             print(f"{Fore.GREEN}Dataset type detected: {handler.detect_type()}{Style.RESET_ALL}")
             
             user_input = input(f"\n{Fore.CYAN}What do you want to do with this dataset? (e.g., 'I want to predict house prices'): {Style.RESET_ALL}").strip()
@@ -66,7 +172,8 @@ def main():
                 print(f"\n{Fore.RED}Goodbye! 👋{Style.RESET_ALL}")
                 break
             
-            parsed_intent = parse_user_intent(user_input)
+            with profile_stage("parse_intent"):
+                parsed_intent = parse_user_intent(user_input)
             intent = parsed_intent["intent"]
             problem_type = parsed_intent["problem_type"]
             
@@ -85,10 +192,20 @@ def main():
 
             if suggested_models:
                 if args.auto_run:
-                    selected_model_class = suggested_models[0]['class']
-                    print(f"Based on the problem type, I suggest using {selected_model_class.__name__}.")
-                    print("\nAuto-run enabled. Running pipeline non-interactively...")
-                    run_training_pipeline(handler, selected_model_class, problem_type, user_input, auto_run=True)
+                    # Take the first suggestion whose backend is installed.
+                    selected_model_class = None
+                    for entry in suggested_models:
+                        try:
+                            selected_model_class = load_model_class(entry)
+                            break
+                        except ImportError as e:
+                            print(f"{Fore.YELLOW}{e} Skipping {entry['name']}.{Style.RESET_ALL}")
+                    if selected_model_class is None:
+                        print(f"{Fore.RED}None of the suggested models can be loaded.{Style.RESET_ALL}")
+                    else:
+                        print(f"Based on the problem type, I suggest using {selected_model_class.__name__}.")
+                        print("\nAuto-run enabled. Running pipeline non-interactively...")
+                        run_training_pipeline(handler, selected_model_class, problem_type, user_input, auto_run=True, tuning=tuning)
                 else:
                     print(f"{Fore.CYAN}Based on the problem type, I suggest the following models:{Style.RESET_ALL}")
                     for i, model in enumerate(suggested_models):
@@ -98,12 +215,15 @@ def main():
                         try:
                             choice = input(f"\n{Fore.YELLOW}Please select a model by number (1-{len(suggested_models)}) or type 'all' to run all: {Style.RESET_ALL}").strip()
                             if choice.lower() == 'all':
-                                print("\nRunning all suggested models...")
-                                all_results = []
-                                for model in suggested_models:
-                                    print(f"\n--- Running {model['name']} ---")
-                                    results = run_training_pipeline(handler, model['class'], problem_type, user_input, auto_run=True)
-                                    all_results.append((model['name'], results))
+                                from cortex.pipeline.compare import run_model_comparison
+
+                                print("\nRunning all suggested models in parallel...")
+
+                                def report(name, results, seconds):
+                                    status = "done" if results else "failed"
+                                    print(f"{Fore.GREEN}--- {name} {status} in {seconds:.1f}s ---{Style.RESET_ALL}")
+
+                                all_results = run_model_comparison(handler, suggested_models, problem_type, user_input, tuning=tuning, on_result=report)
                                 
                                 # Print a summary table
                                 print("\n" + "="*50)
@@ -111,19 +231,21 @@ def main():
                                 print("="*50)
                                 for name, results in all_results:
                                     print(f"\nModel: {name}")
-                                    for metric, value in results.items():
+                                    for metric, value in (results or {}).items():
                                         print(f"  {metric}: {value:.4f}")
                                 print("="*50)
                                 break
                             
                             selection = int(choice)
                             if 1 <= selection <= len(suggested_models):
-                                selected_model_class = suggested_models[selection - 1]['class']
+                                selected_model_class = load_model_class(suggested_models[selection - 1])
                                 print(f"\nRunning pipeline with {selected_model_class.__name__}...")
-                                run_training_pipeline(handler, selected_model_class, problem_type, user_input, auto_run=False)
+                                run_training_pipeline(handler, selected_model_class, problem_type, user_input, auto_run=False, tuning=tuning)
                                 break
                             else:
                                 print(f"{Fore.RED}Invalid selection. Please enter a number between 1 and {len(suggested_models)}.{Style.RESET_ALL}")
+                        except ImportError as e:
+                            print(f"{Fore.RED}{e} Please choose another model.{Style.RESET_ALL}")
                         except ValueError:
                             print(f"{Fore.RED}Invalid input. Please enter a number.{Style.RESET_ALL}")
             else:
@@ -139,4 +261,4 @@ def main():
         args.dataset = None
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
@@ -1,14 +1,20 @@
 # cortex/nlp/dynamic_parser.py
-from sentence_transformers import SentenceTransformer
-from scipy.spatial.distance import cosine
+import hashlib
+import json
+import os
 import warnings
+from collections import OrderedDict
+import numpy as np
+from cortex.cache import get_cache_dir
+from cortex.nlp.embedding_store import load_sentence_model
 
 class DynamicNLPParser:
-    def __init__(self):
+    def __init__(self, model_name='all-MiniLM-L6-v2', cache_size=1024):
         # Load a lightweight, pre-trained MiniLM model. This runs locally.
         warnings.filterwarnings("ignore")
+        self.model_name = model_name
         try:
-            self.model = SentenceTransformer('all-MiniLM-L6-v2')
+            self.model = load_sentence_model(model_name)
         except Exception as e:
             print(f"Error loading SentenceTransformer model: {e}")
             print("Please ensure you have internet access on first run.")
@@ -22,31 +28,77 @@ class DynamicNLPParser:
             "clustering": ["group data", "find clusters in data", "unsupervised learning", "segment customers"],
             "image_recognition": ["identify objects in images", "classify images", "detect faces", "recognize pictures"]
         }
-        self.problem_type_vectors = self._create_embeddings(self.problem_types)
+        # Recently seen phrases -> normalized embedding, evicted least-recently-used first.
+        self.cache_size = cache_size
+        self._phrase_cache = OrderedDict()
+        self.problem_type_labels, self.problem_type_matrix = self._create_embeddings(self.problem_types)
 
     def _create_embeddings(self, problem_dict):
-        embeddings_dict = {}
-        if self.model:
-            for key, sentences in problem_dict.items():
-                embeddings_dict[key] = self.model.encode(sentences)
-        return embeddings_dict
+        """
+        Builds one row-normalized matrix holding every prototype sentence, plus the
+        problem type of each row. The matrix is cached on disk, keyed by the model
+        name and the exact sentence set, so later runs skip the encoding pass.
+        """
+        labels = np.array([key for key, sentences in problem_dict.items() for _ in sentences])
+        if not self.model:
+            return labels, None
 
-    def parse_user_input(self, user_text):
+        sentences = [sentence for values in problem_dict.values() for sentence in values]
+        key = hashlib.sha256(json.dumps([self.model_name, problem_dict], sort_keys=True).encode("utf-8")).hexdigest()
+        cache_path = os.path.join(get_cache_dir("embeddings"), f"prototypes-{key}.npy")
+
+        if os.path.exists(cache_path):
+            try:
+                return labels, np.load(cache_path)
+            except (OSError, ValueError):
+                pass  # Corrupt cache entry; re-encode below.
+
+        matrix = self._normalize(self.model.encode(sentences))
+        np.save(cache_path, matrix)
+        return labels, matrix
+
+    @staticmethod
+    def _normalize(vectors):
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    def _encode(self, texts):
+        """Returns normalized embeddings for texts, encoding only phrases not in the LRU cache."""
+        missing = list(dict.fromkeys(text for text in texts if text not in self._phrase_cache))
+        if missing:
+            for text, vector in zip(missing, self._normalize(self.model.encode(missing))):
+                self._phrase_cache[text] = vector
+        vectors = []
+        for text in texts:
+            self._phrase_cache.move_to_end(text)
+            vectors.append(self._phrase_cache[text])
+        while len(self._phrase_cache) > self.cache_size:
+            self._phrase_cache.popitem(last=False)
+        return np.vstack(vectors)
+
+    def parse_user_inputs(self, user_texts):
+        """
+        Batch version of parse_user_input: encodes all texts in a single `encode` call
+        and scores them against every prototype with one matrix product.
+        """
         if not self.model:
-            return None
+            return [None] * len(user_texts)
+        if not user_texts:
+            return []
 
-        user_vector = self.model.encode([user_text])[0]
-        best_match = {"problem_type": None, "score": 0}
+        scores = self._encode(list(user_texts)) @ self.problem_type_matrix.T
+        best_rows = scores.argmax(axis=1)
+        best_scores = scores[np.arange(len(best_rows)), best_rows]
 
-        for problem_type, vectors in self.problem_type_vectors.items():
-            for vector in vectors:
-                similarity = 1 - cosine(user_vector, vector)
-                if similarity > best_match["score"]:
-                    best_match["score"] = similarity
-                    best_match["problem_type"] = problem_type
-        
         # Use a confidence threshold
-        if best_match["score"] > 0.4:
-            return best_match["problem_type"]
-        
-        return None
\ No newline at end of file
+        return [
+            str(self.problem_type_labels[row]) if score > 0.4 else None
+            for row, score in zip(best_rows, best_scores)
+        ]
+
+    def parse_user_input(self, user_text):
+        if not self.model:
+            return None
+        return self.parse_user_inputs([user_text])[0]
@@ -0,0 +1,150 @@
+# cortex/nlp/embedding_store.py
+import contextlib
+import functools
+import hashlib
+import json
+import os
+import re
+import numpy as np
+from cortex.cache import get_cache_dir
+
+DEFAULT_SENTENCE_MODEL = 'all-MiniLM-L6-v2'
+
+@functools.lru_cache(maxsize=None)
+def load_sentence_model(model_name=DEFAULT_SENTENCE_MODEL):
+    """
+    Loads a SentenceTransformer once per process; the parser and the embedding text
+    model share the instance. The model files come from the local Hugging Face cache
+    after the first download.
+    """
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(model_name)
+
+def text_keys(texts):
+    """16-byte content hashes of texts, as a numpy 'S16' array."""
+    return np.array([hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest() for text in texts], dtype="S16")
+
+class EmbeddingStore:
+    """
+    Append-only on-disk store of text embeddings, keyed by a hash of the text.
+
+    Vectors live in one raw float32 file that is memory-mapped for reads, and keys
+    in a parallel file of 16-byte hashes; a sorted copy of the keys is searched to
+    find rows. `embed` only encodes texts the store has never seen, so repeated
+    training and tuning runs over the same corpus skip the encoder entirely.
+    Appends and index loads hold an exclusive lock on the store's lock file, so
+    several processes can share one store.
+    """
+    def __init__(self, name, directory=None):
+        slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", name)
+        self.directory = directory or get_cache_dir("embeddings", slug)
+        os.makedirs(self.directory, exist_ok=True)
+        self._vectors_path = os.path.join(self.directory, "vectors.f32")
+        self._keys_path = os.path.join(self.directory, "keys.bin")
+        self._meta_path = os.path.join(self.directory, "meta.json")
+        self._lock_path = os.path.join(self.directory, "lock")
+        self.dim = None
+        self._load_index()
+
+    @contextlib.contextmanager
+    def _locked(self):
+        try:
+            import fcntl
+        except ImportError:  # No advisory locks on Windows; the store is then single-process.
+            yield
+            return
+        with open(self._lock_path, "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _sync(self):
+        """
+        Reads the dimension another process may have written and returns the number of
+        complete rows, dropping any unmatched tail an interrupted append left behind.
+        Call with the lock held.
+        """
+        if self.dim is None and os.path.exists(self._meta_path):
+            with open(self._meta_path) as f:
+                self.dim = json.load(f)["dim"]
+        if self.dim is None:
+            return 0
+        rows = os.path.getsize(self._vectors_path) // (4 * self.dim) if os.path.exists(self._vectors_path) else 0
+        n_keys = os.path.getsize(self._keys_path) // 16 if os.path.exists(self._keys_path) else 0
+        if rows != n_keys:
+            rows = min(rows, n_keys)
+            with open(self._vectors_path, "ab") as f:
+                f.truncate(rows * 4 * self.dim)
+            with open(self._keys_path, "ab") as f:
+                f.truncate(rows * 16)
+        return rows
+
+    def _load_index(self):
+        with self._locked():
+            rows = self._sync()
+            keys = np.fromfile(self._keys_path, dtype="S16", count=rows) if rows else np.empty(0, dtype="S16")
+        self._size = len(keys)
+        order = np.argsort(keys, kind="stable")
+        self._sorted_keys = keys[order]
+        self._sorted_rows = order
+        self._vectors = None
+
+    def __len__(self):
+        return self._size
+
+    def _lookup(self, keys):
+        """Row of each key in the store, or -1."""
+        if not self._size:
+            return np.full(len(keys), -1)
+        positions = np.searchsorted(self._sorted_keys, keys).clip(max=self._size - 1)
+        found = self._sorted_keys[positions] == keys
+        return np.where(found, self._sorted_rows[positions], -1)
+
+    def _matrix(self):
+        if self._vectors is None:
+            self._vectors = np.memmap(self._vectors_path, dtype=np.float32, mode="r", shape=(self._size, self.dim))
+        return self._vectors
+
+    def _append(self, keys, vectors):
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        with self._locked():
+            rows = self._sync()
+            if rows > self._size:
+                # Skip texts another process stored since our index was loaded.
+                added = np.fromfile(self._keys_path, dtype="S16", count=rows - self._size, offset=self._size * 16)
+                new = ~np.isin(keys, added)
+                keys, vectors = keys[new], vectors[new]
+            if self.dim is None:
+                self.dim = vectors.shape[1]
+                with open(self._meta_path, "w") as f:
+                    json.dump({"dim": self.dim}, f)
+            with open(self._vectors_path, "ab") as f:
+                f.write(vectors.tobytes())
+            with open(self._keys_path, "ab") as f:
+                f.write(keys.tobytes())
+
+    def embed(self, texts, encode, batch_size=512):
+        """
+        Returns an (n, dim) float32 array of embeddings for texts. Texts missing from
+        the store are de-duplicated, encoded by `encode(list_of_texts)` in batches of
+        batch_size, and appended before returning.
+        """
+        texts = [str(text) for text in texts]
+        keys = text_keys(texts)
+        rows = self._lookup(keys)
+
+        missing = rows < 0
+        if missing.any():
+            new_keys, first = np.unique(keys[missing], return_index=True)
+            new_texts = [texts[i] for i in np.flatnonzero(missing)[first]]
+            for start in range(0, len(new_texts), batch_size):
+                batch = slice(start, start + batch_size)
+                self._append(new_keys[batch], encode(new_texts[batch]))
+            self._load_index()
+            rows = self._lookup(keys)
+
+        if not len(texts):
+            return np.empty((0, self.dim or 0), dtype=np.float32)
+        return np.asarray(self._matrix()[rows])
@@ -1,15 +1,8 @@
 # cortex/nlp/parser.py
 # ... existing imports
-import spacy
+from functools import lru_cache
 from fuzzywuzzy import fuzz
 
-try:
-    nlp = spacy.load("en_core_web_sm")
-except OSError:
-    print("SpaCy model 'en_core_web_sm' not found. Please run:")
-    print("python -m spacy download en_core_web_sm")
-    exit()
-
 # Define keywords with synonyms for better matching
 INTENT_KEYWORDS = {
     "predict": ["predict", "prediction", "forecast", "classify", "recognition"],
@@ -26,42 +19,65 @@ PROBLEM_TYPE_KEYWORDS = {
     "clustering": ["group", "cluster", "unsupervised"]
 }
 
+class KeywordMatcher:
+    """
+    Precompiled fuzzy matcher over a {name: [keywords]} dictionary.
+
+    Returns the same answer as scanning every keyword with fuzz.ratio in dictionary
+    order, but only compares a word against keywords whose length could possibly
+    clear the threshold (ratio <= 2 * min(len) / (len_a + len_b)), and remembers
+    the result for every word it has seen.
+    """
+    def __init__(self, keyword_dict, threshold=75, cache_size=65536):
+        self.threshold = threshold
+        self._keywords = [(name, keyword) for name, keywords in keyword_dict.items() for keyword in keywords]
+        self._candidates_by_length = {}
+        self.match = lru_cache(maxsize=cache_size)(self._match)
+
+    def _candidates(self, length):
+        candidates = self._candidates_by_length.get(length)
+        if candidates is None:
+            candidates = [
+                (name, keyword) for name, keyword in self._keywords
+                if 200 * min(length, len(keyword)) > self.threshold * (length + len(keyword))
+            ]
+            self._candidates_by_length[length] = candidates
+        return candidates
+
+    def _match(self, word):
+        for name, keyword in self._candidates(len(word)):
+            if fuzz.ratio(word, keyword) > self.threshold:
+                return name
+        return None
+
+    def first_match(self, words):
+        """Returns the name matched by the earliest word that matches anything."""
+        for word in words:
+            name = self.match(word)
+            if name:
+                return name
+        return None
+
+_problem_type_matcher = KeywordMatcher(PROBLEM_TYPE_KEYWORDS)
+_intent_matcher = KeywordMatcher(INTENT_KEYWORDS)
+
 def parse_user_intent(text):
     """
     Parses natural language text to detect user intent and problem type using fuzzy matching.
     """
-    doc = nlp(text.lower())
-    
-    intent = None
-    problem_type = None
-
-    # First, try to detect problem type
-    for user_word in text.split():
-        for problem_name, keywords in PROBLEM_TYPE_KEYWORDS.items():
-            for keyword in keywords:
-                # Key change: Lowered threshold from 85 to 75
-                if fuzz.ratio(user_word, keyword) > 75:
-                    problem_type = problem_name
-                    break
-            if problem_type:
-                break
-        if problem_type:
-                break
+    words = text.split()
+    problem_type = _problem_type_matcher.first_match(words)
+    intent = _intent_matcher.first_match(words)
 
-    # Now, try to detect intent
-    for user_word in text.split():
-        for intent_name, keywords in INTENT_KEYWORDS.items():
-            for keyword in keywords:
-                if fuzz.ratio(user_word, keyword) > 75:
-                    intent = intent_name
-                    break
-            if intent:
-                break
-        if intent:
-            break
-    
     # Simple rule for when intent is "cluster" but problem type is not set
     if intent == "cluster" and problem_type is None:
         problem_type = "clustering"
 
-    return {"intent": intent, "problem_type": problem_type}
\ No newline at end of file
+    return {"intent": intent, "problem_type": problem_type}
+
+def parse_user_intents(texts):
+    """
+    Batch version of parse_user_intent. Words are matched once and cached across
+    the whole batch, so large logs of job descriptions are cheap to classify.
+    """
+    return [parse_user_intent(text) for text in texts]
@@ -0,0 +1,109 @@
+# cortex/pipeline/compare.py
+import contextlib
+import io
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import joblib
+from cortex.algorithms.registry import load_model_class
+
+# Dataset shared by the comparison workers, memory-mapped from one on-disk copy.
+_shared_data = None
+
+def _init_worker(data_path, threads):
+    global _shared_data
+    if data_path is not None:
+        _shared_data = joblib.load(data_path, mmap_mode="r")
+    # Keep BLAS/OpenMP pools inside this worker's share of the core budget.
+    from threadpoolctl import threadpool_limits
+    threadpool_limits(threads)
+
+def _run_candidate(handler, entry, problem_type, user_input, tuning):
+    from cortex.pipeline.main import run_training_pipeline
+
+    if _shared_data is not None:
+        # The pipeline modifies columns in place; give each candidate its own frame over the same buffers.
+        handler.data = _shared_data.copy(deep=False)
+    log = io.StringIO()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(log):
+        metrics = run_training_pipeline(handler, load_model_class(entry), problem_type, user_input, auto_run=True, tuning=tuning)
+    return metrics, time.perf_counter() - start, log.getvalue()
+
+def run_model_comparison(handler, models, problem_type, user_input, tuning=None, max_workers=None, on_result=None):
+    """
+    Trains and evaluates several registry models concurrently.
+
+    The dataset is loaded once, dumped to a temporary file and memory-mapped by
+    every worker process, so candidates share one copy of the data. Workers split
+    the machine's cores between them (both for tuning jobs and BLAS/OpenMP
+    threads), and results are reported through `on_result(name, metrics, seconds)`
+    as each model finishes.
+
+    Returns:
+        A list of (model name, metrics) tuples in the order the models were given.
+    """
+    cores = os.cpu_count() or 1
+    max_workers = max(1, min(max_workers or cores, len(models)))
+    threads = max(1, cores // max_workers)
+    tuning = {**(tuning or {}), "n_jobs": threads}
+
+    import pandas as pd
+
+    if handler.data is None:
+        handler.load_data()
+
+    results = {}
+    data = handler.data
+    if max_workers == 1:
+        try:
+            for entry in models:
+                if isinstance(data, pd.DataFrame):
+                    # The pipeline modifies columns in place; each candidate gets its own frame.
+                    handler.data = data.copy(deep=False)
+                try:
+                    metrics, seconds, _ = _run_candidate(handler, entry, problem_type, user_input, tuning)
+                except Exception as e:
+                    print(f"An unexpected error occurred: {e}")
+                    metrics, seconds = {}, 0.0
+                results[entry["name"]] = metrics
+                if on_result:
+                    on_result(entry["name"], metrics, seconds)
+        finally:
+            handler.data = data
+        return [(entry["name"], results[entry["name"]]) for entry in models]
+
+    shared_dir = None
+    data_path = None
+    if isinstance(data, pd.DataFrame):
+        shared_dir = tempfile.mkdtemp(prefix="cortex-compare-")
+        data_path = os.path.join(shared_dir, "data.joblib")
+        joblib.dump(data, data_path)
+        # Don't pickle the frame into every task; workers read the memory-mapped copy.
+        handler.data = None
+
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(data_path, threads)) as pool:
+            futures = {
+                pool.submit(_run_candidate, handler, entry, problem_type, user_input, tuning): entry["name"]
+                for entry in models
+            }
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    metrics, seconds, log = future.result()
+                except Exception as e:
+                    metrics, seconds, log = {}, 0.0, f"An unexpected error occurred: {e}"
+                if not metrics:
+                    print(log)
+                results[name] = metrics
+                if on_result:
+                    on_result(name, metrics, seconds)
+    finally:
+        handler.data = data
+        if shared_dir:
+            shutil.rmtree(shared_dir, ignore_errors=True)
+
+    return [(entry["name"], results[entry["name"]]) for entry in models]
@@ -0,0 +1,237 @@
+# cortex/pipeline/jobs.py
+import argparse
+import contextlib
+import datetime
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+RESULT_NAME = "result.json"
+LOG_NAME = "log.txt"
+MODEL_DIR_NAME = "model"
+
+def load_jobs(path):
+    """
+    Reads a job spec: either a list of jobs or {"defaults": {...}, "jobs": [...]}, where
+    defaults are merged into every job. Each job is a dict with
+
+        dataset       path to the data (or a Gymnasium environment ID)   required
+        problem_type  e.g. "classification"                              required
+        id            name of the job (default: job-0001, ...)
+        target        target column (default: the last column)
+        model         registry model name or import path (default: the first suggestion)
+        params        hyperparameters passed to the model; tuning leaves them fixed
+        tuning        run_hyperparameter_tuning options, e.g. {"strategy": "random", "max_fits": 20}
+        tune          false to skip hyperparameter tuning
+        output        directory for result.json, log.txt and the saved model
+        save          false to skip saving the model
+        use_cache     false to bypass the dataset cache
+
+    Relative dataset and output paths are taken relative to the spec file. Pass "-"
+    to read the spec from stdin.
+    """
+    if path == "-":
+        spec, base = json.load(sys.stdin), os.getcwd()
+    else:
+        with open(path) as f:
+            spec = json.load(f)
+        base = os.path.dirname(os.path.abspath(path))
+    defaults, jobs = ({}, spec) if isinstance(spec, list) else (spec.get("defaults", {}), spec.get("jobs", []))
+
+    normalized, seen = [], set()
+    for i, job in enumerate(jobs):
+        job = {"tune": True, "save": True, "use_cache": True, **defaults, **job}
+        job.setdefault("id", f"job-{i + 1:04d}")
+        missing = [key for key in ("dataset", "problem_type") if not job.get(key)]
+        if missing:
+            raise ValueError(f"Job '{job['id']}' is missing {', '.join(missing)}.")
+        if job["id"] in seen:
+            raise ValueError(f"Duplicate job id '{job['id']}'.")
+        seen.add(job["id"])
+        dataset = os.path.join(base, job["dataset"])
+        if os.path.exists(dataset):  # Environment IDs are left as they are.
+            job["dataset"] = dataset
+        job["output"] = os.path.join(base, job.get("output") or os.path.join("cortex-jobs", job["id"]))
+        normalized.append(job)
+    return normalized
+
+def make_handler(dataset, use_cache=True):
+    """The data handler for a dataset, as the interactive session would pick it."""
+    from cortex.data_handlers.detector import detect_dataset_type
+
+    handler = detect_dataset_type(dataset)
+    if handler is None:
+        raise ValueError(f"Could not detect the dataset type of '{dataset}'.")
+    handler.use_cache = use_cache
+    return handler
+
+def _json_default(value):
+    return value.item() if hasattr(value, "item") else str(value)
+
+def _write_result(result):
+    os.makedirs(result["output"], exist_ok=True)
+    with open(os.path.join(result["output"], RESULT_NAME), "w") as f:
+        json.dump(result, f, indent=2, default=_json_default)
+    return result
+
+def _base_result(job):
+    return {
+        "id": job["id"],
+        "dataset": job["dataset"],
+        "problem_type": job["problem_type"],
+        "model": job.get("model"),
+        "target": job.get("target"),
+        "params": job.get("params") or {},
+        "output": job["output"],
+    }
+
+def run_job(job, n_jobs=-1):
+    """
+    Runs one job without any prompts and writes its result.json (and the pipeline's
+    output to log.txt) into the job's output directory. Returns the result.
+    """
+    from cortex.algorithms.registry import find_model_entry, load_model_class
+    from cortex.pipeline.main import run_training_pipeline
+
+    result = _base_result(job)
+    os.makedirs(job["output"], exist_ok=True)
+    log_path = os.path.join(job["output"], LOG_NAME)
+    save_path = os.path.join(job["output"], MODEL_DIR_NAME) if job.get("save", True) else None
+    started = datetime.datetime.now(datetime.timezone.utc)
+    start = time.perf_counter()
+    metrics, error = None, None
+    with open(log_path, "w") as log, contextlib.redirect_stdout(log), contextlib.redirect_stderr(log):
+        try:
+            entry = find_model_entry(job.get("model"), job["problem_type"])
+            result["model"] = entry["name"]
+            model_class = load_model_class(entry)
+            handler = make_handler(job["dataset"], job.get("use_cache", True))
+            tuning = {**(job.get("tuning") or {}), "n_jobs": n_jobs} if job.get("tune", True) else False
+            metrics = run_training_pipeline(
+                handler, model_class, job["problem_type"], "", auto_run=True, tuning=tuning,
+                target_column=job.get("target"), model_params=job.get("params"), save_path=save_path,
+            )
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            print(error)
+    if not metrics and error is None:
+        # The pipeline reports its errors on stdout; keep the last thing it said.
+        with open(log_path) as log:
+            lines = [line.strip() for line in log if line.strip()]
+        error = lines[-1] if lines else "The pipeline returned no metrics."
+
+    result.update({
+        "status": "ok" if metrics else "failed",
+        "metrics": metrics or {},
+        "artifact": save_path if metrics and save_path and os.path.isdir(save_path) else None,
+        "error": error,
+        "log": log_path,
+        "started": started.isoformat(),
+        "seconds": time.perf_counter() - start,
+    })
+    return _write_result(result)
+
+def _init_worker(threads):
+    # Keep BLAS/OpenMP pools inside this worker's share of the core budget.
+    from threadpoolctl import threadpool_limits
+    threadpool_limits(threads)
+
+def _new_pool(workers, threads):
+    # Spawned rather than forked: `cortex run` may be started from a process that has
+    # other threads running (e.g. a daemon worker), and forking those is unsafe.
+    context = multiprocessing.get_context("spawn")
+    return ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_worker, initargs=(threads,))
+
+def run_jobs(jobs, workers=1, on_result=None):
+    """
+    Runs jobs through a bounded queue of `workers` processes: at most `workers` jobs
+    are in flight, and the rest wait in this process until a slot frees up. Cores are
+    split between workers as in run_model_comparison. A worker that dies fails only
+    the jobs it was running; the pool is restarted for the rest.
+
+    Returns the results in job order.
+    """
+    cores = os.cpu_count() or 1
+    workers = max(1, min(workers, len(jobs) or 1))
+    threads = max(1, cores // workers)
+    results = [None] * len(jobs)
+
+    def finish(i, result):
+        results[i] = result
+        if on_result:
+            on_result(result)
+
+    if workers == 1:
+        for i, job in enumerate(jobs):
+            finish(i, run_job(job, n_jobs=threads))
+        return results
+
+    pending = deque(enumerate(jobs))
+    running = {}
+    pool = _new_pool(workers, threads)
+    try:
+        while pending or running:
+            while pending and len(running) < workers:
+                i, job = pending.popleft()
+                running[pool.submit(run_job, job, threads)] = i
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            broken = False
+            for future in done:
+                i = running.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    broken = broken or isinstance(e, BrokenProcessPool)
+                    result = _write_result({
+                        **_base_result(jobs[i]), "status": "failed", "metrics": {}, "artifact": None,
+                        "error": f"{type(e).__name__}: {e}" if str(e) else type(e).__name__,
+                    })
+                finish(i, result)
+            if broken:
+                pool.shutdown(wait=False, cancel_futures=True)
+                pool = _new_pool(workers, threads)
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+    return results
+
+def _print_result(result):
+    if result["status"] == "ok":
+        scores = ", ".join(
+            f"{k}: {v:.4f}" if isinstance(v, float) else f"{k}: {v}" for k, v in result["metrics"].items()
+        )
+        print(f"[ok]     {result['id']} ({result['model']}, {result.get('seconds', 0):.1f}s) {scores}")
+    else:
+        print(f"[failed] {result['id']} ({result['model']}): {result['error']}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="cortex run",
+        description="Run a file of training jobs without prompts. Each job writes result.json to its output directory.",
+    )
+    parser.add_argument("jobs", help="Path to a JSON job spec (see cortex.pipeline.jobs.load_jobs), or - for stdin.")
+    parser.add_argument("--workers", type=int, default=1, help="Jobs run at the same time, each in its own process (default: 1).")
+    parser.add_argument("--no-cache", action="store_true", help="Parse every dataset from scratch instead of using the dataset cache.")
+    parser.add_argument("--summary", default=None, help="Also write all results to this JSON file.")
+    args = parser.parse_args(argv)
+
+    jobs = load_jobs(args.jobs)
+    if args.no_cache:
+        for job in jobs:
+            job["use_cache"] = False
+    print(f"Running {len(jobs)} job(s) with {max(1, min(args.workers, len(jobs) or 1))} worker(s)...")
+    results = run_jobs(jobs, workers=args.workers, on_result=_print_result)
+
+    failed = sum(result["status"] != "ok" for result in results)
+    print(f"{len(results) - failed} succeeded, {failed} failed.")
+    if args.summary:
+        with open(args.summary, "w") as f:
+            json.dump(results, f, indent=2, default=_json_default)
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,14 +1,22 @@
+import sys
+import numpy as np
 import pandas as pd
 from sklearn.model_selection import train_test_split
 import os
 import warnings
-import torch
 from fuzzywuzzy import fuzz
 from cortex.nlp.parser import PROBLEM_TYPE_KEYWORDS
 from cortex.tuning.main import run_hyperparameter_tuning
 from cortex.algorithms.base import BaseModel
-from cortex.algorithms.deep_learning.base import BaseDeepLearningModel
-from torch.utils.data import TensorDataset, DataLoader
+from cortex.profiling import profile_stage
+
+def is_deep_learning_model(model_class):
+    """
+    Checks whether a model class is a deep learning model without importing torch.
+    A subclass of BaseDeepLearningModel can only exist once its module has been imported.
+    """
+    dl_base = sys.modules.get("cortex.algorithms.deep_learning.base")
+    return dl_base is not None and issubclass(model_class, dl_base.BaseDeepLearningModel)
 
 def get_target_column(data, problem_type, user_input):
     """
@@ -45,33 +53,181 @@ def get_target_column(data, problem_type, user_input):
         else:
             print(f"Error: The column '{target_column_name}' was not found. Please try again.")
 
+def choose_target_column(data, problem_type, user_input, auto_run=False, target_column=None):
+    """
+    The target column to train on: the given one (validated), the last column when
+    running non-interactively, or else whatever get_target_column settles on.
+    """
+    if target_column is not None:
+        columns = [str(c) for c in data.columns]
+        if target_column not in columns and str(target_column).lower() in columns:
+            target_column = str(target_column).lower()  # Text handlers lower-case column names.
+        if target_column not in columns:
+            raise ValueError(f"Target column '{target_column}' not found. Available columns: {columns}")
+        return target_column
+    if auto_run:
+        return data.columns[-1]
+    return get_target_column(data, problem_type, user_input)
+
+def feature_schema(X, target_column=None, text_column=None):
+    """
+    Column names and dtypes of the training features, saved with the model to validate
+    inputs. Text models record the one column they read instead.
+    """
+    if text_column is not None:
+        return {"text_column": text_column, "target": target_column}
+    if not isinstance(X, pd.DataFrame):
+        return None
+    return {
+        "columns": [str(c) for c in X.columns],
+        "dtypes": {str(c): str(t) for c, t in X.dtypes.items()},
+        "target": target_column,
+    }
+
+def preprocess_features(model_instance, X_train, X_test):
+    """
+    Fits a TabularPreprocessor on the training features, attaches it to the model (so
+    it is saved with it and applied by predict) and returns both splits transformed.
+    Non-tabular features (text, sparse matrices) are returned unchanged.
+    """
+    from cortex.pipeline.preprocessing import TabularPreprocessor
+
+    if not isinstance(X_train, pd.DataFrame):
+        return X_train, X_test
+    with profile_stage("preprocess"):
+        preprocessor = TabularPreprocessor(native_categorical=model_instance.native_categorical)
+        X_train = preprocessor.fit_transform(X_train)
+        X_test = preprocessor.transform(X_test)
+    model_instance.preprocessor = preprocessor
+    print(f"Preprocessing: {preprocessor.describe()}.")
+    return X_train, X_test
+
+def applied_params(model_instance, model_params):
+    """
+    The names in model_params that the model actually took: for scikit-learn style
+    estimators, those its get_params() reports with the requested value.
+    """
+    if not model_params:
+        return set()
+    get_params = getattr(model_instance.model, "get_params", None)
+    current = get_params() if get_params else model_instance.hyperparameters
+    return {k for k, v in model_params.items() if k in current and _same_value(current[k], v)}
+
+def _same_value(a, b):
+    try:
+        return bool(a == b) or (isinstance(a, tuple) and list(a) == b)
+    except (TypeError, ValueError):
+        return a is b
+
+def save_model(model_instance, metrics, path):
+    """Saves the model, with its metrics, as an artifact at path."""
+    model_instance.metrics = metrics
+    with profile_stage("save"):
+        model_instance.save(path)
+
+def offer_to_save(model_instance, metrics):
+    """Asks whether to keep the model and saves it as a new versioned artifact."""
+    from cortex.algorithms.artifact import default_artifact_path
+
+    save_choice = input("\nWould you like to save the trained model? (yes/no): ").lower().strip()
+    if save_choice in ('yes', 'y'):
+        save_model(model_instance, metrics, default_artifact_path(model_instance))
+    else:
+        print("Model not saved.")
+
+# Every TEST_EVERY-th row is held out for evaluation when training out-of-core.
+TEST_EVERY = 5
+
+def _split_chunks(chunks, test):
+    """Keeps the test rows (every TEST_EVERY-th row of the file) or the training rows of each chunk."""
+    offset = 0
+    for texts, labels in chunks:
+        is_test = (offset + np.arange(len(texts))) % TEST_EVERY == 0
+        offset += len(texts)
+        keep = is_test if test else ~is_test
+        if keep.any():
+            yield texts[keep], labels[keep]
+
+def run_streaming_text_pipeline(handler, model_class, problem_type, user_input, auto_run=False,
+                                target_column=None, model_params=None, save_path=None):
+    """
+    Trains a text model chunk by chunk (partial_fit) so corpora larger than memory
+    can be used. One pass trains on 4 of every 5 rows; a second pass evaluates on the rest.
+    """
+    handler.detect_type()
+    sample = handler.sample.rename(columns=lambda col: str(col).lower())
+    target_column = choose_target_column(sample, problem_type, user_input, auto_run, target_column)
+    print(f"The corpus is large; training out-of-core in chunks of {handler.chunksize:,} rows.")
+
+    final_model_instance = model_class(**(model_params or {}))
+    classes = handler.label_values(target_column)
+    print(f"Training '{final_model_instance.name}' on {len(classes)} classes...")
+    with profile_stage("train", model=final_model_instance.name, streaming=True):
+        final_model_instance.train_stream(_split_chunks(handler.iter_chunks(target_column), test=False), classes)
+    print("Model training complete. Evaluating...")
+    with profile_stage("evaluate", model=final_model_instance.name, streaming=True):
+        metrics = final_model_instance.evaluate_stream(_split_chunks(handler.iter_chunks(target_column), test=True))
+    final_model_instance.feature_schema = feature_schema(None, target_column, handler.text_column)
+
+    if auto_run:
+        if save_path:
+            save_model(final_model_instance, metrics, save_path)
+        return metrics
 
-def run_training_pipeline(handler, model_class, problem_type, user_input, auto_run=False):
+    print("\n--- Evaluation Results ---")
+    for metric, value in metrics.items():
+        print(f"{metric}: {value:.4f}")
+    print("--------------------------")
+    offer_to_save(final_model_instance, metrics)
+    return metrics
+
+def run_training_pipeline(handler, model_class, problem_type, user_input, auto_run=False, tuning=None,
+                          target_column=None, model_params=None, save_path=None):
     """
     Runs the full ML pipeline and returns the evaluation metrics.
+    `tuning` holds keyword arguments for run_hyperparameter_tuning (strategy, budget);
+    tuning=False trains with the model's default parameters instead.
+
+    With auto_run nothing is prompted for: the target is `target_column` (or the last
+    column), the model is built with `model_params` (which tuning then leaves fixed),
+    and the trained model is saved to `save_path` if one is given.
     """
+    model_params = model_params or {}
     try:
-        handler.load_data()
+        if problem_type == "text_classification" and getattr(handler, "should_stream", False) and hasattr(model_class, "train_stream"):
+            return run_streaming_text_pipeline(handler, model_class, problem_type, user_input, auto_run,
+                                               target_column, model_params, save_path)
+
+        # The data may already be loaded (e.g. shared by a model comparison run).
+        if handler.data is None:
+            with profile_stage("load_data", handler=type(handler).__name__):
+                handler.load_data()
         data = handler.data
 
         # --- Handle RL Separately ---
         if problem_type == "reinforcement_learning":
             env = handler.data
             print(f"Using the '{handler.env_id}' environment for reinforcement learning.")
-            final_model_instance = model_class()
-            print(f"Training '{final_model_instance.name}'...")
-            final_model_instance.train(env)
-            print("Model training complete. Evaluating...")
-            metrics = final_model_instance.evaluate(env)
+            final_model_instance = model_class(**model_params)
+            try:
+                print(f"Training '{final_model_instance.name}'...")
+                with profile_stage("train", model=final_model_instance.name):
+                    final_model_instance.train(env)
+                print("Model training complete. Evaluating...")
+                with profile_stage("evaluate", model=final_model_instance.name):
+                    metrics = final_model_instance.evaluate(env)
+            finally:
+                # Hand the environment back to the pool so the next run skips gym.make.
+                handler.close()
             
-            # --- Return metrics for comparison ---
             if auto_run:
+                if save_path:
+                    save_model(final_model_instance, metrics, save_path)
                 return metrics
             
             print("\n--- Evaluation Results ---")
             # ... (existing print logic)
-            save_choice = input("\nWould you like to save the trained model? (yes/no): ").lower().strip()
-            # ... (existing save logic)
+            offer_to_save(final_model_instance, metrics)
             return metrics
         
         # --- Handle Clustering ---
@@ -84,19 +240,30 @@ def run_training_pipeline(handler, model_class, problem_type, user_input, auto_r
             X = data.copy()
             y = None
 
-            final_model_instance = model_class()
+            final_model_instance = model_class(**model_params)
+            final_model_instance.feature_schema = feature_schema(X)
             print(f"Training '{final_model_instance.name}'...")
-            final_model_instance.train(X)
+            with profile_stage("train", model=final_model_instance.name):
+                final_model_instance.train(X)
             print("Model training complete. Evaluating...")
-            metrics = final_model_instance.evaluate(X)
+            with profile_stage("evaluate", model=final_model_instance.name):
+                metrics = final_model_instance.evaluate(X)
             
             if auto_run:
+                if save_path:
+                    save_model(final_model_instance, metrics, save_path)
                 return metrics
             
             print("\n--- Evaluation Results ---")
-            # ... (existing print logic)
-            save_choice = input("\nWould you like to save the trained model? (yes/no): ").lower().strip()
-            # ... (existing save logic)
+            for metric, value in metrics.items():
+                print(f"{metric}: {value:.4f}")
+            if getattr(final_model_instance, "n_clusters_", None) is not None:
+                print(f"Clusters: {final_model_instance.n_clusters_}")
+            for candidate in getattr(final_model_instance, "selection", None) or []:
+                print(f"  k={candidate['n_clusters']}: silhouette {candidate['silhouette']:.4f} "
+                      f"(± {candidate['stderr']:.4f}), inertia {candidate['inertia']:.1f}")
+            print("--------------------------")
+            offer_to_save(final_model_instance, metrics)
             return metrics
 
         # --- Handle All Supervised Learning ---
@@ -107,13 +274,21 @@ def run_training_pipeline(handler, model_class, problem_type, user_input, auto_r
                 return None
 
             if handler.detect_type() == "text":
-                target_column = get_target_column(data, problem_type, user_input) if not auto_run else data.columns[-1]
+                with profile_stage("target_inference"):
+                    target_column = choose_target_column(data, problem_type, user_input, auto_run, target_column)
                 if not target_column: return None
                 X, y = handler.get_features_and_target(target_column)
+                text_column = handler.text_column
+                if hasattr(model_class, "train_stream"):
+                    # Hash the corpus once (cached on disk) and share it across tuning folds.
+                    with profile_stage("featurize"):
+                        X, y = handler.hashed_features(target_column, model_class(**model_params).vectorizer)
                 print("Casting target column to categorical data type...")
-                y = y.astype('category')
+                y = pd.Series(y, name=target_column).astype('category')
             else: # Tabular data
-                target_column = get_target_column(data, problem_type, user_input) if not auto_run else data.columns[-1]
+                text_column = None
+                with profile_stage("target_inference"):
+                    target_column = choose_target_column(data, problem_type, user_input, auto_run, target_column)
                 if not target_column: return None
                 
                 if problem_type == "classification":
@@ -132,8 +307,15 @@ def run_training_pipeline(handler, model_class, problem_type, user_input, auto_r
                 X = data.drop(columns=[target_column])
                 y = data[target_column]
 
-            is_deep_learning = issubclass(model_class, BaseDeepLearningModel)
-            final_model_instance = model_class()
+            is_deep_learning = is_deep_learning_model(model_class)
+            final_model_instance = model_class(**model_params)
+            final_model_instance.feature_schema = feature_schema(X, target_column, text_column)
+            fixed = applied_params(final_model_instance, model_params)
+            if fixed and final_model_instance.param_grid:
+                # Parameters fixed by the caller are left out of the search.
+                final_model_instance.param_grid = {
+                    k: v for k, v in final_model_instance.param_grid.items() if k not in fixed
+                }
 
             if is_deep_learning:
                 print("Hyperparameter tuning for deep learning models is not yet implemented.")
@@ -141,43 +323,48 @@ def run_training_pipeline(handler, model_class, problem_type, user_input, auto_r
                 X_train_df, X_test_df, y_train_df, y_test_df = train_test_split(
                     X, y, test_size=0.2, random_state=42
                 )
-                X_train_tensor = torch.tensor(X_train_df.values, dtype=torch.float32)
-                y_train_tensor = torch.tensor(y_train_df.values, dtype=torch.float32).view(-1, 1)
-                X_test_tensor = torch.tensor(X_test_df.values, dtype=torch.float32)
-                y_test_tensor = torch.tensor(y_test_df.values, dtype=torch.float32).view(-1, 1)
-
-                train_dataloader = DataLoader(
-                    TensorDataset(X_train_tensor, y_train_tensor), batch_size=32, shuffle=True
-                )
-                test_dataloader = DataLoader(
-                    TensorDataset(X_test_tensor, y_test_tensor), batch_size=32
-                )
+                X_train_df, X_test_df = preprocess_features(final_model_instance, X_train_df, X_test_df)
+                # The model builds tensors straight from float32 arrays, without per-sample collation.
+                train_dataloader = final_model_instance.make_loader(X_train_df, y_train_df, shuffle=True)
+                test_dataloader = final_model_instance.make_loader(X_test_df, y_test_df)
 
                 print(f"Training '{final_model_instance.name}'...")
-                final_model_instance.train(train_dataloader)
+                with profile_stage("train", model=final_model_instance.name):
+                    final_model_instance.train(train_dataloader)
                 print("Model training complete. Evaluating...")
-                metrics = final_model_instance.evaluate(test_dataloader)
+                with profile_stage("evaluate", model=final_model_instance.name):
+                    metrics = final_model_instance.evaluate(test_dataloader)
 
             else:
-                if final_model_instance.param_grid:
-                    print("Hyperparameter tuning is enabled. Automatically running tuning...")
-                    best_model, _ = run_hyperparameter_tuning(final_model_instance, X, y)
+                # Split first so the test rows never take part in tuning.
+                print("\nSplitting data into training and testing sets...")
+                with profile_stage("split"):
+                    X_train, X_test, y_train, y_test = train_test_split(
+                        X, y, test_size=0.2, random_state=42
+                    )
+                X_train, X_test = preprocess_features(final_model_instance, X_train, X_test)
+
+                if final_model_instance.param_grid and tuning is not False:
+                    print("Hyperparameter tuning is enabled. Automatically running tuning on the training set...")
+                    with profile_stage("tuning", model=final_model_instance.name, strategy=(tuning or {}).get("strategy", "grid")):
+                        best_model, _ = run_hyperparameter_tuning(final_model_instance, X_train, y_train, **(tuning or {}))
+                    # The tuner already refit the best candidate on the full training set.
                     final_model_instance.model = best_model
-                    print("Using best model found during tuning for final training and evaluation.")
+                    print("Using the refit best model found during tuning for evaluation.")
                 else:
                     print("Skipping hyperparameter tuning. Training with default parameters.")
+                    print(f"Training '{final_model_instance.name}'...")
+                    with profile_stage("train", model=final_model_instance.name):
+                        final_model_instance.train(X_train, y_train)
+                    print("Model training complete.")
 
-                print("\nSplitting data into training and testing sets...")
-                X_train, X_test, y_train, y_test = train_test_split(
-                    X, y, test_size=0.2, random_state=42
-                )
-
-                print(f"Training '{final_model_instance.name}'...")
-                final_model_instance.train(X_train, y_train)
-                print("Model training complete. Evaluating...")
-                metrics = final_model_instance.evaluate(X_test, y_test)
+                print("Evaluating...")
+                with profile_stage("evaluate", model=final_model_instance.name):
+                    metrics = final_model_instance.evaluate(X_test, y_test)
             
             if auto_run:
+                if save_path:
+                    save_model(final_model_instance, metrics, save_path)
                 return metrics
 
             print("\n--- Evaluation Results ---")
@@ -186,16 +373,15 @@ def run_training_pipeline(handler, model_class, problem_type, user_input, auto_r
                     print(f"{metric}: {value:.4f}")
                 else:
                     print(f"{metric}: {value}")
+            report = getattr(final_model_instance, "tuning_report", None)
+            if report:
+                fit_times = [t for trial in report["trials"] for t in trial["fit_times"]]
+                mean_fit = sum(fit_times) / len(fit_times) if fit_times else 0.0
+                print(f"Tuning: {len(report['trials'])} candidates, {report['fits']} fits "
+                      f"(mean fit {mean_fit:.2f}s) in {report['seconds']:.1f}s")
             print("--------------------------")
 
-            save_choice = input("\nWould you like to save the trained model? (yes/no): ").lower().strip()
-            if save_choice in ('yes', 'y'):
-                save_path = os.path.join(os.path.expanduser('~'), 'Desktop', 'cortex_model_v1.pkl')
-                final_model_instance.save(save_path)
-                print(f"Model saved to {save_path}")
-            else:
-                print("Model not saved.")
-            
+            offer_to_save(final_model_instance, metrics)
             return metrics
 
     except Exception as e:
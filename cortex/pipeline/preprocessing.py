@@ -0,0 +1,80 @@
+# cortex/pipeline/preprocessing.py
+import numpy as np
+import pandas as pd
+
+class TabularPreprocessor:
+    """
+    Turns raw tabular features into what the estimators consume, fitted once on the
+    training rows and saved with the model so prediction applies the same mapping.
+
+    Column kinds are detected in fit: numeric and boolean columns become float32,
+    everything else is categorical. Categories are fixed at fit time and mapped to
+    compact integer codes in one vectorized hash lookup per column; values
+    missing or unseen in training get code -1.
+
+    With native_categorical=True (XGBoost and LightGBM, see BaseModel.native_categorical)
+    categorical columns are passed on as pandas categoricals with those fixed
+    categories, and missing numbers stay NaN for the booster to route. Otherwise
+    (scikit-learn models) the codes themselves are used as ordinal float32 features,
+    and missing numbers are filled with the training median.
+    """
+    def __init__(self, native_categorical=False):
+        self.native_categorical = native_categorical
+        self.columns_ = None
+        self.numeric_ = None
+        self.categories_ = None  # Column -> pd.Index of the categories seen in fit
+        self.medians_ = None
+
+    def fit(self, X):
+        self.columns_ = [str(c) for c in X.columns]
+        self.numeric_, self.categories_, self.medians_ = [], {}, {}
+        for column in X.columns:
+            series = X[column]
+            if pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series):
+                self.numeric_.append(str(column))
+                if not self.native_categorical:
+                    values = series.to_numpy(dtype=np.float32, na_value=np.nan)
+                    median = np.nanmedian(values) if not np.isnan(values).all() else 0.0
+                    self.medians_[str(column)] = np.float32(median)
+            elif isinstance(series.dtype, pd.CategoricalDtype):
+                self.categories_[str(column)] = series.cat.categories
+            else:
+                self.categories_[str(column)] = pd.Index(pd.unique(series.dropna())).sort_values()
+        return self
+
+    def transform(self, X):
+        if self.columns_ is None:
+            raise ValueError("The preprocessor has not been fitted.")
+        X = X.rename(columns=str)
+        missing = [column for column in self.columns_ if column not in X.columns]
+        if missing:
+            raise ValueError(f"Input is missing feature column(s): {missing}")
+
+        columns = {}
+        for column in self.columns_:
+            series = X[column]
+            if column in self.categories_:
+                categories = self.categories_[column]
+                if isinstance(series.dtype, pd.CategoricalDtype) and series.cat.categories.equals(categories):
+                    codes = series.cat.codes.to_numpy()
+                else:
+                    codes = categories.get_indexer(series)  # -1 for missing and unseen values
+                if self.native_categorical:
+                    columns[column] = pd.Categorical.from_codes(codes, dtype=pd.CategoricalDtype(categories))
+                else:
+                    columns[column] = codes.astype(np.float32)
+            else:
+                values = pd.to_numeric(series, errors="coerce").to_numpy(dtype=np.float32, na_value=np.nan)
+                if not self.native_categorical:
+                    nan = np.isnan(values)
+                    if nan.any():
+                        values = np.where(nan, self.medians_[column], values)
+                columns[column] = values
+        return pd.DataFrame(columns, index=X.index)
+
+    def fit_transform(self, X):
+        return self.fit(X).transform(X)
+
+    def describe(self):
+        mode = "native categoricals" if self.native_categorical else "ordinal codes"
+        return f"{len(self.numeric_)} numeric and {len(self.categories_)} categorical column(s), {mode}"
@@ -0,0 +1,191 @@
+import argparse
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import joblib
+import numpy as np
+import pandas as pd
+
+# Rows scored per chunk; bounds the memory used by each worker.
+DEFAULT_CHUNKSIZE = 100_000
+
+def load_model(model_path):
+    """
+    Loads a model artifact saved by BaseModel.save, memory-mapping its arrays so
+    every worker shares one copy. Plain joblib/pickle files from older versions
+    are still accepted.
+    """
+    from cortex.algorithms.artifact import is_artifact, load_artifact
+
+    if is_artifact(model_path):
+        return load_artifact(model_path, mmap_mode="r")
+    return joblib.load(model_path)
+
+def training_columns(model):
+    """The training feature columns: from the artifact's feature schema, else the estimator's feature_names_in_."""
+    schema = getattr(model, "feature_schema", None)
+    if schema and schema.get("columns"):
+        return schema["columns"]
+    estimator = getattr(model, "model", model)
+    return getattr(estimator, "feature_names_in_", None)
+
+def text_column(model):
+    """The column a text model reads its documents from, if one was recorded."""
+    schema = getattr(model, "feature_schema", None)
+    return schema.get("text_column") if schema else None
+
+def input_columns(model):
+    """The input columns the model needs: its text column, or its training feature columns."""
+    column = text_column(model)
+    if column is not None:
+        return [column]
+    feature_names = training_columns(model)
+    return list(feature_names) if feature_names is not None else None
+
+def align_features(model, X):
+    """
+    Reorders (and subsets) X to the columns the model was fit on, when they were
+    recorded. Text models get their text column as a 1-D Series of strings.
+    """
+    column = text_column(model)
+    if column is not None and isinstance(X, pd.DataFrame):
+        # Text handlers lower-case column names, so match the input's case-insensitively.
+        names = {str(name).lower(): name for name in X.columns}
+        if column.lower() not in names:
+            raise ValueError(f"Input is missing the text column '{column}'.")
+        return X[names[column.lower()]].fillna("").astype(str)
+    feature_names = training_columns(model)
+    if feature_names is not None and isinstance(X, pd.DataFrame):
+        missing = [name for name in feature_names if name not in X.columns]
+        if missing:
+            raise ValueError(f"Input is missing feature column(s): {missing}")
+        return X[list(feature_names)]
+    return X
+
+def predict_frame(model, X):
+    return np.asarray(model.predict(align_features(model, X)))
+
+def iter_chunks(input_path, chunksize=DEFAULT_CHUNKSIZE):
+    """Streams a CSV or Parquet file as DataFrames of at most `chunksize` rows."""
+    if input_path.endswith('.parquet'):
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(input_path).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    elif input_path.endswith('.csv'):
+        yield from pd.read_csv(input_path, chunksize=chunksize)
+    else:
+        raise ValueError(f"Unsupported input format for '{input_path}'. Use .csv or .parquet.")
+
+class PredictionWriter:
+    """Appends prediction chunks to a CSV or Parquet file."""
+    def __init__(self, output_path):
+        self.output_path = output_path
+        self._parquet = output_path.endswith('.parquet')
+        self._writer = None
+        self._file = None
+
+    def write(self, frame):
+        if self._parquet:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self.output_path, table.schema)
+            self._writer.write_table(table)
+        else:
+            header = self._file is None
+            if header:
+                self._file = open(self.output_path, "w", newline="")
+            frame.to_csv(self._file, header=header, index=False)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+        if self._file is not None:
+            self._file.close()
+
+# Model loaded once per worker process by _init_worker.
+_worker_model = None
+
+def _init_worker(model_path, threads):
+    global _worker_model
+    _worker_model = load_model(model_path)
+    from threadpoolctl import threadpool_limits
+    threadpool_limits(threads)
+
+def _predict_chunk(chunk):
+    return predict_frame(_worker_model, chunk)
+
+def run_batch_prediction(model_path, input_path, output_path, chunksize=DEFAULT_CHUNKSIZE, workers=None,
+                         keep_columns=None, prediction_column="prediction"):
+    """
+    Scores `input_path` with a saved model and writes the predictions to `output_path`.
+
+    The input is streamed in chunks, scored across a pool of worker processes that
+    each hold the model, and written in input order as chunks complete. At most two
+    chunks per worker are in flight, so memory stays bounded however large the input.
+
+    Returns:
+        A dict with the number of rows scored, elapsed seconds and rows per second.
+    """
+    workers = workers or os.cpu_count() or 1
+    keep_columns = list(keep_columns or [])
+    writer = PredictionWriter(output_path)
+    rows = 0
+    start = time.perf_counter()
+
+    def emit(chunk, predictions):
+        nonlocal rows
+        if len(predictions) != len(chunk):
+            raise RuntimeError(f"The model returned {len(predictions)} predictions for {len(chunk)} rows.")
+        frame = chunk[keep_columns].reset_index(drop=True) if keep_columns else pd.DataFrame()
+        frame[prediction_column] = predictions
+        writer.write(frame)
+        rows += len(chunk)
+        elapsed = time.perf_counter() - start
+        print(f"\rScored {rows:,} rows ({rows / max(elapsed, 1e-9):,.0f} rows/sec)", end="", flush=True)
+
+    try:
+        if workers == 1:
+            model = load_model(model_path)
+            for chunk in iter_chunks(input_path, chunksize):
+                emit(chunk, predict_frame(model, chunk))
+        else:
+            threads = max(1, (os.cpu_count() or 1) // workers)
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(model_path, threads)) as pool:
+                pending = deque()
+                for chunk in iter_chunks(input_path, chunksize):
+                    pending.append((chunk, pool.submit(_predict_chunk, chunk)))
+                    if len(pending) >= 2 * workers:
+                        done_chunk, future = pending.popleft()
+                        emit(done_chunk, future.result())
+                while pending:
+                    done_chunk, future = pending.popleft()
+                    emit(done_chunk, future.result())
+    finally:
+        writer.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"\nWrote predictions for {rows:,} rows to {output_path} in {elapsed:.1f}s "
+          f"({rows / max(elapsed, 1e-9):,.0f} rows/sec).")
+    return {"rows": rows, "seconds": elapsed, "rows_per_sec": rows / max(elapsed, 1e-9)}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="cortex predict",
+        description="Score a CSV or Parquet file with a model saved by Cortex."
+    )
+    parser.add_argument("model", help="Path to the saved model.")
+    parser.add_argument("input", help="CSV or Parquet file to score.")
+    parser.add_argument("-o", "--output", help="Output CSV or Parquet file (default: <input>.predictions.csv).")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE, help="Rows per chunk.")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores).")
+    parser.add_argument("--keep-columns", nargs="*", default=None, help="Input columns to copy into the output, e.g. an ID column.")
+    args = parser.parse_args(argv)
+
+    output = args.output or f"{os.path.splitext(args.input)[0]}.predictions.csv"
+    run_batch_prediction(args.model, args.input, output, chunksize=args.chunksize, workers=args.workers, keep_columns=args.keep_columns)
+
+if __name__ == "__main__":
+    main()
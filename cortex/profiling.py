@@ -0,0 +1,246 @@
+# cortex/profiling.py
+import json
+import os
+import sys
+import threading
+import time
+
+try:
+    import resource
+except ImportError:  # Not available on Windows; peak RSS is then omitted.
+    resource = None
+
+# Seconds between the resident-memory samples taken while a stage is open.
+RSS_SAMPLE_INTERVAL = 0.01
+
+def peak_rss_mb():
+    """Peak resident set size over this process's whole lifetime, in MB (None where unsupported)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux but bytes on macOS.
+    return peak / (1024 ** 2 if sys.platform == "darwin" else 1024)
+
+def current_rss_mb():
+    """Resident set size of this process right now, in MB (None where unsupported)."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return pages * os.sysconf("SC_PAGE_SIZE") / 1024 ** 2
+
+class _RSSSampler(threading.Thread):
+    """Samples current RSS and raises the running peak of every open stage."""
+    def __init__(self, interval=RSS_SAMPLE_INTERVAL):
+        super().__init__(name="cortex-rss-sampler", daemon=True)
+        self.interval = interval
+        self.open_stages = set()
+        self.lock = threading.Lock()
+        self._stopped = threading.Event()
+
+    def sample(self):
+        rss = current_rss_mb()
+        if rss is not None:
+            with self.lock:
+                for stage in self.open_stages:
+                    if rss > stage._peak:
+                        stage._peak = rss
+        return rss
+
+    def run(self):
+        while not self._stopped.wait(self.interval):
+            self.sample()
+
+    def stop(self):
+        self._stopped.set()
+
+class Profiler:
+    """
+    Collects per-stage wall time, CPU time and peak RSS for one run.
+
+    Stages are recorded through profile_stage() while the profiler is active. A
+    stage's peak RSS is the highest resident memory sampled (every
+    RSS_SAMPLE_INTERVAL seconds, and on entry and exit) while it was open; the
+    summary also reports the process-lifetime peak. With
+    cprofile=True every outermost stage also runs under cProfile, and the stats of
+    the slowest one are kept (timings then include cProfile's overhead).
+    """
+    def __init__(self, cprofile=False):
+        self.cprofile = cprofile
+        self.stages = []
+        self.slowest_profile = None  # (stage name, pstats.Stats)
+        self._origin = time.perf_counter()
+        self._local = threading.local()
+        self._sampler = None
+        if current_rss_mb() is not None:
+            self._sampler = _RSSSampler()
+            self._sampler.start()
+
+    def close(self):
+        if self._sampler is not None:
+            self._sampler.stop()
+
+    def _stack(self):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _open(self, stage):
+        if self._sampler is None:
+            return None
+        with self._sampler.lock:
+            stage._peak = 0.0
+            self._sampler.open_stages.add(stage)
+        return self._sampler.sample()
+
+    def _close(self, stage):
+        if self._sampler is None:
+            return None
+        self._sampler.sample()
+        with self._sampler.lock:
+            self._sampler.open_stages.discard(stage)
+        return stage._peak
+
+    def record(self, name, start, wall, cpu, rss_before, rss_peak, depth, attributes):
+        self.stages.append({
+            "name": name,
+            "start": start - self._origin,
+            "wall_seconds": wall,
+            "cpu_seconds": cpu,
+            "peak_rss_mb": rss_peak,
+            "peak_rss_growth_mb": (rss_peak - rss_before) if rss_peak is not None and rss_before is not None else None,
+            "depth": depth,
+            "thread": threading.get_ident(),
+            **({"attributes": attributes} if attributes else {}),
+        })
+
+    def _keep_profile(self, name, wall, profile):
+        import pstats
+
+        if self.slowest_profile is None or wall > self.slowest_profile[2]:
+            self.slowest_profile = (name, pstats.Stats(profile), wall)
+
+    def summary(self):
+        top_level = [s for s in self.stages if s["depth"] == 0]
+        slowest = max(top_level, key=lambda s: s["wall_seconds"], default=None)
+        return {
+            "total_seconds": time.perf_counter() - self._origin,
+            "process_peak_rss_mb": peak_rss_mb(),
+            "slowest_stage": slowest["name"] if slowest else None,
+            "stages": self.stages,
+        }
+
+    def chrome_trace(self):
+        """The stages as Chrome trace events (load in chrome://tracing or Perfetto)."""
+        pid = os.getpid()
+        events = [
+            {
+                "name": stage["name"], "ph": "X", "pid": pid, "tid": stage["thread"],
+                "ts": stage["start"] * 1e6, "dur": stage["wall_seconds"] * 1e6,
+                "args": {
+                    "cpu_seconds": stage["cpu_seconds"],
+                    "peak_rss_mb": stage["peak_rss_mb"],
+                    **stage.get("attributes", {}),
+                },
+            }
+            for stage in self.stages
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write(self, directory):
+        """Writes profile.json, trace.json and (with cprofile) slowest.prof; returns their paths."""
+        os.makedirs(directory, exist_ok=True)
+        paths = {"json": os.path.join(directory, "profile.json"), "trace": os.path.join(directory, "trace.json")}
+        with open(paths["json"], "w") as f:
+            json.dump(self.summary(), f, indent=2, default=str)
+        with open(paths["trace"], "w") as f:
+            json.dump(self.chrome_trace(), f)
+        if self.slowest_profile is not None:
+            paths["cprofile"] = os.path.join(directory, "slowest.prof")
+            self.slowest_profile[1].dump_stats(paths["cprofile"])
+        return paths
+
+    def print_report(self, top_functions=15):
+        summary = self.summary()
+        print("\n--- Profile ---")
+        print(f"{'stage':<28}{'wall s':>10}{'cpu s':>10}{'peak MB':>10}")
+        for stage in self.stages:
+            rss = f"{stage['peak_rss_mb']:.0f}" if stage["peak_rss_mb"] is not None else "-"
+            label = "  " * stage["depth"] + stage["name"]
+            print(f"{label:<28}{stage['wall_seconds']:>10.3f}{stage['cpu_seconds']:>10.3f}{rss:>10}")
+        print(f"Total {summary['total_seconds']:.2f}s; slowest stage: {summary['slowest_stage']}")
+        if summary["process_peak_rss_mb"] is not None:
+            print(f"Process peak RSS: {summary['process_peak_rss_mb']:.0f} MB")
+        if self.slowest_profile is not None:
+            name, stats, _ = self.slowest_profile
+            print(f"\ncProfile of '{name}' (top {top_functions} by cumulative time):")
+            stats.sort_stats("cumulative").print_stats(top_functions)
+
+_active = None
+
+def start_profiling(cprofile=False):
+    """Makes a new Profiler the active one and returns it."""
+    global _active
+    if _active is not None:
+        _active.close()
+    _active = Profiler(cprofile=cprofile)
+    return _active
+
+def stop_profiling():
+    global _active
+    profiler, _active = _active, None
+    if profiler is not None:
+        profiler.close()
+    return profiler
+
+def get_profiler():
+    return _active
+
+class profile_stage:
+    """
+    Context manager timing one stage of a run:
+
+        with profile_stage("train", model=name):
+            model.train(X, y)
+
+    Does nothing (beyond a global lookup) unless profiling was started.
+    """
+    __slots__ = ("name", "attributes", "_profiler", "_start", "_cpu", "_rss", "_peak", "_depth", "_cprofile")
+
+    def __init__(self, name, **attributes):
+        self.name = name
+        self.attributes = attributes
+
+    def __enter__(self):
+        self._profiler = _active
+        if self._profiler is None:
+            return self
+        stack = self._profiler._stack()
+        self._depth = len(stack)
+        self._cprofile = None
+        if self._profiler.cprofile and not any(stage._cprofile for stage in stack):
+            import cProfile
+            self._cprofile = cProfile.Profile()
+        stack.append(self)
+        self._rss = self._profiler._open(self)
+        self._cpu = time.process_time()
+        self._start = time.perf_counter()
+        if self._cprofile is not None:
+            self._cprofile.enable()
+        return self
+
+    def __exit__(self, *exc_info):
+        profiler = self._profiler
+        if profiler is None:
+            return False
+        if self._cprofile is not None:
+            self._cprofile.disable()
+        wall = time.perf_counter() - self._start
+        cpu = time.process_time() - self._cpu
+        profiler._stack().pop()
+        profiler.record(self.name, self._start, wall, cpu, self._rss, profiler._close(self), self._depth, self.attributes)
+        if self._cprofile is not None:
+            profiler._keep_profile(self.name, wall, self._cprofile)
+        return False
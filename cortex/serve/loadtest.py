@@ -0,0 +1,72 @@
+import argparse
+import json
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+
+def _post(url, body):
+    request = urllib.request.Request(url, data=body, headers={"Content-Type": "application/json"})
+    start = time.perf_counter()
+    with urllib.request.urlopen(request) as response:
+        response.read()
+    return time.perf_counter() - start
+
+def run_load_test(base_url, instances, requests=1000, concurrency=16, rows_per_request=1):
+    """
+    Fires `requests` POST /predict calls at a running `cortex serve` instance from
+    `concurrency` threads, each carrying `rows_per_request` rows cycled from
+    `instances`. Returns client-side latency percentiles and throughput plus the
+    server's own /metrics snapshot.
+    """
+    base_url = base_url.rstrip("/")
+    bodies = [
+        json.dumps({"instances": [instances[(i * rows_per_request + j) % len(instances)] for j in range(rows_per_request)]}).encode("utf-8")
+        for i in range(min(requests, 256))
+    ]
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies = list(pool.map(lambda i: _post(f"{base_url}/predict", bodies[i % len(bodies)]), range(requests)))
+    elapsed = time.perf_counter() - start
+
+    with urllib.request.urlopen(f"{base_url}/metrics") as response:
+        server_metrics = json.loads(response.read())
+
+    latencies_ms = np.array(latencies) * 1000.0
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "seconds": elapsed,
+        "requests_per_sec": requests / elapsed,
+        "rows_per_sec": requests * rows_per_request / elapsed,
+        "p50_ms": float(np.percentile(latencies_ms, 50)),
+        "p99_ms": float(np.percentile(latencies_ms, 99)),
+        "server": server_metrics,
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="cortex loadtest",
+        description="Load-test a running `cortex serve` endpoint on localhost."
+    )
+    parser.add_argument("input", help="CSV file whose rows are sent as prediction instances.")
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="Server base URL.")
+    parser.add_argument("--requests", type=int, default=1000, help="Total requests to send.")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent client threads.")
+    parser.add_argument("--rows-per-request", type=int, default=1, help="Rows in each request.")
+    args = parser.parse_args(argv)
+
+    import pandas as pd
+    instances = pd.read_csv(args.input, nrows=10_000).to_dict(orient="records")
+    result = run_load_test(args.url, instances, args.requests, args.concurrency, args.rows_per_request)
+
+    print(f"{result['requests']} requests in {result['seconds']:.2f}s "
+          f"({result['requests_per_sec']:,.0f} req/s, {result['rows_per_sec']:,.0f} rows/s)")
+    print(f"Client latency: p50 {result['p50_ms']:.2f} ms, p99 {result['p99_ms']:.2f} ms")
+    server = result["server"]
+    print(f"Server: {server['batches']} batches, {server['mean_batch_requests']:.1f} requests/batch, "
+          f"p50 {server['p50_ms']:.2f} ms, p99 {server['p99_ms']:.2f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+import argparse
+import json
+import queue
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import numpy as np
+import pandas as pd
+from cortex.predict.main import align_features, input_columns, load_model, predict_frame, text_column
+
+class ServerMetrics:
+    """Thread-safe latency and throughput counters for the inference server."""
+    def __init__(self, window=10_000):
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=window)  # Seconds, most recent requests only
+        self.started = time.perf_counter()
+        self.requests = 0
+        self.rows = 0
+        self.batches = 0
+        self.errors = 0
+
+    def record_request(self, seconds, rows, ok=True):
+        with self._lock:
+            self._latencies.append(seconds)
+            self.requests += 1
+            self.rows += rows
+            if not ok:
+                self.errors += 1
+
+    def record_batch(self):
+        with self._lock:
+            self.batches += 1
+
+    def snapshot(self):
+        with self._lock:
+            latencies = np.array(self._latencies) * 1000.0
+            uptime = time.perf_counter() - self.started
+            return {
+                "requests": self.requests,
+                "rows": self.rows,
+                "batches": self.batches,
+                "errors": self.errors,
+                "mean_batch_requests": self.requests / self.batches if self.batches else 0.0,
+                "p50_ms": float(np.percentile(latencies, 50)) if len(latencies) else None,
+                "p99_ms": float(np.percentile(latencies, 99)) if len(latencies) else None,
+                "requests_per_sec": self.requests / uptime if uptime else 0.0,
+                "rows_per_sec": self.rows / uptime if uptime else 0.0,
+                "uptime_sec": uptime,
+            }
+
+class _PendingRequest:
+    def __init__(self, rows):
+        self.rows = rows
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+class MicroBatcher:
+    """
+    Coalesces concurrent prediction requests into micro-batches.
+
+    A background thread takes the first waiting request, keeps collecting more
+    until `max_batch_rows` rows are queued or `max_latency_ms` has passed, then
+    calls `predict_fn` once on the concatenated rows and hands each caller its
+    slice of the result.
+    """
+    def __init__(self, predict_fn, max_batch_rows=1024, max_latency_ms=5.0, metrics=None):
+        self.predict_fn = predict_fn
+        self.max_batch_rows = max_batch_rows
+        self.max_latency = max_latency_ms / 1000.0
+        self.metrics = metrics or ServerMetrics()
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="cortex-micro-batcher", daemon=True)
+        self._thread.start()
+
+    def predict(self, rows):
+        """Blocks until the batch containing `rows` has been scored; returns its predictions."""
+        request = _PendingRequest(rows)
+        self._queue.put(request)
+        request.done.wait()
+        if request.error is not None:
+            raise request.error
+        return request.result
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = [first]
+            size = len(first.rows)
+            deadline = time.perf_counter() + self.max_latency
+            while size < self.max_batch_rows:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    request = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if request is None:
+                    self._queue.put(None)  # Finish this batch, then stop.
+                    break
+                batch.append(request)
+                size += len(request.rows)
+            self._score(batch)
+
+    def _score(self, batch):
+        try:
+            frame = pd.concat([request.rows for request in batch], ignore_index=True)
+            predictions = np.asarray(self.predict_fn(frame))
+            offsets = np.cumsum([len(request.rows) for request in batch])[:-1]
+            for request, result in zip(batch, np.split(predictions, offsets)):
+                request.result = result
+        except Exception as e:
+            if len(batch) == 1:
+                batch[0].error = e
+            else:
+                # Score each request on its own, so one bad request fails alone.
+                for request in batch:
+                    try:
+                        request.result = np.asarray(self.predict_fn(request.rows))
+                    except Exception as request_error:
+                        request.error = request_error
+        self.metrics.record_batch()
+        for request in batch:
+            request.done.set()
+
+def _rows_from_payload(payload, model):
+    """
+    Accepts {"instances": [...]} holding records (dicts), lists of values in training
+    column order, or, for text models, plain strings. The rows are then selected and
+    ordered for the model by cortex.predict's align_features, as in batch prediction.
+    """
+    instances = payload.get("instances") if isinstance(payload, dict) else payload
+    if not isinstance(instances, list) or not instances:
+        raise ValueError("Request body must be a JSON object with a non-empty 'instances' list.")
+    columns = input_columns(model)
+    if all(isinstance(instance, dict) for instance in instances):
+        frame = pd.DataFrame.from_records(instances)
+    elif text_column(model) is not None and all(isinstance(instance, str) for instance in instances):
+        frame = pd.DataFrame({columns[0]: instances})
+    elif all(isinstance(instance, list) for instance in instances):
+        if columns is not None and any(len(instance) != len(columns) for instance in instances):
+            raise ValueError(f"Each instance must have {len(columns)} values: {columns}")
+        frame = pd.DataFrame(instances, columns=columns)
+    else:
+        raise ValueError("Instances must all be objects or all be lists of values.")
+    return align_features(model, frame)
+
+class _InferenceHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024  # The default of 5 drops connections under concurrent load.
+
+def make_server(model, host="127.0.0.1", port=8000, max_batch_rows=1024, max_latency_ms=5.0):
+    """Builds (but does not start) an HTTP server that serves `model` through a MicroBatcher."""
+    metrics = ServerMetrics()
+    batcher = MicroBatcher(lambda X: predict_frame(model, X), max_batch_rows, max_latency_ms, metrics)
+    class Handler(BaseHTTPRequestHandler):
+        def _send_json(self, status, body):
+            data = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            if self.path == "/health":
+                self._send_json(200, {"status": "ok"})
+            elif self.path == "/metrics":
+                self._send_json(200, metrics.snapshot())
+            else:
+                self._send_json(404, {"error": "Not found"})
+
+        def do_POST(self):
+            if self.path != "/predict":
+                self._send_json(404, {"error": "Not found"})
+                return
+            start = time.perf_counter()
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                frame = _rows_from_payload(json.loads(self.rfile.read(length)), model)
+            except ValueError as e:  # Includes malformed JSON.
+                metrics.record_request(time.perf_counter() - start, 0, ok=False)
+                self._send_json(400, {"error": str(e)})
+                return
+            try:
+                predictions = batcher.predict(frame)
+            except Exception as e:
+                metrics.record_request(time.perf_counter() - start, len(frame), ok=False)
+                self._send_json(500, {"error": f"Prediction failed: {e}"})
+                return
+            metrics.record_request(time.perf_counter() - start, len(frame))
+            self._send_json(200, {"predictions": predictions.tolist()})
+
+        def log_message(self, format, *args):
+            pass  # Keep the hot path quiet; use /metrics instead.
+
+    server = _InferenceHTTPServer((host, port), Handler)
+    server.batcher = batcher
+    server.metrics = metrics
+    return server
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="cortex serve",
+        description="Serve a model saved by Cortex over a local HTTP endpoint with micro-batching."
+    )
+    parser.add_argument("model", help="Path to the saved model.")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind (default: 127.0.0.1).")
+    parser.add_argument("--port", type=int, default=8000, help="Port to listen on (default: 8000).")
+    parser.add_argument("--max-batch-rows", type=int, default=1024, help="Largest micro-batch, in rows.")
+    parser.add_argument("--max-latency-ms", type=float, default=5.0, help="How long to wait to fill a micro-batch.")
+    args = parser.parse_args(argv)
+
+    model = load_model(args.model)
+    server = make_server(model, args.host, args.port, args.max_batch_rows, args.max_latency_ms)
+    print(f"Serving {args.model} on http://{args.host}:{server.server_address[1]}")
+    print("POST /predict with {\"instances\": [...]}; GET /metrics for latency and throughput.")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down.")
+    finally:
+        server.server_close()
+        server.batcher.close()
+
+if __name__ == "__main__":
+    main()
@@ -1,44 +1,126 @@
-from sklearn.model_selection import GridSearchCV
+from sklearn.base import clone, is_classifier
+from sklearn.metrics import check_scoring
+from sklearn.model_selection import check_cv
+from sklearn.utils.parallel import Parallel, delayed
+import time
 import warnings
+from cortex.profiling import profile_stage
+from cortex.tuning.strategies import TuningBudget, _take, get_strategy
 
-def run_hyperparameter_tuning(model_instance, X, y, cv=5):
+def _fit_fold(estimator, params, X, y, train, test, scorer, deadline):
+    """Fits and scores one candidate on one fold; returns None if the deadline has already passed."""
+    if deadline is not None and time.time() >= deadline:
+        return None
+    estimator = clone(estimator).set_params(**params)
+    start = time.perf_counter()
+    try:
+        estimator.fit(_take(X, train), _take(y, train))
+        fit_time = time.perf_counter() - start
+        score = scorer(estimator, _take(X, test), _take(y, test))
+    except Exception:
+        fit_time = time.perf_counter() - start
+        score = float("nan")
+    return score, fit_time
+
+def cross_validate_candidates(estimator, candidates, X, y, scoring, cv=5, n_jobs=-1, deadline=None):
+    """
+    Cross-validates every candidate parameter set, dispatching all candidate x fold
+    fits to one pool of `n_jobs` workers. Fits that would start after `deadline`
+    (a time.time() value) are skipped, so a candidate may come back with fewer
+    scores than folds. Failed fits score NaN, like error_score=nan in scikit-learn.
+    """
+    splits = list(check_cv(cv, y, classifier=is_classifier(estimator)).split(X, y))
+    scorer = check_scoring(estimator, scoring=scoring)
+    results = Parallel(n_jobs=n_jobs)(
+        delayed(_fit_fold)(estimator, params, X, y, train, test, scorer, deadline)
+        for params in candidates for train, test in splits
+    )
+    per_candidate = []
+    for i in range(len(candidates)):
+        folds = [r for r in results[i * len(splits):(i + 1) * len(splits)] if r is not None]
+        per_candidate.append({"scores": [score for score, _ in folds], "fit_times": [t for _, t in folds]})
+    return per_candidate
+
+def run_hyperparameter_tuning(model_instance, X, y, cv=5, strategy="grid", max_fits=None, max_seconds=None, n_jobs=-1):
     """
-    Performs hyperparameter tuning using GridSearchCV.
-    
+    Performs hyperparameter tuning with a pluggable search strategy.
+
     Args:
         model_instance: An instance of the model to tune.
         X: Features.
         y: Target variable.
         cv: Number of cross-validation folds.
-        
+        strategy: One of 'grid', 'random', 'halving' or 'bayes'.
+        max_fits: Optional cap on the number of model fits spent searching.
+        max_seconds: Optional wall-clock budget for the search, in seconds.
+        n_jobs: Parallel jobs used to fit candidates and their cross-validation folds.
+
     Returns:
-        A tuple containing the best model instance and the best score.
+        A tuple containing the best model, already refit on all of X and y, and the
+        best score. Per-trial fold scores and fit times are kept on
+        model_instance.tuning_report for reporting.
     """
     if not model_instance.param_grid:
         print(f"No hyperparameter grid defined for {model_instance.name}. Skipping tuning.")
         return model_instance.model, None
 
-    print("\nStarting hyperparameter tuning with GridSearchCV...")
+    search = get_strategy(strategy, cv=cv)
+    budget = TuningBudget(max_fits=max_fits, max_seconds=max_seconds)
+
+    print(f"\nStarting hyperparameter tuning with the '{search.name}' strategy...")
     print(f"Searching over the following parameters: {model_instance.param_grid}")
+    if max_fits is not None or max_seconds is not None:
+        print(f"Tuning budget: {max_fits if max_fits is not None else 'unlimited'} fits, "
+              f"{f'{max_seconds}s' if max_seconds is not None else 'no time limit'}.")
 
     # For now, we'll use a simple accuracy metric. We'll make this user-configurable later.
     scoring_metric = 'accuracy' if hasattr(model_instance.model, 'predict_proba') else 'neg_mean_squared_error'
 
-    with warnings.catch_warnings():
-        warnings.simplefilter("ignore") # Ignore warnings from GridSearch
-        grid_search = GridSearchCV(
-            estimator=model_instance.model,
-            param_grid=model_instance.param_grid,
-            scoring=scoring_metric,
-            cv=cv,
-            n_jobs=-1, # Use all available CPU cores
-            verbose=1
+    def evaluate(candidates, X_subset, y_subset, deadline):
+        # Models that can cross-validate on their own native datasets do so (see boosting.py).
+        # Their boosters already use every core, so candidates run one after another.
+        if hasattr(model_instance, "native_cv"):
+            return [
+                {"scores": [], "fit_times": []} if deadline is not None and time.time() >= deadline
+                else model_instance.native_cv(params, X_subset, y_subset, cv)
+                for params in candidates
+            ]
+        return cross_validate_candidates(
+            model_instance.model, candidates, X_subset, y_subset, scoring_metric, cv=cv, n_jobs=n_jobs, deadline=deadline
         )
-        
-        grid_search.fit(X, y)
-        
-    print("\nHyperparameter tuning complete!")
-    print(f"Best parameters found: {grid_search.best_params_}")
-    print(f"Best score: {grid_search.best_score_:.4f}")
-
-    return grid_search.best_estimator_, grid_search.best_score_
\ No newline at end of file
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore") # Ignore warnings from the cross-validation fits
+        try:
+            best_params, best_score, trials = search.search(
+                model_instance.model, model_instance.param_grid, evaluate, X, y, budget
+            )
+        finally:
+            # Native fold datasets hold copies of X; don't keep them alive with the model.
+            if hasattr(model_instance, "clear_native_cache"):
+                model_instance.clear_native_cache()
+
+        print(f"\nHyperparameter tuning complete! Evaluated {len(trials)} candidate(s) "
+              f"with {budget.fits} fits in {budget.elapsed:.1f}s.")
+        if best_params is None:
+            print("No candidate finished within the budget. Using default parameters.")
+            best_params = {}
+        else:
+            print(f"Best parameters found: {best_params}")
+            print(f"Best score: {best_score:.4f}")
+
+        # Refit through the model's own train() so wrapper logic (e.g. early stopping) applies.
+        model_instance.model = clone(model_instance.model).set_params(**best_params)
+        with profile_stage("train", model=model_instance.name):
+            model_instance.train(X, y)
+        best_estimator = model_instance.model
+
+    model_instance.tuning_report = {
+        "strategy": search.name,
+        "best_params": best_params,
+        "best_score": best_score,
+        "fits": budget.fits,
+        "seconds": budget.elapsed,
+        "trials": trials,
+    }
+    return best_estimator, best_score
@@ -0,0 +1,261 @@
+# cortex/tuning/strategies.py
+import math
+import time
+import numpy as np
+from sklearn.model_selection import ParameterGrid, ParameterSampler
+
+class TuningBudget:
+    """
+    Limits a search by the number of model fits and/or wall-clock seconds.
+    Either limit may be None, meaning unlimited.
+
+    The time limit is soft: it is passed to `evaluate` as a deadline, no fit
+    starts after it, but fits already running when it passes are allowed to
+    finish. A search can therefore overrun max_seconds by about one fit.
+    """
+    def __init__(self, max_fits=None, max_seconds=None):
+        self.max_fits = max_fits
+        self.max_seconds = max_seconds
+        self.fits = 0
+        self._start = time.perf_counter()
+        # Wall-clock time, so that worker processes can compare against it too.
+        self.deadline = None if max_seconds is None else time.time() + max_seconds
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self._start
+
+    def affordable(self, trials, fits_per_trial):
+        """How many of `trials` trials, each costing `fits_per_trial` fits, still fit in the budget."""
+        if self.deadline is not None and time.time() >= self.deadline:
+            return 0
+        if self.max_fits is not None:
+            trials = min(trials, max(0, self.max_fits - self.fits) // fits_per_trial)
+        return trials
+
+    def charge(self, fits):
+        self.fits += fits
+
+class SearchStrategy:
+    """
+    Base class for hyperparameter search strategies.
+
+    A strategy proposes candidate parameter sets and scores them in batches through
+    `evaluate(candidates, X, y, deadline)`, which fits every candidate x fold of a
+    batch in parallel and returns one dict per candidate with per-fold "scores" and
+    "fit_times". Folds that would start after `deadline` are skipped. `search`
+    returns (best_params, best_score, trials), where each trial records the params,
+    fold scores, fit times and the resource it used.
+    """
+    name = None
+
+    def __init__(self, cv=5, random_state=42):
+        self.cv = cv
+        self.random_state = random_state
+
+    def search(self, estimator, param_grid, evaluate, X, y, budget):
+        raise NotImplementedError
+
+    def _run_trials(self, candidates, evaluate, X, y, budget, resource=None):
+        """
+        Evaluates as many of `candidates` as the budget allows in one batch. Returns
+        the trials of the candidates that finished every fold; fewer trials than
+        candidates means the budget ran out.
+        """
+        affordable = budget.affordable(len(candidates), self.cv)
+        if not affordable:
+            return []
+        trials = []
+        for params, result in zip(candidates, evaluate(candidates[:affordable], X, y, budget.deadline)):
+            budget.charge(len(result["scores"]))
+            if len(result["scores"]) < self.cv:
+                continue  # Cut off by the deadline.
+            scores = np.asarray(result["scores"], dtype=float)
+            trials.append({
+                "params": params,
+                "mean_score": float(np.nanmean(scores)) if not np.all(np.isnan(scores)) else float("nan"),
+                "fold_scores": scores.tolist(),
+                "fit_times": list(result["fit_times"]),
+                "resource": resource,
+            })
+        return trials
+
+    @staticmethod
+    def _best(trials):
+        scored = [t for t in trials if not math.isnan(t["mean_score"])]
+        if not scored:
+            return None, None
+        best = max(scored, key=lambda t: t["mean_score"])
+        return best["params"], best["mean_score"]
+
+class GridSearch(SearchStrategy):
+    """Exhaustive search over every combination, in grid order, until the budget runs out."""
+    name = "grid"
+
+    def search(self, estimator, param_grid, evaluate, X, y, budget):
+        trials = self._run_trials(list(ParameterGrid(param_grid)), evaluate, X, y, budget)
+        return (*self._best(trials), trials)
+
+class RandomSearch(SearchStrategy):
+    """Evaluates a random subset of the grid."""
+    name = "random"
+
+    def __init__(self, cv=5, random_state=42, n_iter=10):
+        super().__init__(cv, random_state)
+        self.n_iter = n_iter
+
+    def search(self, estimator, param_grid, evaluate, X, y, budget):
+        n_iter = min(self.n_iter, len(ParameterGrid(param_grid)))
+        candidates = list(ParameterSampler(param_grid, n_iter=n_iter, random_state=self.random_state))
+        trials = self._run_trials(candidates, evaluate, X, y, budget)
+        return (*self._best(trials), trials)
+
+class SuccessiveHalving(SearchStrategy):
+    """
+    Successive halving: every candidate starts on a small resource and only the
+    best 1/eta of them move on to the next round with eta times more of it.
+
+    The resource is either "n_samples" (a growing subsample of the rows) or
+    "n_estimators" (growing numbers of trees / boosting rounds). "auto" picks
+    n_estimators for estimators that have it and n_samples otherwise.
+    """
+    name = "halving"
+
+    def __init__(self, cv=5, random_state=42, eta=3, resource="auto", min_samples=None):
+        super().__init__(cv, random_state)
+        self.eta = eta
+        self.resource = resource
+        self.min_samples = min_samples
+
+    def search(self, estimator, param_grid, evaluate, X, y, budget):
+        resource = self.resource
+        if resource == "auto":
+            resource = "n_estimators" if "n_estimators" in estimator.get_params() else "n_samples"
+
+        if resource == "n_estimators":
+            grid = dict(param_grid)
+            max_resource = max(grid.pop("n_estimators", [estimator.get_params()["n_estimators"] or 100]))
+            min_resource = 1
+        else:
+            grid = param_grid
+            max_resource = len(y)
+            min_resource = self.min_samples or min(max_resource, 20 * self.cv)
+
+        candidates = list(ParameterGrid(grid))
+        n_rounds = max(1, math.ceil(math.log(len(candidates), self.eta))) if len(candidates) > 1 else 1
+        order = np.random.RandomState(self.random_state).permutation(len(y))
+
+        trials = []
+        for round_ in range(n_rounds):
+            amount = max(min_resource, int(max_resource * self.eta ** (round_ - n_rounds + 1)))
+            if resource == "n_estimators":
+                round_candidates = [{**params, "n_estimators": amount} for params in candidates]
+                round_trials = self._run_trials(round_candidates, evaluate, X, y, budget, resource=amount)
+            else:
+                rows = np.sort(order[:amount])
+                round_trials = self._run_trials(candidates, evaluate, _take(X, rows), _take(y, rows), budget, resource=amount)
+            trials.extend(round_trials)
+            if len(round_trials) < len(candidates) or round_ == n_rounds - 1:
+                break
+            round_trials.sort(key=lambda t: -np.inf if math.isnan(t["mean_score"]) else t["mean_score"], reverse=True)
+            keep = max(1, math.ceil(len(candidates) / self.eta))
+            candidates = [
+                {k: v for k, v in t["params"].items() if not (resource == "n_estimators" and k == "n_estimators")}
+                for t in round_trials[:keep]
+            ]
+
+        # The winner is the best candidate from the largest resource that was reached.
+        top_resource = max((t["resource"] for t in trials), default=None)
+        best_params, best_score = self._best([t for t in trials if t["resource"] == top_resource])
+        if best_params is not None and resource == "n_estimators":
+            best_params = {**best_params, "n_estimators": max_resource}
+        return best_params, best_score, trials
+
+class BayesianSearch(SearchStrategy):
+    """
+    Sequential model-based optimization over the grid: after a few random
+    trials, a Gaussian process is fit to the observed scores and the untried
+    candidate with the highest expected improvement is evaluated next.
+    """
+    name = "bayes"
+
+    def __init__(self, cv=5, random_state=42, n_iter=10, n_initial=3):
+        super().__init__(cv, random_state)
+        self.n_iter = n_iter
+        self.n_initial = n_initial
+
+    def search(self, estimator, param_grid, evaluate, X, y, budget):
+        candidates = list(ParameterGrid(param_grid))
+        features = _encode_candidates(candidates, param_grid)
+        rng = np.random.RandomState(self.random_state)
+        remaining = list(rng.permutation(len(candidates)))
+        evaluated, scores, trials = [], [], []
+
+        while remaining and len(trials) < self.n_iter:
+            if not trials:
+                # The random initial candidates do not depend on each other, so they run as one batch.
+                picks = remaining[:max(1, min(self.n_initial, self.n_iter))]
+            else:
+                picks = [remaining[int(np.argmax(self._expected_improvement(features, evaluated, scores, remaining)))]]
+            batch = self._run_trials([candidates[pick] for pick in picks], evaluate, X, y, budget)
+            for trial in batch:
+                pick = candidates.index(trial["params"])
+                remaining.remove(pick)
+                trials.append(trial)
+                if not math.isnan(trial["mean_score"]):
+                    evaluated.append(pick)
+                    scores.append(trial["mean_score"])
+            if len(batch) < len(picks):
+                break
+
+        return (*self._best(trials), trials)
+
+    def _expected_improvement(self, features, evaluated, scores, remaining):
+        from scipy.stats import norm
+        from sklearn.gaussian_process import GaussianProcessRegressor
+        from sklearn.gaussian_process.kernels import Matern, WhiteKernel
+
+        if len(evaluated) < 2:
+            return np.zeros(len(remaining))
+        gp = GaussianProcessRegressor(
+            kernel=Matern(nu=2.5) + WhiteKernel(), normalize_y=True, random_state=self.random_state
+        )
+        gp.fit(features[evaluated], np.asarray(scores))
+        mean, std = gp.predict(features[remaining], return_std=True)
+        std = np.maximum(std, 1e-9)
+        improvement = mean - max(scores)
+        z = improvement / std
+        return improvement * norm.cdf(z) + std * norm.pdf(z)
+
+def _take(data, rows):
+    return data.iloc[rows] if hasattr(data, "iloc") else data[rows]
+
+def _encode_candidates(candidates, param_grid):
+    """Maps candidates to points in [0, 1]^d: numeric values by (log) value, others by position."""
+    columns = []
+    for name, values in param_grid.items():
+        values = list(values)
+        numeric = all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in values)
+        if numeric:
+            log_scale = min(values) > 0 and max(values) / min(values) >= 10
+            column = np.array([c[name] for c in candidates], dtype=float)
+            if log_scale:
+                column = np.log(column)
+        else:
+            column = np.array([values.index(c[name]) for c in candidates], dtype=float)
+        span = column.max() - column.min()
+        columns.append((column - column.min()) / span if span else np.zeros_like(column))
+    return np.column_stack(columns) if columns else np.zeros((len(candidates), 1))
+
+STRATEGIES = {
+    GridSearch.name: GridSearch,
+    RandomSearch.name: RandomSearch,
+    SuccessiveHalving.name: SuccessiveHalving,
+    BayesianSearch.name: BayesianSearch,
+}
+
+def get_strategy(name, **kwargs):
+    try:
+        return STRATEGIES[name](**kwargs)
+    except KeyError:
+        raise ValueError(f"Unknown tuning strategy '{name}'. Choose from: {', '.join(STRATEGIES)}.")
@@ -10,8 +10,7 @@ setup(
         ],
     },
     install_requires=[
-        'pandas',
-        'spacy',
+        'pandas>=3.0',
         'fuzzywuzzy',
         'python-Levenshtein',
         'scikit-learn',
@@ -0,0 +1,9 @@
+# tests/conftest.py
+import pytest
+
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(tmp_path, monkeypatch):
+    """Keeps the dataset and embedding caches out of the user's home directory."""
+    cache_dir = tmp_path / "cortex-cache"
+    monkeypatch.setenv("CORTEX_CACHE_DIR", str(cache_dir))
+    return cache_dir
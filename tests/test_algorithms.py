@@ -1,4 +1,5 @@
 # tests/test_algorithms.py
+import warnings
 import pytest
 from cortex.algorithms.supervised.gbm import GradientBoostingClassifierModel
 from sklearn.datasets import make_classification
@@ -26,4 +27,169 @@ def test_gbm_model_evaluation():
     # Check that the evaluation metrics are returned and have the correct format
     assert "Accuracy" in metrics
     assert isinstance(metrics["Accuracy"], float)
-    assert 0.0 <= metrics["Accuracy"] <= 1.0
\ No newline at end of file
+    assert 0.0 <= metrics["Accuracy"] <= 1.0
+
+def test_boosting_models_early_stop_and_reuse_native_folds():
+    from cortex.algorithms.supervised.lightgbm import LightGBMClassifierModel
+    from cortex.algorithms.supervised.xgboost import XGBoostClassifierModel
+
+    X, y = make_classification(n_samples=400, n_features=10, random_state=42)
+    for model_class in (XGBoostClassifierModel, LightGBMClassifierModel):
+        model = model_class(n_estimators=500)
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            model.train(X, y)
+        assert not [w for w in caught if "eval_set" in str(w.message)]
+        assert model.best_iteration is not None and model.best_iteration < 500
+
+        first = model.native_cv({"learning_rate": 0.1}, X, y, cv=3)
+        folds = model._native_cache["folds"]
+        second = model.native_cv({"learning_rate": 0.05}, X, y, cv=3)
+        assert model._native_cache["folds"] is folds
+        assert len(first["scores"]) == len(second["fit_times"]) == 3
+        assert all(0.5 <= score <= 1.0 for score in first["scores"])
+
+def test_boosting_classifiers_take_string_labels():
+    import numpy as np
+    from cortex.algorithms.supervised.lightgbm import LightGBMClassifierModel
+    from cortex.algorithms.supervised.xgboost import XGBoostClassifierModel
+    from cortex.tuning.main import run_hyperparameter_tuning
+
+    X, y = make_classification(n_samples=300, n_features=10, n_classes=3, n_informative=5, random_state=42)
+    labels = np.array(["low", "mid", "high"])[y]
+    for model_class in (XGBoostClassifierModel, LightGBMClassifierModel):
+        model = model_class()
+        model.train(X, labels)
+        assert set(model.predict(X)) <= {"low", "mid", "high"}
+        assert model.evaluate(X, labels)["Accuracy"] > 0.8
+
+        tuned = model_class()
+        run_hyperparameter_tuning(tuned, X, labels, cv=3, strategy="random", max_fits=3)
+        assert len(tuned.tuning_report["trials"]) == 1
+        assert tuned._native_cache is None  # The fold datasets are freed after tuning.
+        assert tuned.evaluate(X, labels)["Accuracy"] > 0.8
+
+def test_q_learning_planning_and_vectorized_modes_solve_frozen_lake():
+    import gymnasium as gym
+    from cortex.algorithms.reinforcement_learning.q_learning import QLearningAgent
+
+    env = gym.make("FrozenLake-v1", is_slippery=False)
+    planner = QLearningAgent(mode="planning")
+    planner.train(env)
+    # Deterministic lake: the optimal policy reaches the goal every time.
+    assert planner.evaluate(env)["Average Reward"] == 1.0
+
+    learner = QLearningAgent(mode="vectorized", episodes=1000, num_envs=8, seed=0)
+    learner.train(env)
+    assert learner.evaluate(env)["Average Reward"] == 1.0
+
+def test_q_learning_vectorizes_tabular_environments_without_a_spec(capsys):
+    from gymnasium.envs.toy_text.frozen_lake import FrozenLakeEnv
+    from cortex.algorithms.reinforcement_learning.q_learning import QLearningAgent
+
+    env = FrozenLakeEnv(is_slippery=False)
+    assert env.spec is None
+    QLearningAgent(mode="vectorized", episodes=200, num_envs=8, seed=0).train(env)
+    assert "across 8 environments" in capsys.readouterr().out
+
+def test_pipeline_returns_environment_to_the_pool():
+    from cortex.algorithms.reinforcement_learning.q_learning import QLearningAgent
+    from cortex.data_handlers.environment import EnvironmentDataHandler, get_env_pool
+    from cortex.pipeline.main import run_training_pipeline
+
+    handler = EnvironmentDataHandler("FrozenLake8x8-v1")
+    metrics = run_training_pipeline(handler, QLearningAgent, "reinforcement_learning", "", auto_run=True,
+                                    model_params={"episodes": 50, "eval_episodes": 5})
+    assert metrics and handler.data is None
+    pooled = list(get_env_pool("FrozenLake8x8-v1")._idle)
+    assert len(pooled) == 1
+
+    second = EnvironmentDataHandler("FrozenLake8x8-v1")
+    second.load_data()
+    assert second.data is pooled[0]  # Reused, not made again.
+    second.close()
+
+def test_rollouts_are_seeded_per_episode_across_workers():
+    import gymnasium as gym
+    import numpy as np
+    from cortex.algorithms.reinforcement_learning.rollout import TablePolicy, run_rollouts, summarize_rewards
+    from cortex.data_handlers.environment import EnvironmentDataHandler
+
+    handler = EnvironmentDataHandler("FrozenLake-v1")
+    handler.load_data()
+    env = handler.data
+    handler.close()
+    handler.load_data()
+    assert handler.data is env  # Reused from the pool rather than made again.
+
+    policy = TablePolicy(np.random.default_rng(0).random((16, 4)))
+    serial = run_rollouts(policy, env, episodes=40, workers=1, seed=7)
+    parallel = run_rollouts(policy, env, episodes=40, workers=2, seed=7)
+    np.testing.assert_array_equal(serial, parallel)
+    summary = summarize_rewards(serial)
+    assert summary["ci_low"] <= summary["mean"] <= summary["ci_high"]
+
+def test_simple_ann_trains_from_zero_copy_tensors():
+    torch = pytest.importorskip("torch")
+    import numpy as np
+    from cortex.algorithms.deep_learning.base import to_tensor
+    from cortex.algorithms.deep_learning.simple_ann import SimpleANNModel
+
+    X, y = make_classification(n_samples=600, n_features=8, random_state=0)
+    X = np.ascontiguousarray(X, dtype=np.float32)
+    assert to_tensor(X).data_ptr() == X.ctypes.data
+
+    model = SimpleANNModel(epochs=30, num_threads=1)
+    train_loader = model.make_loader(X[:500], y[:500], shuffle=True)
+    model.train(train_loader)
+    metrics = model.evaluate(model.make_loader(X[500:], y[500:]))
+    assert metrics["Accuracy"] > 0.8
+    assert set(model.predict(X[500:])) <= set(y)
+    with pytest.raises(ValueError, match="not seen in training"):
+        model.make_loader(X[:2], np.array([0, 7]))
+
+def test_simple_ann_standardizes_inputs_and_saves_the_scaling(tmp_path):
+    torch = pytest.importorskip("torch")
+    import numpy as np
+    from cortex.algorithms.deep_learning.simple_ann import SimpleANNModel
+
+    X, y = make_classification(n_samples=600, n_features=8, random_state=0)
+    X = (X * [1, 10, 100, 1000, 1, 10, 100, 1000] + 5000).astype(np.float32)  # Badly scaled features.
+
+    model = SimpleANNModel(epochs=30, num_threads=1)
+    model.device = torch.device("cpu")
+    model.train(model.make_loader(X[:500], y[:500], shuffle=True))
+    np.testing.assert_allclose(model.mean_, X[:500].mean(axis=0), rtol=1e-4)
+    assert model.evaluate(model.make_loader(X[500:], y[500:]))["Accuracy"] > 0.8
+
+    model.save(str(tmp_path / "ann"))
+    loaded = SimpleANNModel.load(str(tmp_path / "ann"))
+    np.testing.assert_array_equal(loaded.scale_, model.scale_)
+    np.testing.assert_array_equal(loaded.predict(X[500:]), model.predict(X[500:]))
+
+def test_kmeans_selects_k_and_samples_silhouette(monkeypatch):
+    import numpy as np
+    import pandas as pd
+    from sklearn.datasets import make_blobs
+    from sklearn.metrics import silhouette_score
+    from cortex.algorithms.unsupervised import clustering
+
+    X, _ = make_blobs(n_samples=3000, n_features=4, centers=3, random_state=0)
+    model = clustering.KMeansModel()
+    model.train(pd.DataFrame(X).assign(label="x"))  # Non-numeric columns are ignored.
+    assert [c["n_clusters"] for c in model.selection] == [2, 3, 4]
+    assert model.n_clusters_ == 3
+    assert set(model.evaluate(pd.DataFrame(X))) == {"Silhouette Score", "Silhouette Std Error"}
+    with pytest.raises(ValueError, match="needs numeric columns"):
+        clustering.KMeansModel().train(pd.DataFrame({"city": ["a", "b", "c"] * 10}))
+
+    labels = model.predict(pd.DataFrame(X))
+    exact = silhouette_score(X, labels)
+    estimate, error = clustering.sampled_silhouette(X, labels, sample_size=500, repeats=5)
+    assert error > 0 and abs(estimate - exact) < 0.05
+
+    monkeypatch.setattr(clustering, "MINIBATCH_THRESHOLD", 1000)
+    model = clustering.KMeansModel(n_clusters=3, batch_size=512, algorithm="elkan")
+    model.train(pd.DataFrame(X))
+    assert isinstance(model.model.named_steps["kmeans"], clustering.MiniBatchKMeans)
+    assert model.model.named_steps["kmeans"].batch_size == 512
@@ -0,0 +1,56 @@
+# tests/test_artifact.py
+import json
+import numpy as np
+import pandas as pd
+from sklearn.datasets import make_classification
+from cortex.algorithms.artifact import default_artifact_path, load_artifact
+from cortex.algorithms.supervised.classification import RandomForestClassifierModel
+from cortex.pipeline.main import feature_schema
+from cortex.predict.main import load_model, predict_frame
+
+def _trained_forest():
+    X, y = make_classification(n_samples=200, n_features=4, random_state=0)
+    frame = pd.DataFrame(X, columns=["a", "b", "c", "d"])
+    model = RandomForestClassifierModel()
+    model.train(frame, y)
+    model.feature_schema = feature_schema(frame, "label")
+    model.metrics = {"Accuracy": np.float64(0.9)}
+    return model, frame
+
+def test_artifact_round_trip(tmp_path):
+    model, frame = _trained_forest()
+    path = model.save(str(tmp_path / "forest"))
+
+    manifest = json.loads((tmp_path / "forest" / "manifest.json").read_text())
+    assert manifest["format_version"] == 1
+    assert manifest["model_class"].endswith("RandomForestClassifierModel")
+    assert manifest["feature_schema"]["columns"] == ["a", "b", "c", "d"]
+    assert manifest["metrics"] == {"Accuracy": 0.9}
+    assert "sklearn" in manifest["versions"]
+
+    loaded = load_artifact(path)
+    assert type(loaded) is type(model) and loaded.name == model.name
+    np.testing.assert_array_equal(loaded.predict(frame), model.predict(frame))
+
+    # The predict CLI aligns columns from the saved feature schema.
+    shuffled = frame[["d", "c", "b", "a"]]
+    np.testing.assert_array_equal(predict_frame(load_model(path), shuffled), model.predict(frame))
+
+def test_compressed_artifact_and_versioned_paths(tmp_path):
+    model, frame = _trained_forest()
+    first = default_artifact_path(model, root=str(tmp_path))
+    model.save(first, compress=3)
+    second = default_artifact_path(model, root=str(tmp_path))
+    assert first.endswith("_v1") and second.endswith("_v2")
+    np.testing.assert_array_equal(load_artifact(first).predict(frame), model.predict(frame))
+
+def test_numpy_payload_is_memory_mapped(tmp_path):
+    from cortex.algorithms.reinforcement_learning.q_learning import QLearningAgent
+
+    agent = QLearningAgent()
+    agent.model = agent.q_table = np.arange(12, dtype=float).reshape(4, 3)
+    agent.save(str(tmp_path / "agent"))
+
+    loaded = load_artifact(str(tmp_path / "agent"))
+    assert isinstance(loaded.model, np.memmap) and loaded.q_table is loaded.model
+    np.testing.assert_array_equal(loaded.model, agent.model)
@@ -0,0 +1,16 @@
+# tests/test_benchmarks.py
+from cortex.benchmarks.suite import compare_results, make_workload, run_case
+
+LINEAR = "cortex.algorithms.supervised.regression.LinearRegressionModel"
+
+def test_benchmark_case_and_regression_compare(tmp_path):
+    source = make_workload("regression", "small", str(tmp_path))
+    result = run_case({"name": "Linear Regression", "path": LINEAR}, "regression", "small", source, tuning={})
+    assert result["status"] == "ok" and result["fit_seconds"] is not None
+    assert result["metrics"]["R-squared"] > 0.99
+
+    slower = {**result, "fit_seconds": result["fit_seconds"] * 2 + 1.0, "status": "ok"}
+    baseline, current = {"results": [result]}, {"results": [slower]}
+    regressions = compare_results(baseline, current, threshold=0.2)
+    assert [r["field"] for r in regressions] == ["fit_seconds"]
+    assert compare_results(current, baseline) == []
@@ -0,0 +1,163 @@
+# tests/test_data_handlers.py
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from cortex.data_handlers import image_index
+from cortex.data_handlers.cache import DatasetCache
+from cortex.data_handlers.detector import detect_dataset_type
+from cortex.data_handlers.tabular import TabularDataHandler
+
+def make_frame(n=1000):
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        "count": rng.integers(0, 100, n),
+        "value": rng.normal(size=n),
+        "colour": rng.choice(["red", "green", "blue"], n),
+        "target": rng.integers(0, 2, n),
+    })
+
+def test_chunked_csv_load_downcasts_dtypes(tmp_path):
+    frame = make_frame()
+    path = tmp_path / "data.csv"
+    frame.to_csv(path, index=False)
+
+    handler = TabularDataHandler(str(path), chunksize=300)
+    handler.load_data()
+
+    assert len(handler.data) == len(frame)
+    assert handler.data["count"].dtype == np.int8
+    assert handler.data["value"].dtype == np.float32
+    assert isinstance(handler.data["colour"].dtype, pd.CategoricalDtype)
+    assert (handler.data["colour"].astype(str) == frame["colour"]).all()
+    assert handler.memory_footprint < frame.memory_usage(deep=True).sum()
+
+def test_parquet_load_with_column_projection(tmp_path):
+    path = tmp_path / "data.parquet"
+    make_frame().to_parquet(path)
+
+    handler = TabularDataHandler(str(path), columns=["value", "target"])
+    handler.load_data()
+
+    assert list(handler.data.columns) == ["value", "target"]
+    assert handler.detect_type() == "tabular"
+
+def test_dataset_cache_serves_second_load(tmp_path, capsys):
+    frame = make_frame()
+    path = tmp_path / "data.csv"
+    frame.to_csv(path, index=False)
+
+    first = TabularDataHandler(str(path))
+    first.load_data()
+    second = TabularDataHandler(str(path))
+    second.load_data()
+
+    assert "from the dataset cache" in capsys.readouterr().out
+    pd.testing.assert_frame_equal(first.data, second.data)
+
+def test_dataset_cache_evicts_least_recently_used(tmp_path):
+    cache = DatasetCache(cache_dir=str(tmp_path / "cache"))
+    cache.put("first", make_frame())
+    entry_size = os.path.getsize(cache._entry_path("first"))
+
+    cache.max_bytes = int(entry_size * 1.5)
+    os.utime(cache._entry_path("first"), (0, 0))
+    cache.put("second", make_frame())
+
+    assert cache.get("first") is None
+    assert cache.get("second") is not None
+    assert cache.clear() == 1
+
+def test_detector_tells_text_corpora_from_tables(tmp_path):
+    from cortex.data_handlers.tabular import TabularDataHandler
+    from cortex.data_handlers.text import TextDataHandler
+
+    pd.DataFrame({"review": ["a slow but moving film", "not worth the ticket price", "loved every minute of it"],
+                  "label": ["pos", "neg", "pos"]}).to_csv(tmp_path / "reviews.csv", index=False)
+    pd.DataFrame({"city": ["Paris", "Rome", "Oslo"], "size": [1, 2, 3], "price": [10, 20, 30]}).to_csv(tmp_path / "homes.csv", index=False)
+
+    text = detect_dataset_type(str(tmp_path / "reviews.csv"))
+    assert isinstance(text, TextDataHandler) and text.detect_type() == "text"
+    assert isinstance(detect_dataset_type(str(tmp_path / "homes.csv")), TabularDataHandler)
+
+def test_detection_is_memoized(tmp_path, monkeypatch):
+    path = tmp_path / "data.csv"
+    make_frame(20).to_csv(path, index=False)
+
+    handler = detect_dataset_type(str(path))
+    assert handler.detect_type() == "tabular"
+
+    monkeypatch.setattr(handler, "_detect_type", lambda: pytest.fail("detection ran twice"))
+    assert handler.detect_type() == "tabular"
+
+PNG_HEADER = b"\x89PNG\r\n\x1a\n" + b"\x00" * 16
+
+def test_image_scan_labels_subfolders_and_reuses_manifest(tmp_path, monkeypatch):
+    for label in ("cats", "dogs"):
+        (tmp_path / "images" / label).mkdir(parents=True)
+        for i in range(3):
+            (tmp_path / "images" / label / f"{i}.png").write_bytes(PNG_HEADER)
+    (tmp_path / "images" / "README.txt").write_text("not an image")
+
+    handler = detect_dataset_type(str(tmp_path / "images"))
+    assert handler.detect_type() == "image"
+    handler.load_data()
+    assert len(handler.data) == 6
+    assert handler.data.classes == ["cats", "dogs"]
+    assert sorted(handler.data.labels.tolist()) == [0, 0, 0, 1, 1, 1]
+    assert handler.data[0].endswith(os.path.join("cats", "0.png"))
+
+    # Unchanged files come from the manifest instead of being sniffed again.
+    (tmp_path / "images" / "dogs" / "3.png").write_bytes(PNG_HEADER)
+    sniffed = []
+    original = image_index._sniff_batch
+    monkeypatch.setattr(image_index, "_sniff_batch", lambda paths: sniffed.extend(paths) or original(paths))
+    handler.load_data()
+    assert len(handler.data) == 7
+    assert [os.path.basename(p) for p in sniffed] == ["3.png"]
+
+def test_text_corpus_streams_and_caches_hashed_features(tmp_path):
+    from cortex.algorithms.supervised.text_models import StreamingTextClassifierModel
+    from cortex.data_handlers.text import TextDataHandler
+
+    texts = ["good great fun", "bad awful dull", "great good film", "awful bad plot"] * 50
+    labels = ["pos", "neg", "pos", "neg"] * 50
+    path = tmp_path / "reviews.csv"
+    pd.DataFrame({"Review": texts, "Label": labels}).to_csv(path, index=False)
+
+    handler = TextDataHandler(str(path), chunksize=30)
+    assert handler.detect_type() == "text"
+    chunks = list(handler.iter_chunks("label"))
+    assert len(chunks) == 7 and sum(len(t) for t, _ in chunks) == 200
+    assert handler.label_values("label").tolist() == ["neg", "pos"]
+
+    model = StreamingTextClassifierModel()
+    model.train_stream(handler.iter_chunks("label"), handler.label_values("label"))
+    assert model.evaluate_stream(handler.iter_chunks("label"))["Accuracy"] == 1.0
+
+    X, y = handler.hashed_features("label", model.vectorizer)
+    X_again, _ = TextDataHandler(str(path)).hashed_features("label", model.vectorizer)
+    assert X.shape == (200, 2 ** 20) and (X != X_again).nnz == 0
+    # Pre-hashed input passes straight through the model's hashing step.
+    np.testing.assert_array_equal(model.model.predict(X[:4]), model.model.predict(texts[:4]))
+
+def test_text_chunks_skip_rows_with_missing_labels_or_text(tmp_path):
+    from cortex.algorithms.supervised.text_models import StreamingTextClassifierModel
+    from cortex.data_handlers.text import TextDataHandler
+
+    path = tmp_path / "reviews.csv"
+    pd.DataFrame({
+        "review": ["good fun", "bad plot", None, "great film", "dull plot", "good cast"],
+        "label": ["pos", "neg", "pos", None, "neg", None],
+    }).to_csv(path, index=False)
+
+    handler = TextDataHandler(str(path), chunksize=2)
+    handler.detect_type()
+    chunks = list(handler.iter_chunks("label"))
+    assert [t.tolist() for t, _ in chunks] == [["good fun", "bad plot"], ["dull plot"]]
+    assert all(labels.notna().all() for _, labels in chunks)
+
+    model = StreamingTextClassifierModel()
+    model.train_stream(handler.iter_chunks("label"), handler.label_values("label"))
+    X, y = handler.hashed_features("label", model.vectorizer)
+    assert X.shape[0] == len(y) == 3 and set(y) == {"pos", "neg"}
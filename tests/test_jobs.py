@@ -0,0 +1,26 @@
+# tests/test_jobs.py
+import json
+import pandas as pd
+from sklearn.datasets import make_regression
+from cortex.pipeline.jobs import load_jobs, run_jobs
+
+def test_job_runner_writes_results_without_prompting(tmp_path):
+    X, y = make_regression(n_samples=200, n_features=4, noise=0.1, random_state=0)
+    pd.DataFrame(X, columns=["a", "b", "c", "d"]).assign(target=y).to_csv(tmp_path / "data.csv", index=False)
+    spec = {
+        "defaults": {"dataset": "data.csv", "problem_type": "regression", "target": "target"},
+        "jobs": [
+            {"id": "linear", "model": "Linear Regression"},
+            {"id": "missing-target", "model": "Linear Regression", "target": "price"},
+        ],
+    }
+    (tmp_path / "jobs.json").write_text(json.dumps(spec))
+
+    jobs = load_jobs(str(tmp_path / "jobs.json"))
+    results = run_jobs(jobs, workers=2)
+
+    assert [r["status"] for r in results] == ["ok", "failed"]
+    assert "price" in results[1]["error"]
+    written = json.loads((tmp_path / "cortex-jobs" / "linear" / "result.json").read_text())
+    assert written["metrics"]["R-squared"] > 0.99
+    assert (tmp_path / "cortex-jobs" / "linear" / "model" / "manifest.json").exists()
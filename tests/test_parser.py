@@ -0,0 +1,144 @@
+# tests/test_parser.py
+from fuzzywuzzy import fuzz
+from cortex.nlp.parser import (
+    INTENT_KEYWORDS,
+    PROBLEM_TYPE_KEYWORDS,
+    parse_user_intent,
+    parse_user_intents,
+)
+
+SENTENCES = [
+    "I want to predict house prices",
+    "classify emails as spam or not",
+    "group my customers into segments",
+    "find clusters in this data",
+    "Identify the type of flower",
+    "forecast monthly sales revenue",
+    "label these documents",
+    "recognize objects in photos",
+    "analyze the dataset",
+    "something completely unrelated",
+    "",
+]
+
+def brute_force_intent(text):
+    def first(keyword_dict):
+        for word in text.split():
+            for name, keywords in keyword_dict.items():
+                if any(fuzz.ratio(word, keyword) > 75 for keyword in keywords):
+                    return name
+        return None
+
+    problem_type = first(PROBLEM_TYPE_KEYWORDS)
+    intent = first(INTENT_KEYWORDS)
+    if intent == "cluster" and problem_type is None:
+        problem_type = "clustering"
+    return {"intent": intent, "problem_type": problem_type}
+
+def test_parse_user_intent_matches_brute_force():
+    for sentence in SENTENCES:
+        assert parse_user_intent(sentence) == brute_force_intent(sentence)
+
+def test_parse_user_intents_batch():
+    results = parse_user_intents(SENTENCES)
+    assert results == [brute_force_intent(sentence) for sentence in SENTENCES]
+    assert results[0] == {"intent": "predict", "problem_type": "regression"}
+
+def test_embedding_store_encodes_each_text_once(tmp_path):
+    import numpy as np
+    from cortex.nlp.embedding_store import EmbeddingStore
+
+    encoded = []
+    def encode(texts):
+        encoded.extend(texts)
+        return np.array([[len(t), t.count("a")] for t in texts], dtype=np.float32)
+
+    texts = ["a cat", "a dog", "a cat", "banana"]
+    first = EmbeddingStore("test-model", directory=str(tmp_path)).embed(texts, encode, batch_size=2)
+    assert sorted(encoded) == ["a cat", "a dog", "banana"]
+
+    # A fresh store on the same directory serves everything from disk.
+    encoded.clear()
+    store = EmbeddingStore("test-model", directory=str(tmp_path))
+    again = store.embed(texts[::-1], encode)
+    assert encoded == [] and len(store) == 3
+    np.testing.assert_array_equal(again, first[::-1])
+
+def _number_vectors(texts):
+    import numpy as np
+    return np.array([[float(t), -float(t)] for t in texts], dtype=np.float32)
+
+def _fill_store(directory, start):
+    from cortex.nlp.embedding_store import EmbeddingStore
+    EmbeddingStore("test-model", directory=directory).embed([str(i) for i in range(start, start + 200)], _number_vectors, batch_size=7)
+
+def test_embedding_store_appends_from_several_processes(tmp_path):
+    from concurrent.futures import ProcessPoolExecutor
+    import numpy as np
+    from cortex.nlp.embedding_store import EmbeddingStore
+
+    with ProcessPoolExecutor(max_workers=4) as pool:
+        list(pool.map(_fill_store, [str(tmp_path)] * 4, [0, 100, 200, 300]))
+
+    store = EmbeddingStore("test-model", directory=str(tmp_path))
+    texts = [str(i) for i in range(500)]
+    assert len(store) == 500
+    np.testing.assert_array_equal(store.embed(texts, None), _number_vectors(texts))
+
+class WordHashModel:
+    """Stands in for a SentenceTransformer: hashed bag-of-words vectors, with every encode call recorded."""
+    def __init__(self, dim=64):
+        self.dim = dim
+        self.calls = []
+
+    def encode(self, texts):
+        import zlib
+        import numpy as np
+
+        self.calls.append(list(texts))
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in text.lower().split():
+                vectors[row, zlib.crc32(word.encode()) % self.dim] += 1
+        return vectors
+
+def make_dynamic_parser(monkeypatch, model, **kwargs):
+    from cortex.nlp import dynamic_parser
+    monkeypatch.setattr(dynamic_parser, "load_sentence_model", lambda name: model)
+    return dynamic_parser.DynamicNLPParser(**kwargs)
+
+def test_dynamic_parser_scores_a_batch_with_one_encode(monkeypatch):
+    import numpy as np
+
+    model = WordHashModel()
+    parser = make_dynamic_parser(monkeypatch, model)
+    np.testing.assert_allclose(np.linalg.norm(parser.problem_type_matrix, axis=1), 1.0, rtol=1e-6)
+
+    texts = ["predict house prices", "segment customers", "zzz"]
+    model.calls.clear()
+    assert parser.parse_user_inputs(texts) == ["regression", "clustering", None]
+    assert model.calls == [texts]
+    assert [parser.parse_user_input(text) for text in texts] == ["regression", "clustering", None]
+    assert len(model.calls) == 1  # Served from the phrase cache.
+
+def test_dynamic_parser_caches_prototypes_on_disk_and_phrases_in_lru(monkeypatch):
+    model = WordHashModel()
+    parser = make_dynamic_parser(monkeypatch, model, cache_size=2)
+    n_prototypes = sum(len(sentences) for sentences in parser.problem_types.values())
+    assert [len(call) for call in model.calls] == [n_prototypes]
+
+    # A second parser loads the prototype matrix from disk...
+    model.calls.clear()
+    make_dynamic_parser(monkeypatch, model)
+    assert model.calls == []
+    # ...until the set of prototypes changes.
+    changed = {**parser.problem_types, "clustering": ["group data", "find segments"]}
+    labels, matrix = parser._create_embeddings(changed)
+    assert len(model.calls) == 1 and matrix.shape[0] == len(labels) == sum(map(len, changed.values()))
+
+    model.calls.clear()
+    parser.parse_user_inputs(["group data", "forecast sales"])
+    parser.parse_user_inputs(["group data"])
+    parser.parse_user_inputs(["train an agent"])  # Evicts "forecast sales", the least recently used.
+    parser.parse_user_inputs(["forecast sales"])
+    assert model.calls == [["group data", "forecast sales"], ["train an agent"], ["forecast sales"]]
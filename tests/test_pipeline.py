@@ -0,0 +1,58 @@
+# tests/test_pipeline.py
+import pandas as pd
+import pytest
+from sklearn.datasets import make_regression
+from cortex.data_handlers.tabular import TabularDataHandler
+from cortex.pipeline.compare import run_model_comparison
+
+LINEAR = "cortex.algorithms.supervised.regression.LinearRegressionModel"
+
+def write_regression_csv(path, n_samples=200):
+    X, y = make_regression(n_samples=n_samples, n_features=4, noise=0.1, random_state=0)
+    frame = pd.DataFrame(X, columns=[f"f{i}" for i in range(4)])
+    frame["target"] = y
+    frame.to_csv(path, index=False)
+    return str(path)
+
+def test_model_comparison_runs_models_in_parallel(tmp_path):
+    handler = TabularDataHandler(write_regression_csv(tmp_path / "data.csv"))
+    models = [{"name": "first", "path": LINEAR}, {"name": "second", "path": LINEAR}]
+    finished = []
+
+    results = run_model_comparison(
+        handler, models, "regression", "predict the value", max_workers=2,
+        on_result=lambda name, metrics, seconds: finished.append(name),
+    )
+
+    assert [name for name, _ in results] == ["first", "second"]
+    assert all(metrics["R-squared"] > 0.99 for _, metrics in results)
+    assert sorted(finished) == ["first", "second"]
+    assert handler.data is not None
+
+def test_serial_comparison_keeps_the_loaded_frame_unchanged(tmp_path):
+    import pandas as pd
+
+    path = tmp_path / "data.csv"
+    pd.DataFrame({"x": range(40), "label": [0, 1] * 20}).to_csv(path, index=False)
+    handler = TabularDataHandler(str(path))
+    handler.load_data()
+    original = handler.data
+    models = [{"name": "first", "path": "cortex.algorithms.supervised.classification.RandomForestClassifierModel"}] * 2
+
+    results = run_model_comparison(
+        handler, models, "classification", "predict the label", tuning={"max_fits": 0}, max_workers=1,
+    )
+
+    assert all(metrics for _, metrics in results)
+    # Classification casts the integer labels to categorical, but only in each candidate's copy.
+    assert handler.data is original and handler.data["label"].dtype != "category"
+
+def test_model_params_reach_the_estimator_or_are_rejected():
+    from cortex.algorithms.supervised.text_models import TextClassifierModel
+    from cortex.pipeline.main import applied_params
+
+    model = TextClassifierModel(classifier__alpha=0.5)
+    assert model.model.get_params()["classifier__alpha"] == 0.5
+    assert applied_params(model, {"classifier__alpha": 0.5}) == {"classifier__alpha"}
+    with pytest.raises(ValueError):
+        TextClassifierModel(alpha=0.5)
@@ -0,0 +1,47 @@
+# tests/test_predict.py
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.datasets import make_regression
+from sklearn.linear_model import LinearRegression
+from cortex.predict.main import run_batch_prediction
+
+def test_batch_prediction_streams_chunks_in_order(tmp_path):
+    X, y = make_regression(n_samples=250, n_features=3, random_state=0)
+    frame = pd.DataFrame(X, columns=["a", "b", "c"])
+    model = LinearRegression().fit(frame, y)
+    joblib.dump(model, tmp_path / "model.pkl")
+
+    # Shuffle the column order and add an ID; alignment must use the fitted column order.
+    scoring = frame[["c", "a", "b"]].assign(id=np.arange(len(frame)))
+    scoring.to_csv(tmp_path / "input.csv", index=False)
+
+    stats = run_batch_prediction(
+        str(tmp_path / "model.pkl"), str(tmp_path / "input.csv"), str(tmp_path / "out.csv"),
+        chunksize=60, workers=1, keep_columns=["id"],
+    )
+
+    output = pd.read_csv(tmp_path / "out.csv")
+    assert stats["rows"] == 250
+    assert output["id"].tolist() == list(range(250))
+    np.testing.assert_allclose(output["prediction"], model.predict(frame))
+
+def test_text_model_predicts_one_label_per_row(tmp_path):
+    from cortex.algorithms.supervised.text_models import TextClassifierModel
+    from cortex.data_handlers.text import TextDataHandler
+    from cortex.pipeline.main import run_training_pipeline
+
+    texts = ["win free money now", "cheap prizes click here", "lunch at noon?", "see you at the meeting"] * 10
+    labels = ["spam", "spam", "ham", "ham"] * 10
+    pd.DataFrame({"Text": texts, "Label": labels}).to_csv(tmp_path / "train.csv", index=False)
+    handler = TextDataHandler(str(tmp_path / "train.csv"))
+    run_training_pipeline(handler, TextClassifierModel, "text_classification", "", auto_run=True,
+                          tuning=False, target_column="label", save_path=str(tmp_path / "model"))
+
+    pd.DataFrame({"id": [1, 2], "TEXT": ["free money prizes", None]}).to_csv(tmp_path / "input.csv", index=False)
+    run_batch_prediction(str(tmp_path / "model"), str(tmp_path / "input.csv"), str(tmp_path / "out.csv"),
+                         workers=1, keep_columns=["id"])
+
+    output = pd.read_csv(tmp_path / "out.csv")
+    assert output["id"].tolist() == [1, 2]
+    assert output["prediction"].iloc[0] == "spam"
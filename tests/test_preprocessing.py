@@ -0,0 +1,36 @@
+# tests/test_preprocessing.py
+import numpy as np
+import pandas as pd
+from cortex.data_handlers.tabular import TabularDataHandler
+from cortex.pipeline.preprocessing import TabularPreprocessor
+
+def test_tabular_preprocessor_codes_categoricals_and_missing_values():
+    train = pd.DataFrame({"city": pd.Categorical(["ny", "sf", None, "ny"]), "plan": ["b", "a", "a", None], "age": [30.0, np.nan, 50.0, 40.0]})
+    new = pd.DataFrame({"age": [np.nan], "plan": ["c"], "city": ["sf"]})  # Reordered, with an unseen category.
+
+    ordinal = TabularPreprocessor().fit(train).transform(new)
+    assert list(ordinal.columns) == ["city", "plan", "age"]
+    assert (ordinal.dtypes == np.float32).all()
+    assert ordinal.iloc[0].tolist() == [1.0, -1.0, 40.0]
+
+    native = TabularPreprocessor(native_categorical=True).fit(train).transform(new)
+    assert list(native["plan"].cat.categories) == ["a", "b"] and native["plan"].isna().all()
+    assert native["city"].cat.codes.tolist() == [1] and np.isnan(native["age"].iloc[0])
+
+def test_saved_model_applies_its_preprocessor_to_raw_rows(tmp_path):
+    from cortex.algorithms.registry import load_model_class
+    from cortex.pipeline.main import run_training_pipeline
+    from cortex.predict.main import load_model, predict_frame
+
+    frame = pd.DataFrame({"color": ["red", "blue", "green", None] * 50, "size": [1.0, 2.0, None, 4.0] * 50})
+    frame["label"] = frame["color"].fillna("none").map({"red": "warm", "blue": "cold", "green": "cold", "none": "cold"})
+    frame.to_csv(tmp_path / "data.csv", index=False)
+
+    model_class = load_model_class("cortex.algorithms.supervised.classification.RandomForestClassifierModel")
+    metrics = run_training_pipeline(TabularDataHandler(str(tmp_path / "data.csv")), model_class, "classification", "",
+                                    auto_run=True, tuning=False, target_column="label", save_path=str(tmp_path / "model"))
+    assert metrics["Accuracy"] == 1.0
+
+    model = load_model(str(tmp_path / "model"))
+    rows = pd.DataFrame({"size": [1.0, None], "color": ["red", "blue"]})
+    assert list(predict_frame(model, rows)) == ["warm", "cold"]
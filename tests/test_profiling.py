@@ -0,0 +1,47 @@
+# tests/test_profiling.py
+import pytest
+
+def test_profile_stages_are_recorded_and_written(tmp_path):
+    import json
+    from cortex.profiling import profile_stage, start_profiling, stop_profiling
+
+    with profile_stage("ignored"):
+        pass  # No profiler active: nothing recorded, nothing fails.
+
+    profiler = start_profiling(cprofile=True)
+    try:
+        with profile_stage("outer", model="m"):
+            with profile_stage("inner"):
+                sum(range(100_000))
+    finally:
+        stop_profiling()
+
+    names = [(s["name"], s["depth"]) for s in profiler.stages]
+    assert names == [("inner", 1), ("outer", 0)]
+    paths = profiler.write(str(tmp_path))
+    summary = json.loads(open(paths["json"]).read())
+    assert summary["slowest_stage"] == "outer" and summary["stages"][1]["attributes"] == {"model": "m"}
+    trace = json.loads(open(paths["trace"]).read())
+    assert {e["name"] for e in trace["traceEvents"]} == {"outer", "inner"}
+    assert "cprofile" in paths
+
+def test_stage_peak_rss_is_measured_per_stage():
+    import numpy as np
+    from cortex.profiling import current_rss_mb, profile_stage, start_profiling, stop_profiling
+
+    if current_rss_mb() is None:
+        pytest.skip("Current RSS is not available on this platform.")
+    profiler = start_profiling()
+    try:
+        with profile_stage("large"):
+            block = np.ones(20_000_000)  # 160 MB, released when the stage ends
+            del block
+        with profile_stage("small"):
+            pass
+    finally:
+        stop_profiling()
+
+    large, small = profiler.stages
+    assert large["peak_rss_growth_mb"] > 100
+    assert large["peak_rss_mb"] - small["peak_rss_mb"] > 100
+    assert profiler.summary()["process_peak_rss_mb"] >= large["peak_rss_mb"] * 0.9
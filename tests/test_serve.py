@@ -0,0 +1,126 @@
+# tests/test_serve.py
+import threading
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.datasets import make_regression
+from sklearn.linear_model import LinearRegression
+from cortex.serve.loadtest import run_load_test
+from cortex.serve.main import MicroBatcher, make_server
+
+def test_micro_batcher_coalesces_concurrent_requests():
+    calls = []
+
+    def predict(frame):
+        calls.append(len(frame))
+        return frame["x"].to_numpy() * 2
+
+    batcher = MicroBatcher(predict, max_batch_rows=100, max_latency_ms=50)
+    results = [None] * 20
+
+    def request(i):
+        results[i] = batcher.predict(pd.DataFrame({"x": [i, i + 0.5]}))
+
+    threads = [threading.Thread(target=request, args=(i,)) for i in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    batcher.close()
+
+    assert sum(calls) == 40 and len(calls) < 20
+    for i, result in enumerate(results):
+        np.testing.assert_allclose(result, [2 * i, 2 * i + 1])
+
+def test_server_answers_load_test():
+    X, y = make_regression(n_samples=100, n_features=3, random_state=0)
+    frame = pd.DataFrame(X, columns=["a", "b", "c"])
+    model = LinearRegression().fit(frame, y)
+    server = make_server(model, port=0, max_latency_ms=2)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}"
+        result = run_load_test(url, frame.to_dict(orient="records"), requests=60, concurrency=6)
+    finally:
+        server.shutdown()
+        server.server_close()
+        server.batcher.close()
+
+    assert result["server"]["requests"] == 60
+    assert result["server"]["errors"] == 0
+    assert result["p99_ms"] >= result["p50_ms"] > 0
+
+def test_batcher_isolates_a_failing_request():
+    def predict(frame):
+        if (frame["x"] < 0).any():
+            raise ValueError("negative input")
+        return frame["x"].to_numpy() * 2
+
+    batcher = MicroBatcher(predict, max_batch_rows=100, max_latency_ms=50)
+    results = {}
+
+    def request(x):
+        try:
+            results[x] = batcher.predict(pd.DataFrame({"x": [x]}))
+        except ValueError as e:
+            results[x] = e
+
+    threads = [threading.Thread(target=request, args=(x,)) for x in (1, -1, 2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    batcher.close()
+
+    assert isinstance(results[-1], ValueError)
+    np.testing.assert_allclose(results[1], [2])
+    np.testing.assert_allclose(results[2], [4])
+
+def test_payloads_are_checked_against_the_training_columns():
+    from cortex.serve.main import _rows_from_payload
+
+    model = LinearRegression().fit(pd.DataFrame({"a": [0.0, 1.0, 2.0], "b": [1.0, 0.0, 1.0]}), [0.0, 1.0, 2.0])
+    frame = _rows_from_payload({"instances": [{"b": 2, "a": 1, "extra": 0}]}, model)
+    assert list(frame.columns) == ["a", "b"] and frame.iloc[0].tolist() == [1, 2]
+    with pytest.raises(ValueError, match="missing"):
+        _rows_from_payload({"instances": [{"a": 1}]}, model)
+    with pytest.raises(ValueError, match="2 values"):
+        _rows_from_payload({"instances": [[1, 2, 3]]}, model)
+
+def test_server_scores_text_models_per_request():
+    import json
+    import urllib.request
+    from cortex.algorithms.supervised.text_models import TextClassifierModel
+
+    model = TextClassifierModel()
+    model.train(pd.Series(["win free money", "cheap prizes now", "lunch at noon", "meeting at ten"] * 5),
+                pd.Series(["spam", "spam", "ham", "ham"] * 5))
+    model.feature_schema = {"text_column": "text", "target": "label"}
+    server = make_server(model, port=0, max_latency_ms=50)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/predict"
+    payloads = [
+        {"instances": ["free money", "lunch meeting", "cheap prizes"]},
+        {"instances": [{"text": "meeting at noon"}]},
+        {"instances": ["win now", "see you at lunch"]},
+    ]
+    replies = [None] * len(payloads)
+
+    def post(i):
+        request = urllib.request.Request(url, json.dumps(payloads[i]).encode(), {"Content-Type": "application/json"})
+        with urllib.request.urlopen(request) as response:
+            replies[i] = json.loads(response.read())["predictions"]
+
+    threads = [threading.Thread(target=post, args=(i,)) for i in range(len(payloads))]
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        server.shutdown()
+        server.server_close()
+        server.batcher.close()
+
+    assert replies == [["spam", "ham", "spam"], ["ham"], ["spam", "ham"]]
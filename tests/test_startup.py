@@ -0,0 +1,92 @@
+# tests/test_startup.py
+import os
+import subprocess
+import sys
+import time
+
+HEAVY_MODULES = ["torch", "spacy", "xgboost", "lightgbm", "gymnasium", "sentence_transformers", "sklearn", "pandas"]
+
+# Cold start budget in seconds; override with CORTEX_STARTUP_BUDGET on slow machines.
+STARTUP_BUDGET = float(os.environ.get("CORTEX_STARTUP_BUDGET", "1.0"))
+
+def test_import_does_not_load_heavy_backends():
+    code = (
+        "import sys, cortex.main, cortex.algorithms.registry;"
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == ""
+
+def test_help_cold_start_within_budget():
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-m", "cortex.main", "--help"], capture_output=True, check=True)
+    elapsed = time.perf_counter() - start
+    assert elapsed < STARTUP_BUDGET, f"`cortex --help` took {elapsed:.2f}s (budget {STARTUP_BUDGET:.2f}s)"
+
+def test_registry_entries_resolve():
+    from cortex.algorithms.registry import MODEL_REGISTRY, load_model_class
+    from cortex.algorithms.supervised.regression import LinearRegressionModel
+
+    entry = next(e for e in MODEL_REGISTRY["regression"] if e["name"] == "Linear Regression")
+    assert load_model_class(entry) is LinearRegressionModel
+    assert load_model_class(entry["path"]) is LinearRegressionModel
+
+def test_auto_run_skips_suggestions_whose_backend_is_missing(tmp_path, monkeypatch, capsys):
+    import argparse
+    import pandas as pd
+    import cortex.main as cli
+    from cortex.algorithms.registry import MODEL_REGISTRY
+
+    pd.DataFrame({"x": range(50), "target": [2 * i for i in range(50)]}).to_csv(tmp_path / "data.csv", index=False)
+    missing = {"name": "Missing Backend", "path": "cortex_missing_backend.Model", "description": ""}
+    linear = next(e for e in MODEL_REGISTRY["regression"] if e["name"] == "Linear Regression")
+    monkeypatch.setattr(cli, "get_suggested_models", lambda problem_type: [missing, linear])
+    answers = iter(["predict the value", "no"])
+    monkeypatch.setattr("builtins.input", lambda prompt="": next(answers))
+
+    args = argparse.Namespace(dataset=str(tmp_path / "data.csv"), auto_run=True, no_cache=True)
+    cli.run_session(args, {"strategy": "grid", "max_fits": 0, "max_seconds": None})
+
+    out = capsys.readouterr().out
+    assert "Skipping Missing Backend" in out
+    assert "I suggest using LinearRegressionModel" in out
+
+def test_daemon_runs_commands_in_isolated_workers(tmp_path, monkeypatch):
+    import json
+    import stat
+    from cortex import daemon
+
+    monkeypatch.setenv("CORTEX_DAEMON_SOCKET", str(tmp_path / "cortex.sock"))
+    monkeypatch.setenv("CORTEX_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setenv("PYTHONPATH", os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    assert daemon.run_in_daemon(["run", "jobs.json"]) is None  # No daemon: the caller runs it in-process.
+
+    pd = __import__("pandas")
+    for name in ("a", "b"):
+        (tmp_path / name).mkdir()
+        pd.DataFrame({"x": range(50), "target": [2 * i for i in range(50)]}).to_csv(tmp_path / name / "data.csv", index=False)
+    spec = json.dumps([{"id": "linear", "dataset": "data.csv", "problem_type": "regression", "model": "Linear Regression"}])
+
+    def cortex(*args, cwd):
+        return subprocess.Popen([sys.executable, "-m", "cortex.main", *args], cwd=cwd, stdin=subprocess.PIPE,
+                                stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+
+    assert daemon.start() == 0
+    try:
+        assert stat.S_IMODE(os.stat(tmp_path / "cortex.sock").st_mode) == 0o600
+        # Two commands at once, each reading its spec from its own stdin in its own directory.
+        clients = [cortex("run", "-", cwd=tmp_path / name) for name in ("a", "b")]
+        outputs = [client.communicate(spec, timeout=120)[0] for client in clients]
+        assert [client.returncode for client in clients] == [0, 0]
+        assert all("1 succeeded" in out for out in outputs)
+        # The interactive session runs there too.
+        session = cortex("data.csv", "--auto-run", cwd=tmp_path / "a")
+        out = session.communicate("exit\n", timeout=120)[0]
+        assert "Dataset type detected" in out
+        assert daemon.request({"command": "status"})["requests"] == 3
+        monkeypatch.setenv("CORTEX_DATASET_CACHE_MB", "1")
+        assert daemon.run_in_daemon(["run", "jobs.json"]) is None  # Differs from the daemon's import-time value.
+    finally:
+        daemon.stop()
+    for name in ("a", "b"):
+        assert json.loads((tmp_path / name / "cortex-jobs" / "linear" / "result.json").read_text())["status"] == "ok"
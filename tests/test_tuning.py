@@ -0,0 +1,54 @@
+# tests/test_tuning.py
+import pytest
+from sklearn.datasets import make_classification
+from cortex.algorithms.supervised.classification import RandomForestClassifierModel
+from cortex.tuning.main import run_hyperparameter_tuning
+
+@pytest.fixture
+def classification_data():
+    return make_classification(n_samples=300, n_features=8, random_state=42)
+
+@pytest.mark.parametrize("strategy", ["grid", "random", "halving", "bayes"])
+def test_strategies_return_fitted_estimator(strategy, classification_data):
+    X, y = classification_data
+    model = RandomForestClassifierModel(random_state=0)
+    model.param_grid = {"n_estimators": [10, 30], "max_depth": [None, 3, 5]}
+
+    best_model, best_score = run_hyperparameter_tuning(model, X, y, cv=3, strategy=strategy, n_jobs=1)
+
+    assert best_model.predict(X).shape == y.shape
+    assert 0.0 <= best_score <= 1.0
+
+def test_fit_budget_limits_search(classification_data, capsys):
+    X, y = classification_data
+    model = RandomForestClassifierModel(random_state=0)
+    model.param_grid = {"n_estimators": [10, 20], "max_depth": [3, 5, 7]}
+
+    run_hyperparameter_tuning(model, X, y, cv=3, strategy="grid", max_fits=6, n_jobs=1)
+
+    assert "Evaluated 2 candidate(s) with 6 fits" in capsys.readouterr().out
+
+def test_tuning_report_keeps_fold_scores(classification_data):
+    X, y = classification_data
+    model = RandomForestClassifierModel(random_state=0)
+    model.param_grid = {"n_estimators": [10, 20]}
+
+    run_hyperparameter_tuning(model, X, y, cv=3, n_jobs=1)
+
+    report = model.tuning_report
+    assert report["strategy"] == "grid"
+    assert len(report["trials"]) == 2
+    assert all(len(t["fold_scores"]) == 3 and len(t["fit_times"]) == 3 for t in report["trials"])
+
+def test_time_budget_stops_search_after_running_fits(classification_data, capsys):
+    X, y = classification_data
+    model = RandomForestClassifierModel(random_state=0)
+    model.param_grid = {"n_estimators": [50, 60, 70, 80, 90], "max_depth": [2, 3, 4, 5, 6, 7]}
+
+    run_hyperparameter_tuning(model, X, y, cv=3, strategy="grid", max_seconds=0.5, n_jobs=1)
+
+    # The limit is soft: no fit starts after it, but fits already running finish.
+    report = model.tuning_report
+    assert 0 < report["fits"] < 30 * 3
+    assert all(len(t["fold_scores"]) == 3 for t in report["trials"])
+    assert report["seconds"] < 0.5 + 10 * max(t for trial in report["trials"] for t in trial["fit_times"])